@@ -0,0 +1,162 @@
+import asyncio
+import time
+import httpx
+import config
+from case_parsers import ecli_from_url, parse_content_document
+from http_engine import content_url
+from pacing import AimdPacer
+from page_cache import store_response
+from retry_policy import CaseFailure, host_healthy
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests/second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncCaseFetcher:
+    """Fetch many case documents concurrently within a fixed throughput budget
+
+    At most `max_in_flight` requests are open at once, and request starts are
+    governed by a token bucket. The bucket's rate is steered by an AIMD pacer
+    that backs off once per burst of 429/503 responses and quickly recovers up
+    to `rate` requests/second; other failures are left to the retry layer, so
+    a few transient errors do not throttle the whole run. An optional circuit
+    breaker is consulted before, and told about, every request.
+    """
+
+    def __init__(self, max_in_flight=None, rate=None, burst=None, user_agent=None, proxy=None, base_url=None,
+                 cache=None, metrics=None, archive=None):
+        self.max_in_flight = max_in_flight or config.MAX_IN_FLIGHT
+        self.rate = rate or config.REQUESTS_PER_SECOND
+        self.burst = burst or config.RATE_BURST
+        self.user_agent = user_agent
+        self.proxy = proxy
+        self.base_url = base_url or config.OPEN_DATA_BASE_URL
+        self.cache = cache
+        self.metrics = metrics
+        self.archive = archive
+        self.pacer = AimdPacer(initial_rate=self.rate, min_rate=min(config.PACER_MIN_RATE, self.rate),
+                               max_rate=self.rate, increase=self.rate * config.ASYNC_RECOVERY,
+                               backoff_statuses=config.ASYNC_BACKOFF_STATUSES, errors_back_off=False,
+                               cooldown=config.ASYNC_BACKOFF_COOLDOWN)
+
+    async def pass_breaker(self, breaker, ecli_code):
+        """Wait until the breaker lets a request through"""
+        if breaker is None or breaker.allow():
+            return
+        print(f"[Breaker] Open; holding ECLI:{ecli_code} for {breaker.remaining():.0f}s")
+        while not breaker.allow():
+            await asyncio.sleep(max(breaker.remaining(), 0.5))
+
+    async def fetch_case(self, client, bucket, semaphore, url, breaker=None):
+        """Fetch and parse a single case; returns a CaseFailure on failure"""
+        ecli_code = ecli_from_url(url)
+        if not ecli_code:
+            print(f"[Error] No ECLI code found in URL: {url}")
+            return CaseFailure(url, "No ECLI code in URL", kind='permanent')
+        url_to_fetch = content_url(ecli_code, self.base_url)
+        entry = self.cache.get(url_to_fetch) if self.cache else None
+        if entry and entry['fresh']:
+            # Served from disk: no request, no token
+            if self.metrics:
+                self.metrics.inc('cache_hits_total', stage='fetch')
+            return self._parse(entry['body'], url, ecli_code)
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+        async with semaphore:
+            queued = time.monotonic()
+            await self.pass_breaker(breaker, ecli_code)
+            await bucket.acquire()
+            start = time.monotonic()
+            if self.metrics:
+                self.metrics.inc('sleep_seconds_total', start - queued, stage='token_bucket')
+            status = None
+            try:
+                resp = await client.get(url_to_fetch, headers=headers)
+                status = resp.status_code
+                document = store_response(self.cache, url_to_fetch, entry, resp, self.archive)
+            except Exception as e:
+                print(f"[Error] Failed to fetch case content for ECLI:{ecli_code}: {e}")
+                # A 404 is a healthy answer; only throttling and server/network errors slow us down
+                answered = status is not None and status < 500
+                self.pacer.record(time.monotonic() - start, ok=answered, status=status)
+                bucket.rate = self.pacer.rate
+                if self.metrics:
+                    self.metrics.inc('errors_total', stage='fetch', kind=type(e).__name__)
+                failure = CaseFailure(url, e, status=status)
+                self.report(breaker, failure)
+                return failure
+            self.report(breaker, None)
+            self.pacer.record(time.monotonic() - start, ok=True, status=status)
+            bucket.rate = self.pacer.rate
+            if self.metrics:
+                self.metrics.observe('fetch_seconds', time.monotonic() - start, stage='fetch',
+                                     proxy=self.proxy or 'direct')
+                self.metrics.inc('bytes_total', len(resp.content), stage='fetch')
+        case_data = self._parse(document, url, ecli_code)
+        if self.metrics:
+            # Request plus parse, without the time spent queued for a slot or a token
+            self.metrics.observe('case_seconds', time.monotonic() - start, stage='fetch')
+        return case_data
+
+    def report(self, breaker, result):
+        if breaker is None:
+            return
+        if host_healthy(result):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def _parse(self, document, url, ecli_code):
+        try:
+            if self.metrics:
+                with self.metrics.timer('extraction_seconds', stage='content'):
+                    return parse_content_document(document, url=url)
+            return parse_content_document(document, url=url)
+        except Exception as e:
+            print(f"[Error] Failed to parse case content for ECLI:{ecli_code}: {e}")
+            return CaseFailure(url, e)
+
+    async def fetch_all(self, urls, breaker=None):
+        """Fetch all URLs concurrently; results are returned in input order"""
+        headers = {'Accept': 'application/xml'}
+        if self.user_agent:
+            headers['User-Agent'] = self.user_agent
+        limits = httpx.Limits(max_keepalive_connections=self.max_in_flight, max_connections=self.max_in_flight)
+        bucket = TokenBucket(self.pacer.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with httpx.AsyncClient(http2=True, proxy=self.proxy, headers=headers, limits=limits,
+                                     timeout=config.HTTP_TIMEOUT, follow_redirects=True) as client:
+            tasks = [self.fetch_case(client, bucket, semaphore, url, breaker) for url in urls]
+            return await asyncio.gather(*tasks)
+
+    def run(self, urls, breaker=None):
+        """Synchronous entry point for the scraper's run loop"""
+        start = time.perf_counter()
+        results = asyncio.run(self.fetch_all(list(urls), breaker))
+        elapsed = time.perf_counter() - start
+        fetched = sum(1 for result in results if result)
+        print(f"[Async] Fetched {fetched}/{len(results)} cases in {elapsed:.1f}s "
+              f"({self.max_in_flight} in flight, {self.rate:g} req/s)")
+        return results
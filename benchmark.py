@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+import config
+from driver_watchdog import process_tree_rss
+from metrics import Metrics
+from standin_server import StandInServer, case_ecli
+
+# Marks the result line a scenario process prints among the scraper's own output
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+class SampleMetrics(Metrics):
+    """Metrics that also keep every observation, for exact percentiles"""
+
+    def __init__(self):
+        super().__init__()
+        self.samples = {}
+
+    def observe(self, name, seconds, **labels):
+        super().observe(name, seconds, **labels)
+        with self.lock:
+            self.samples.setdefault(name, []).append(seconds)
+
+
+class PeakRss:
+    """Track the peak resident memory of this process and its children (Chrome, pool workers)"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while True:
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+            if self.stop_event.wait(self.interval):
+                return
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        return max(self.peak, process_tree_rss(os.getpid()))
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def scenario_label(scenario):
+    if scenario['engine'] == 'http':
+        return f"http x{scenario['concurrency']}"
+    if scenario['engine'] == 'selenium':
+        return f"selenium x{scenario['workers']}"
+    return scenario['engine']
+
+
+def build_scenarios(engines, concurrency, workers):
+    scenarios = []
+    for engine in engines:
+        if engine == 'http':
+            scenarios.extend({'engine': 'http', 'concurrency': c} for c in concurrency)
+        elif engine == 'selenium':
+            scenarios.extend({'engine': 'selenium', 'workers': w} for w in workers)
+        else:
+            scenarios.append({'engine': engine})
+    return scenarios
+
+
+def bench_config(output_dir, rate):
+    """Settings for a scenario process: no cache, seen index or pacing in the way"""
+    config.OUTPUT_DIR = output_dir
+    config.USE_CACHE = False
+    config.SKIP_SEEN = False
+    config.METRICS_ENABLED = False
+    config.PACER_INITIAL_RATE = config.PACER_MAX_RATE = rate
+    # Listing cards become mostly metadata, the detail pages are what is measured
+    config.LISTING_PREFILTER = False
+
+
+def run_detail(scenario, server_url, cases, rate, metrics):
+    """Extract `cases` rulings through the production retry path; returns (ok, failed, samples)"""
+    from scraper_massive import MassiveLawScraper
+    from async_fetcher import AsyncCaseFetcher
+
+    engine = scenario['engine']
+    scraper = MassiveLawScraper(engine=engine, workers=scenario.get('workers'),
+                                max_in_flight=scenario.get('concurrency'), rate=rate, lean=True,
+                                output_dir=config.OUTPUT_DIR, skip_seen=False, use_cache=False)
+    scraper.metrics = metrics
+    urls = [f"{server_url}/details?id=ECLI:{case_ecli(index)}" for index in range(cases)]
+    try:
+        if engine == 'http':
+            scraper.async_fetcher = AsyncCaseFetcher(max_in_flight=scraper.max_in_flight, rate=rate,
+                                                     base_url=server_url, metrics=metrics)
+        elif scraper.workers > 1:
+            scraper.setup_browser_pool()
+        else:
+            scraper.setup_driver()
+        ok = failed = 0
+        for case_url, case_data in scraper.extract_cases(urls):
+            if case_data:
+                ok += 1
+            else:
+                failed += 1
+        return ok, failed, metrics.samples.get('case_seconds', [])
+    finally:
+        if scraper.driver:
+            scraper.driver.quit()
+        if scraper.browser_pool:
+            scraper.browser_pool.close()
+
+
+def run_feed(server_url, cases):
+    """Enumerate `cases` ECLIs from the feed; latency is per feed page"""
+    from open_data_feed import OpenDataFeed
+
+    feed = OpenDataFeed(config.CURRENT_LAW, base_url=server_url,
+                        page_size=min(config.FEED_PAGE_SIZE, max(1, cases // 10)))
+    samples, enumerated, page = [], 0, 1
+    try:
+        while enumerated < cases:
+            start = time.perf_counter()
+            entries = feed.page(page)
+            samples.append(time.perf_counter() - start)
+            if not entries:
+                break
+            enumerated += len(entries)
+            page += 1
+    finally:
+        feed.close()
+    return min(enumerated, cases), 0, samples
+
+
+def run_listing(server_url, cases, rate, metrics):
+    """Harvest `cases` URLs by clicking 'Laad meer resultaten'; latency is per click"""
+    from scraper_massive import MassiveLawScraper
+
+    scraper = MassiveLawScraper(engine='selenium', source='search', start_url=f"{server_url}/resultaat",
+                                rate=rate, lean=True, output_dir=config.OUTPUT_DIR, skip_seen=False,
+                                use_cache=False)
+    scraper.metrics = metrics
+    harvested = 0
+    try:
+        scraper.setup_driver()
+        for _ in scraper.scrape_search_page(1):
+            harvested += 1
+            if harvested >= cases:
+                break
+    finally:
+        if scraper.driver:
+            scraper.driver.quit()
+    return harvested, 0, metrics.samples.get('listing_click_seconds', [])
+
+
+def run_scenario(scenario, server_url, cases, rate):
+    """Run one scenario in this process and return its measurements"""
+    result = {'scenario': scenario_label(scenario), **scenario, 'cases': 0, 'failed': 0}
+    metrics = SampleMetrics()
+    with tempfile.TemporaryDirectory(prefix='bench_') as output_dir:
+        bench_config(output_dir, rate)
+        memory = PeakRss().start()
+        start = time.perf_counter()
+        try:
+            if scenario['engine'] == 'feed':
+                ok, failed, samples = run_feed(server_url, cases)
+            elif scenario['engine'] == 'listing':
+                ok, failed, samples = run_listing(server_url, cases, rate, metrics)
+            else:
+                ok, failed, samples = run_detail(scenario, server_url, cases, rate, metrics)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            ok, failed, samples = 0, 0, []
+        elapsed = time.perf_counter() - start
+        peak_rss = memory.stop()
+    result.update({
+        'cases': ok,
+        'failed': failed,
+        'seconds': round(elapsed, 3),
+        'cases_per_second': round(ok / elapsed, 2) if elapsed else None,
+        'latency_unit': {'feed': 'page', 'listing': 'click'}.get(scenario['engine'], 'case'),
+        'p50': round(percentile(samples, 0.5), 4) if samples else None,
+        'p99': round(percentile(samples, 0.99), 4) if samples else None,
+        'peak_rss_mb': round(peak_rss / 1048576, 1)
+    })
+    return result
+
+
+def spawn(scenario, server_url, cases, rate):
+    """Run a scenario in a fresh interpreter so its peak RSS is its own"""
+    command = [sys.executable, os.path.abspath(__file__), '--scenario', json.dumps(scenario),
+               '--server-url', server_url, '--cases', str(cases), '--rate', str(rate)]
+    proc = subprocess.run(command, capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ['no output']
+    return {'scenario': scenario_label(scenario), **scenario, 'cases': 0, 'failed': 0,
+            'error': f"exit code {proc.returncode}: {tail[0]}"}
+
+
+def compare(results, baseline, tolerance):
+    """Scenarios whose cases/second fell more than `tolerance` below the baseline"""
+    previous = {row['scenario']: row for row in baseline.get('results', [])}
+    regressions = []
+    for row in results:
+        before = previous.get(row['scenario'])
+        if not before or not before.get('cases_per_second'):
+            continue
+        now = row.get('cases_per_second') or 0
+        if now < before['cases_per_second'] * (1 - tolerance):
+            regressions.append((row['scenario'], before['cases_per_second'], now))
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'Scenario':<16}{'Cases':>7}{'Failed':>8}{'Cases/s':>10}{'p50 (s)':>10}{'p99 (s)':>10}"
+          f"{'Per':>7}{'Peak RSS (MB)':>15}")
+    for row in results:
+        if row.get('error'):
+            print(f"{row['scenario']:<16}  failed: {row['error']}")
+            continue
+        p50 = f"{row['p50']:.3f}" if row['p50'] is not None else '-'
+        p99 = f"{row['p99']:.3f}" if row['p99'] is not None else '-'
+        print(f"{row['scenario']:<16}{row['cases']:>7}{row['failed']:>8}{row['cases_per_second']:>10.1f}"
+              f"{p50:>10}{p99:>10}{row['latency_unit']:>7}{row['peak_rss_mb']:>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scraper throughput against a local stand-in server')
+    parser.add_argument('--engines', nargs='+', default=['feed', 'http', 'selenium', 'listing'],
+                        choices=['feed', 'http', 'selenium', 'listing'], help='Scenarios to run')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=config.BENCH_CONCURRENCY,
+                        help='In-flight settings for the http engine')
+    parser.add_argument('--workers', type=int, nargs='+', default=config.BENCH_WORKERS,
+                        help='Chrome worker counts for the selenium engine')
+    parser.add_argument('--cases', type=int, default=config.BENCH_CASES, help='Cases per scenario')
+    parser.add_argument('--rate', type=float, default=config.BENCH_RATE, help='Requests/second cap')
+    parser.add_argument('--latency', type=float, default=config.STANDIN_LATENCY,
+                        help='Mean stand-in response delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=config.STANDIN_ERROR_RATE,
+                        help='Fraction of stand-in responses that are 503s')
+    parser.add_argument('--page-kb', type=int, default=config.STANDIN_PAGE_KB,
+                        help='Ruling text per detail page / content document, in KB')
+    parser.add_argument('--server-url', help='Use an already running stand-in server instead of starting one')
+    parser.add_argument('--output', help='Where to write the results (default: run/benchmark_<timestamp>.json)')
+    parser.add_argument('--baseline', help='Earlier results file; exit with status 1 on a throughput regression')
+    parser.add_argument('--tolerance', type=float, default=config.BENCH_TOLERANCE,
+                        help='Allowed cases/second drop against the baseline (0.2 = 20%%)')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.scenario:
+        # Scenario process started by spawn()
+        result = run_scenario(json.loads(args.scenario), args.server_url, args.cases, args.rate)
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    server = None
+    server_url = args.server_url
+    if not server_url:
+        server = StandInServer(cases=max(args.cases, config.STANDIN_CASES), latency=args.latency,
+                               error_rate=args.error_rate, page_kb=args.page_kb).start()
+        server_url = server.url
+        print(f"[Bench] Stand-in server at {server_url} (latency {args.latency:g}s, "
+              f"error rate {args.error_rate:.0%}, {args.page_kb} KB pages)")
+
+    results = []
+    try:
+        for scenario in build_scenarios(args.engines, args.concurrency, args.workers):
+            print(f"[Bench] Running {scenario_label(scenario)} over {args.cases} cases...")
+            results.append(spawn(scenario, server_url, args.cases, args.rate))
+    finally:
+        if server:
+            server.close()
+
+    print_table(results)
+
+    output = args.output or os.path.join(config.OUTPUT_DIR, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'run_at': datetime.now().isoformat(), 'settings': {
+            'cases': args.cases, 'rate': args.rate, 'latency': args.latency,
+            'error_rate': args.error_rate, 'page_kb': args.page_kb}, 'results': results}, f, indent=2)
+    print(f"\n[Bench] Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for scenario, before, now in regressions:
+            print(f"[Regression] {scenario}: {before:.1f} -> {now:.1f} cases/s")
+        if regressions:
+            sys.exit(1)
+        print(f"[Bench] No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import multiprocessing
+import queue
+import time
+from retry_policy import CaseFailure, host_healthy
+
+# Sentinel telling a worker to shut down
+STOP = None
+
+
+def _browser_worker(worker_id, options, proxy, url_queue, result_queue):
+    """Worker process: own headless Chrome, own proxy and user agent"""
+    # Imported here so the pool module does not import selenium at load time
+    from browser_session import BrowserSession
+
+    # Only what case extraction needs; each worker archives to its own WARC files (the names carry the pid)
+    session = BrowserSession(**options)
+    try:
+        session.setup_driver(proxy=proxy)
+        print(f"[Pool] Worker {worker_id} started (proxy: {proxy or 'none'})")
+    except Exception as e:
+        print(f"[Error] Worker {worker_id} could not start Chrome: {e}")
+        session.driver = None
+
+    try:
+        while True:
+            case_url = url_queue.get()
+            if case_url is STOP:
+                break
+            if session.driver:
+                case_data = session.extract_case_content(case_url)
+            else:
+                case_data = CaseFailure(case_url, "Worker has no browser", kind='transient')
+            # The worker's page loads, errors and timings, for the parent's Metrics
+            result_queue.put((worker_id, case_url, case_data, session.metrics.drain()))
+    finally:
+        if session.driver:
+            session.driver.quit()
+        if session.page_cache:
+            session.page_cache.close()
+        if session.archive:
+            session.archive.close()
+
+
+class BrowserPool:
+    """Pool of headless Chrome worker processes, each fed one URL at a time
+
+    Each worker is a separate process with its own driver, so extraction
+    scales across CPU cores. Results from all workers are merged into a
+    single stream of (url, case_data) pairs. Every worker has its own URL
+    queue, so the pool knows which URL a worker holds and can hand it back
+    as a failure when that worker dies.
+    """
+
+    def __init__(self, size, subject=None, proxies=None, lean=False, metrics=None, use_cache=None,
+                 archive_dir=None, proxy_pool=None, allow_direct=None):
+        self.size = size
+        # BrowserSession arguments of every worker; `proxy_pool` lets a worker move off a quarantined proxy
+        self.options = {'subject': subject, 'lean': lean, 'use_cache': use_cache, 'archive_dir': archive_dir,
+                        'proxies': proxy_pool, 'allow_direct': allow_direct}
+        # Workers' metrics live in their own process; each result carries them back to be merged here
+        self.metrics = metrics
+        self.proxies = proxies or [None] * size
+        self.url_queues = []
+        self.result_queue = multiprocessing.Queue()
+        self.workers = []
+
+    def start(self):
+        """Start the worker processes"""
+        for worker_id in range(self.size):
+            proxy = self.proxies[worker_id % len(self.proxies)]
+            url_queue = multiprocessing.Queue()
+            worker = multiprocessing.Process(
+                target=_browser_worker,
+                args=(worker_id, self.options, proxy, url_queue, self.result_queue),
+                daemon=True
+            )
+            worker.start()
+            self.url_queues.append(url_queue)
+            self.workers.append(worker)
+        print(f"[Pool] Started {self.size} browser workers")
+
+    def alive(self):
+        return any(worker.is_alive() for worker in self.workers)
+
+    def extract(self, case_urls, breaker=None):
+        """Feed a batch of URLs to the workers and yield (url, case_data) as they finish
+
+        Each worker holds at most one URL at a time. With a circuit
+        breaker, each URL is only handed out once the breaker allows a call,
+        and every result is reported back to it, so an open breaker stops
+        the pool within one case per worker instead of after the batch.
+        The URL of a worker that dies is yielded as a transient failure, so
+        the retry layer requeues it on the workers that are left.
+        """
+        waiting = list(case_urls)
+        # worker id -> URL it is extracting
+        in_flight = {}
+        while waiting or in_flight:
+            idle = [worker_id for worker_id, worker in enumerate(self.workers)
+                    if worker_id not in in_flight and worker.is_alive()]
+            while waiting and idle:
+                if breaker is not None and not breaker.allow():
+                    break
+                worker_id = idle.pop(0)
+                in_flight[worker_id] = waiting.pop(0)
+                self.url_queues[worker_id].put(in_flight[worker_id])
+            if not in_flight:
+                if not self.alive():
+                    print(f"[Error] All browser workers stopped; {len(waiting)} cases not extracted")
+                    # Handed back as failures so the retry layer can requeue them
+                    for case_url in waiting:
+                        yield case_url, CaseFailure(case_url, "All browser workers stopped", kind='transient')
+                    break
+                # Breaker open and nothing in flight: wait for the trial call
+                remaining = max(breaker.remaining(), 0.5)
+                print(f"[Breaker] Open; pausing {remaining:.0f}s before a trial request")
+                time.sleep(remaining)
+                continue
+            try:
+                worker_id, case_url, case_data, worker_metrics = self.result_queue.get(timeout=5)
+            except queue.Empty:
+                # A worker flushes its results before it exits, so an empty queue means its URL is lost
+                for worker_id, case_url in list(in_flight.items()):
+                    if self.workers[worker_id].is_alive():
+                        continue
+                    print(f"[Error] Browser worker {worker_id} stopped while extracting {case_url}")
+                    del in_flight[worker_id]
+                    if breaker is not None:
+                        # Settles a trial call the worker may have held
+                        breaker.record_failure()
+                    yield case_url, CaseFailure(case_url, f"Browser worker {worker_id} stopped", kind='transient')
+                continue
+            if in_flight.get(worker_id) != case_url:
+                continue
+            del in_flight[worker_id]
+            if breaker is not None:
+                if host_healthy(case_data):
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            if self.metrics:
+                self.metrics.merge(worker_metrics)
+            yield case_url, case_data
+
+    def close(self):
+        """Stop all workers and wait for their browsers to quit"""
+        for url_queue in self.url_queues:
+            url_queue.put(STOP)
+        for worker in self.workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+        self.workers = []
+        self.url_queues = []
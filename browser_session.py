@@ -0,0 +1,275 @@
+import time
+from fake_useragent import UserAgent
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+import config
+from case_parsers import ecli_from_url, parse_detail_html, subject_matches
+from page_extraction import InPageExtractor
+from pacing import AimdPacer
+from driver_watchdog import DriverWatchdog
+from page_cache import PageCache
+from warc_archive import WarcWriter
+from proxy_pool import ProxyPool, NoProxyAvailable
+from retry_policy import CaseFailure
+from metrics import Metrics, log
+
+
+# Bytes and timing of the current document and its subresources (Resource Timing API).
+# Resource entries are cleared afterwards so the next load is measured on its own.
+_PAGE_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+performance.clearResourceTimings();
+return {
+    bytes: bytes,
+    resources: resources.length + 1,
+    load_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : 0
+};
+"""
+
+
+class BrowserSession:
+    """One headless Chrome and everything needed to extract case detail pages with it
+
+    Holds the driver with its proxy, pacer, watchdog, page cache and WARC
+    archive. MassiveLawScraper builds its crawl on top of it; browser pool
+    workers use it on its own, so a worker process only sets up what case
+    extraction needs.
+    """
+
+    def __init__(self, subject=None, proxies=None, lean=None, use_cache=None, archive_dir=None,
+                 allow_direct=None):
+        self.ua = UserAgent()
+        self.driver = None
+        self.driver_proxy = None
+        self.subject = subject
+        self.lean = config.LEAN_PROFILE if lean is None else lean
+        self.pacer = AimdPacer()
+        self.watchdog = DriverWatchdog()
+        self.pages_loaded = 0
+        self.bytes_transferred = 0
+        self.use_cache = config.USE_CACHE if use_cache is None else use_cache
+        self.page_cache = PageCache() if self.use_cache else None
+        self.archive = WarcWriter(archive_dir) if archive_dir else None
+        self.proxies = proxies or []
+        self.current_proxy_index = 0
+        self.proxy_pool = ProxyPool(self.proxies, allow_direct=allow_direct) if self.proxies else None
+        self.metrics = Metrics()
+        self.detail_extractor = InPageExtractor('detail', metrics=self.metrics)
+
+    def get_next_proxy(self):
+        """Take the healthiest proxy from the pool (None when there are no proxies)
+
+        Raises proxy_pool.NoProxyAvailable when every proxy stays quarantined
+        and a direct connection was not allowed.
+        """
+        if not self.proxy_pool:
+            return None
+        proxy = self.proxy_pool.acquire()
+        self.current_proxy_index += 1
+        if not proxy:
+            # Only with allow_direct; otherwise acquire() waits or raises
+            print("[Proxy] No healthy proxy available; connecting directly (--allow-direct)")
+            return None
+        print(f"[Proxy] Using proxy: {proxy}")
+        return proxy
+
+    def setup_driver(self, proxy=None):
+        """Setup Chrome driver with options"""
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument(f'--user-agent={self.ua.random}')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        if proxy:
+            options.add_argument(f'--proxy-server={proxy}')
+        if self.lean:
+            # Return control once the DOM is parsed; don't wait for subresources
+            options.page_load_strategy = 'eager'
+            for argument in config.LEAN_CHROME_ARGUMENTS:
+                options.add_argument(argument)
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.media_stream': 2,
+                'profile.default_content_setting_values.notifications': 2
+            })
+        
+        service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=options)
+        self.driver_proxy = proxy
+        self.watchdog.attach(self.driver)
+        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.lean:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': config.BLOCKED_URL_PATTERNS})
+            print(f"[Lean] Eager page loads, {len(config.BLOCKED_URL_PATTERNS)} blocked URL patterns")
+    
+    def recycle_driver(self, proxy=None):
+        """Quit the browser and start a fresh one (same proxy unless given) to release its memory"""
+        rss = self.watchdog.sample()
+        print(f"[Watchdog] Recycling driver after {self.watchdog.pages} pages ({rss / 1048576:.0f} MB)")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"[Error] Could not quit driver cleanly: {e}")
+        self.driver = None
+        self.setup_driver(proxy=proxy or self.driver_proxy)
+
+    def rotate_proxy_if_quarantined(self):
+        """Move the driver to another proxy once its current one is quarantined"""
+        if not self.proxy_pool or not self.proxy_pool.is_quarantined(self.driver_proxy):
+            return False
+        self.proxy_pool.release(self.driver_proxy)
+        proxy = self.get_next_proxy()
+        print(f"[Proxy] {self.driver_proxy} is quarantined; switching to {proxy or 'a direct connection'}")
+        self.driver_proxy = None
+        self.recycle_driver(proxy=proxy)
+        return True
+
+    def wait_for(self, condition, timeout=None):
+        """Wait for a readiness condition; returns False on timeout instead of raising"""
+        try:
+            WebDriverWait(self.driver, timeout or config.PAGE_READY_TIMEOUT, poll_frequency=0.1).until(condition)
+            return True
+        except TimeoutException:
+            return False
+
+    def is_throttled(self):
+        """Check whether the server answered with a rate-limit page"""
+        title = (self.driver.title or '').lower()
+        return '429' in title or 'too many requests' in title
+
+    def load_page(self, url, ready_selector):
+        """Load a page at the paced rate and wait until `ready_selector` is present
+
+        The observed load time and outcome are fed back into the AIMD pacer.
+        Returns (ready, status), where status is 429 for a rate-limit page.
+        """
+        self.metrics.inc('sleep_seconds_total', self.pacer.wait(), stage='pacer')
+        start = time.perf_counter()
+        self.driver.get(url)
+        ready = self.wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+        status = 429 if self.is_throttled() else None
+        latency = time.perf_counter() - start
+        self.pacer.record(latency, ok=ready, status=status)
+        stage = 'detail' if ready_selector == config.DETAIL_READY_SELECTOR else 'listing'
+        self.metrics.observe('page_load_seconds', latency, stage=stage, proxy=self.driver_proxy or 'direct')
+        if not ready or status is not None:
+            self.metrics.inc('errors_total', stage=stage, kind='throttled' if status else 'not_ready')
+        if self.proxy_pool:
+            self.proxy_pool.report(self.driver_proxy, ok=ready and status is None, latency=latency)
+        if not ready:
+            print(f"[Wait] '{ready_selector}' did not appear within {config.PAGE_READY_TIMEOUT}s: {url}")
+        self.record_page_stats()
+        self.watchdog.tick()
+        return ready, status
+
+    def record_page_stats(self):
+        """Report bytes transferred and load time of the last page load"""
+        try:
+            stats = self.driver.execute_script(_PAGE_STATS_JS)
+        except Exception as e:
+            log.debug("[Debug] Could not read page timing: %s", e)
+            return None
+        self.pages_loaded += 1
+        self.bytes_transferred += stats['bytes']
+        self.metrics.inc('bytes_total', stats['bytes'], stage='browser')
+        print(f"[Load] {stats['bytes'] / 1024:.1f} KB in {stats['resources']} requests, "
+              f"DOM ready after {stats['load_ms'] / 1000:.2f}s "
+              f"(run total: {self.bytes_transferred / 1048576:.1f} MB over {self.pages_loaded} pages)")
+        return stats
+
+    def cached_case_content(self, url):
+        """Parse a case from a fresh cached page source instead of loading it"""
+        entry = self.page_cache.get(url) if self.page_cache else None
+        if not entry or not entry['fresh']:
+            return None
+        case_data = parse_detail_html(entry['body'], url)
+        rechtsgebieden = [r.strip() for r in case_data['rechtsgebieden'].split(',') if r.strip()]
+        if not self.matches_subject(rechtsgebieden):
+            return False
+        print(f"[Cache] Served {case_data['ecli_code']} from the page cache")
+        return case_data
+
+    def extract_case_content(self, url):
+        start = time.perf_counter()
+        cached = self.cached_case_content(url)
+        if cached is not None:
+            return cached or None
+        if not self.driver:
+            print("[Error] WebDriver is not initialized when extracting case content.")
+            return CaseFailure(url, "WebDriver is not initialized", kind='transient')
+        try:
+            if not self.rotate_proxy_if_quarantined() and self.watchdog.recycle_due:
+                # Fresh browser, then continue with exactly this URL
+                self.recycle_driver()
+            if not self.driver:
+                print("[Error] WebDriver is not initialized before get().")
+                return CaseFailure(url, "WebDriver is not initialized", kind='transient')
+            ready, status = self.load_page(url, config.DETAIL_READY_SELECTOR)
+            if status is not None:
+                return CaseFailure(url, f"Rate limited (HTTP {status})", status=status)
+            if not ready:
+                # Extracting now would return an empty case and mark it done
+                return CaseFailure(url, "Case page did not finish loading", kind='transient')
+            if self.page_cache or self.archive:
+                page_source = self.driver.page_source
+                if self.page_cache:
+                    self.page_cache.put(url, page_source)
+                if self.archive:
+                    self.archive.write_resource(url, page_source)
+            
+            # Extract ECLI code from URL
+            ecli_code = ecli_from_url(url)
+            
+            # Extract all fields in a single round trip
+            with self.metrics.timer('extraction_seconds', stage='detail'):
+                fields, matched = self.detail_extractor.extract(self.driver)
+            log.debug("[Extract] Matched selectors: %s", matched)
+            rechtsgebieden = fields['rechtsgebieden']
+            
+            # Check if this case matches our subject
+            if not self.matches_subject(rechtsgebieden):
+                return None
+            
+            case_data = {
+                'ecli_code': ecli_code,
+                'title': fields['title'],
+                'court': fields['court'],
+                'date': fields['date'],
+                'date_uitspraak': fields['date_uitspraak'],
+                'date_publicatie': fields['date_publicatie'],
+                'inhoudsindicatie': fields['inhoudsindicatie'],
+                'content': fields['content'],
+                'url': url,
+                'rechtsgebieden': ', '.join(rechtsgebieden) if rechtsgebieden else ''
+            }
+            self.metrics.observe('case_seconds', time.perf_counter() - start, stage='detail')
+            
+            return case_data
+            
+        except NoProxyAvailable:
+            # Not a problem of this case; stops the page instead of dead-lettering it
+            raise
+        except Exception as e:
+            print(f"[Error] Failed to extract case content from {url}: {e}")
+            return CaseFailure(url, e)
+
+    def matches_subject(self, rechtsgebieden):
+        """Check whether a case's rechtsgebieden contain the scraped subject"""
+        if not self.subject or not rechtsgebieden:
+            return True
+        if subject_matches(self.subject, rechtsgebieden):
+            return True
+        print(f"[Filter] Skipping case - subject '{self.subject}' not found in rechtsgebieden: {rechtsgebieden}")
+        return False
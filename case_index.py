@@ -0,0 +1,70 @@
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+# SQLite's default limit on host parameters is 999; stay well below it
+_LOOKUP_CHUNK = 500
+
+
+def row_hash(values):
+    """Stable hash of a row's field values, used to notice changed rows"""
+    return hashlib.sha1("\x1f".join(values).encode('utf-8')).hexdigest()
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RowHashIndex:
+    """Persistent ECLI -> row hash index of the rows in a memory bank
+
+    Lets an ingest decide per row whether it is new, changed or already
+    stored without loading or rewriting the bank's cases file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "ecli TEXT PRIMARY KEY, row_hash TEXT, source TEXT, ingested_at TEXT)"
+        )
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def lookup(self, ecli_codes):
+        """Return {ecli: row_hash} for the given ECLIs that are in the index"""
+        ecli_codes = list(ecli_codes)
+        found = {}
+        for i in range(0, len(ecli_codes), _LOOKUP_CHUNK):
+            chunk = ecli_codes[i:i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self.conn.execute(
+                f"SELECT ecli, row_hash FROM rows WHERE ecli IN ({placeholders})", chunk
+            ).fetchall())
+        return found
+
+    def record(self, entries, source):
+        """Store (ecli, row_hash) pairs in one transaction"""
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO rows (ecli, row_hash, source, ingested_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(ecli) DO UPDATE SET row_hash = excluded.row_hash, "
+                "source = excluded.source, ingested_at = excluded.ingested_at",
+                [(ecli, digest, source, now) for ecli, digest in entries]
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,206 @@
+import re
+from lxml import etree, html
+
+# Namespaces used by the open-data content documents of data.rechtspraak.nl
+NAMESPACES = {
+    'rs': 'http://www.rechtspraak.nl/schema/rechtspraak-1.0',
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'dcterms': 'http://purl.org/dc/terms/',
+}
+
+DETAILS_URL = "https://uitspraken.rechtspraak.nl/details?id=ECLI:{ecli}"
+
+# Compiled once; evaluated for every document
+_FIRST_DESCRIPTION = etree.XPath('(//rdf:RDF/rdf:Description)[1]', namespaces=NAMESPACES)
+_INHOUDSINDICATIE = etree.XPath('//rs:inhoudsindicatie', namespaces=NAMESPACES)
+_UITSPRAAK = etree.XPath('//rs:uitspraak | //rs:conclusie', namespaces=NAMESPACES)
+_TEXT_BLOCKS = etree.XPath(".//*[local-name()='title' or local-name()='para']")
+
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
+# XPath equivalents of the 'detail' layout selectors, for rendered pages saved to disk
+_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_HTML_TITLE = etree.XPath(f"//h2[{_CLASS.format('rs-panel-title')}] | //h1")
+_HTML_CONTENT = etree.XPath(f"//div[{_CLASS.format('rnl-detail-uitspraaktekst')}]")
+_HTML_RECHTSGEBIEDEN = etree.XPath(f"//span[{_CLASS.format('hl0')}]")
+_HTML_LABELLED = etree.XPath("//label[contains(text(), $label)]/following-sibling::span[1]")
+
+
+def ecli_from_url(url):
+    """Extract the ECLI code (without the 'ECLI:' prefix) from a case URL"""
+    ecli_match = re.search(r'ECLI:([^&]+)', url)
+    return ecli_match.group(1) if ecli_match else ""
+
+
+def details_url(ecli_code):
+    """Build the public details URL for an ECLI code"""
+    return DETAILS_URL.format(ecli=ecli_code)
+
+
+def to_dutch_date(iso_date):
+    """Convert YYYY-MM-DD to the DD-MM-YYYY format used by the website"""
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})', iso_date or '')
+    if not match:
+        return iso_date or ""
+    year, month, day = match.groups()
+    return f"{day}-{month}-{year}"
+
+
+def _element_text(element):
+    """Join the text blocks of an element, one paragraph per line"""
+    if element is None:
+        return ""
+    blocks = []
+    for block in _TEXT_BLOCKS(element):
+        text = " ".join("".join(block.itertext()).split())
+        if text:
+            blocks.append(text)
+    if not blocks:
+        return " ".join("".join(element.itertext()).split())
+    return "\n".join(blocks)
+
+
+def _dcterm(description, name):
+    if description is None:
+        return ""
+    elem = description.find(f'dcterms:{name}', NAMESPACES)
+    return elem.text.strip() if elem is not None and elem.text else ""
+
+
+def split_rechtsgebieden(subject_text):
+    """Split an open-data subject label ('Bestuursrecht; Vreemdelingenrecht') into a list"""
+    return [part.strip() for part in (subject_text or '').split(';') if part.strip()]
+
+
+def subject_matches(subject, rechtsgebieden):
+    """Whether a subject occurs in any of a case's rechtsgebieden (case-insensitive substring)"""
+    return any(subject.lower() in rechtsgebied.lower() for rechtsgebied in rechtsgebieden)
+
+
+def _html_text(element):
+    """Approximate innerText: one line per text node, whitespace collapsed"""
+    lines = (" ".join(text.split()) for text in element.itertext())
+    return "\n".join(line for line in lines if line)
+
+
+def parse_detail_html(page_source, url):
+    """Parse a rendered uitspraken.rechtspraak.nl details page into case_data
+
+    Works on saved page sources (cache, archives) without a browser, using the
+    same primary selectors as the Selenium 'detail' layout.
+    """
+    root = html.fromstring(page_source)
+    etree.strip_elements(root, 'script', 'style', 'noscript', with_tail=False)
+
+    def first(nodes):
+        for node in nodes:
+            text = _html_text(node)
+            if text:
+                return text
+        return ""
+
+    def labelled(label):
+        return first(_HTML_LABELLED(root, label=label))
+
+    content = first(_HTML_CONTENT(root))
+    if len(content) < 100:
+        body = root.find('body')
+        content = _html_text(body) if body is not None else content
+    rechtsgebieden = [text for text in (_html_text(node) for node in _HTML_RECHTSGEBIEDEN(root)) if text]
+
+    return {
+        'ecli_code': ecli_from_url(url),
+        'title': first(_HTML_TITLE(root)),
+        'court': labelled('Instantie') or labelled('Rechter'),
+        'date': labelled('Datum'),
+        'date_uitspraak': labelled('Datum uitspraak'),
+        'date_publicatie': labelled('Datum publicatie'),
+        'inhoudsindicatie': labelled('Inhoudsindicatie'),
+        'content': content,
+        'url': url,
+        'rechtsgebieden': ', '.join(rechtsgebieden)
+    }
+
+
+def listing_case_data(card):
+    """Build a metadata-only case_data row from a parsed search result card"""
+    fields = card.get('fields', {})
+    rechtsgebieden = fields.get('rechtsgebieden') or []
+    if isinstance(rechtsgebieden, str):
+        rechtsgebieden = [rechtsgebieden]
+    ecli_code = ecli_from_url(card['url'])
+    return {
+        'ecli_code': ecli_code,
+        'title': card.get('title') or f"ECLI:{ecli_code}",
+        'court': fields.get('court', ''),
+        'date': fields.get('date_uitspraak', ''),
+        'date_uitspraak': fields.get('date_uitspraak', ''),
+        'date_publicatie': fields.get('date_publicatie', ''),
+        'inhoudsindicatie': fields.get('inhoudsindicatie', ''),
+        'content': '',
+        'url': card['url'],
+        'rechtsgebieden': ', '.join(rechtsgebieden)
+    }
+
+
+def feed_card(entry):
+    """Turn an open-data feed entry into a listing card
+
+    Feed titles read "ECLI:NL:RBDHA:2020:1, Rechtbank Den Haag, 01-01-2020, NL20.1".
+    Feed entries carry no rechtsgebieden, so the card leaves them empty rather
+    than assuming the subject the feed was queried for.
+    """
+    parts = [part.strip() for part in entry.get('title', '').split(',')]
+    court = parts[1] if len(parts) > 1 else ''
+    date = parts[2] if len(parts) > 2 and re.match(r'\d{2}-\d{2}-\d{4}$', parts[2]) else ''
+    return {
+        'url': entry['url'],
+        'title': f"ECLI:{entry['ecli_code']}",
+        'fields': {
+            'court': court,
+            'date_uitspraak': date,
+            'date_publicatie': '',
+            'inhoudsindicatie': entry.get('summary', ''),
+            'rechtsgebieden': []
+        }
+    }
+
+
+def parse_content_document(document, url=None):
+    """Parse an open-data content document into the scraper's case_data dict
+
+    The keys match MassiveLawScraper.extract_case_content so both engines
+    produce interchangeable rows.
+    """
+    root = etree.fromstring(document, _PARSER)
+
+    descriptions = _FIRST_DESCRIPTION(root)
+    description = descriptions[0] if descriptions else None
+
+    identifier = _dcterm(description, 'identifier')
+    ecli_code = identifier[len('ECLI:'):] if identifier.startswith('ECLI:') else identifier
+    if not ecli_code and url:
+        ecli_code = ecli_from_url(url)
+
+    rechtsgebieden = []
+    if description is not None:
+        for subject in description.findall('dcterms:subject', NAMESPACES):
+            rechtsgebieden.extend(split_rechtsgebieden(subject.text))
+
+    date_uitspraak = to_dutch_date(_dcterm(description, 'date'))
+    inhoud = _INHOUDSINDICATIE(root)
+    uitspraak = _UITSPRAAK(root)
+
+    return {
+        'ecli_code': ecli_code,
+        # The website panel title is the ECLI itself; keep rows identical across engines
+        'title': identifier or f"ECLI:{ecli_code}",
+        'court': _dcterm(description, 'creator'),
+        'date': date_uitspraak,
+        'date_uitspraak': date_uitspraak,
+        'date_publicatie': to_dutch_date(_dcterm(description, 'issued')),
+        'inhoudsindicatie': _element_text(inhoud[0] if inhoud else None),
+        'content': _element_text(uitspraak[0] if uitspraak else None),
+        'url': url or details_url(ecli_code),
+        'rechtsgebieden': ', '.join(rechtsgebieden)
+    }
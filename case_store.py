@@ -0,0 +1,156 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+import pandas as pd
+from output_writers import CASE_FIELDS, sortable_date
+
+# SQLite's default limit on host parameters is 999; stay well below it
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = [
+    # id is an explicit rowid so the external-content FTS index survives a VACUUM;
+    # the ECLI is the key every lookup and upsert goes through
+    "CREATE TABLE IF NOT EXISTS cases ("
+    "id INTEGER PRIMARY KEY, ecli_code TEXT NOT NULL UNIQUE, "
+    + ", ".join(f"{field} TEXT" for field in CASE_FIELDS[1:]) +
+    ", sort_date TEXT, row_hash TEXT, source TEXT, ingested_at TEXT)",
+    "CREATE INDEX IF NOT EXISTS cases_court ON cases (court)",
+    "CREATE INDEX IF NOT EXISTS cases_sort_date ON cases (sort_date)",
+    # One row per rechtsgebied of a case, so filtering on one is an index lookup
+    "CREATE TABLE IF NOT EXISTS case_rechtsgebieden ("
+    "rechtsgebied TEXT COLLATE NOCASE, ecli_code TEXT, PRIMARY KEY (rechtsgebied, ecli_code)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS case_rechtsgebieden_ecli ON case_rechtsgebieden (ecli_code)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5("
+    "title, inhoudsindicatie, content, content='cases', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS cases_fts_insert AFTER INSERT ON cases BEGIN "
+    "INSERT INTO cases_fts (rowid, title, inhoudsindicatie, content) "
+    "VALUES (new.id, new.title, new.inhoudsindicatie, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS cases_fts_delete AFTER DELETE ON cases BEGIN "
+    "INSERT INTO cases_fts (cases_fts, rowid, title, inhoudsindicatie, content) "
+    "VALUES ('delete', old.id, old.title, old.inhoudsindicatie, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS cases_fts_update AFTER UPDATE ON cases BEGIN "
+    "INSERT INTO cases_fts (cases_fts, rowid, title, inhoudsindicatie, content) "
+    "VALUES ('delete', old.id, old.title, old.inhoudsindicatie, old.content); "
+    "INSERT INTO cases_fts (rowid, title, inhoudsindicatie, content) "
+    "VALUES (new.id, new.title, new.inhoudsindicatie, new.content); END",
+]
+
+_UPSERT = (
+    f"INSERT INTO cases ({', '.join(CASE_FIELDS)}, sort_date, row_hash, source, ingested_at) "
+    f"VALUES ({', '.join('?' * (len(CASE_FIELDS) + 4))}) "
+    "ON CONFLICT(ecli_code) DO UPDATE SET "
+    + ", ".join(f"{field} = excluded.{field}" for field in CASE_FIELDS[1:]) +
+    ", sort_date = excluded.sort_date, row_hash = excluded.row_hash, "
+    "source = excluded.source, ingested_at = excluded.ingested_at"
+)
+
+
+def match_query(query):
+    """Free text to an FTS5 query: every word must occur, punctuation is ignored"""
+    return " ".join(f'"{word}"' for word in re.findall(r'\w+', query))
+
+
+class SqliteCaseStore:
+    """Case storage for LawCaseMemoryBank in one SQLite database (WAL mode)
+
+    Cases are keyed by ECLI, court, date and rechtsgebied are indexed, and
+    an FTS5 index over title, inhoudsindicatie and content answers keyword
+    searches. Writes touch only the rows of a batch. The store also serves
+    as the bank's ECLI -> row hash index (see case_index.RowHashIndex).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in _SCHEMA:
+                self.conn.execute(statement)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def lookup(self, ecli_codes):
+        """Return {ecli: row_hash} for the given ECLIs that are stored"""
+        ecli_codes = list(ecli_codes)
+        found = {}
+        for i in range(0, len(ecli_codes), _LOOKUP_CHUNK):
+            chunk = ecli_codes[i:i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(tuple(row) for row in self.conn.execute(
+                f"SELECT ecli_code, row_hash FROM cases WHERE ecli_code IN ({placeholders})", chunk
+            ))
+        return found
+
+    def upsert(self, frame, hashes, source):
+        """Insert or replace the cases of a DataFrame (CASE_FIELDS columns) in one transaction"""
+        now = datetime.now().isoformat()
+        rows = []
+        rechtsgebieden = []
+        for values, digest in zip(frame[CASE_FIELDS].itertuples(index=False, name=None), hashes):
+            case = dict(zip(CASE_FIELDS, values))
+            rows.append((*values, sortable_date(case['date']), digest, source, now))
+            rechtsgebieden.extend((r.strip(), case['ecli_code'])
+                                  for r in case['rechtsgebieden'].split(',') if r.strip())
+        with self.conn:
+            self.conn.executemany(_UPSERT, rows)
+            self.conn.executemany("DELETE FROM case_rechtsgebieden WHERE ecli_code = ?",
+                                  [(row[0],) for row in rows])
+            self.conn.executemany("INSERT OR IGNORE INTO case_rechtsgebieden (rechtsgebied, ecli_code) "
+                                  "VALUES (?, ?)", rechtsgebieden)
+
+    def get(self, ecli_code):
+        row = self.conn.execute(f"SELECT {', '.join(CASE_FIELDS)} FROM cases WHERE ecli_code = ?",
+                                (ecli_code,)).fetchone()
+        return dict(row) if row else None
+
+    def search(self, query, limit=10, court=None, rechtsgebied=None, date_from=None, date_to=None):
+        """Keyword search ranked by BM25; dates are DD-MM-YYYY"""
+        match = match_query(query)
+        if not match:
+            return []
+        sql = ("SELECT c.ecli_code, c.title, c.court, c.date, c.url, c.rechtsgebieden, "
+               "snippet(cases_fts, -1, '[', ']', '...', 16) AS snippet, bm25(cases_fts) AS score "
+               "FROM cases_fts JOIN cases c ON c.id = cases_fts.rowid WHERE cases_fts MATCH ?")
+        params = [match]
+        if court:
+            sql += " AND c.court = ?"
+            params.append(court)
+        if rechtsgebied:
+            sql += " AND c.ecli_code IN (SELECT ecli_code FROM case_rechtsgebieden WHERE rechtsgebied = ?)"
+            params.append(rechtsgebied)
+        if sortable_date(date_from):
+            sql += " AND c.sort_date >= ?"
+            params.append(sortable_date(date_from))
+        if sortable_date(date_to):
+            sql += " AND c.sort_date <= ?"
+            params.append(sortable_date(date_to))
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def court_counts(self):
+        return dict(tuple(row) for row in self.conn.execute(
+            "SELECT court, COUNT(*) FROM cases GROUP BY court ORDER BY COUNT(*) DESC"
+        ))
+
+    def date_range(self):
+        """(earliest, latest) as YYYY-MM-DD, or None without dated cases"""
+        earliest, latest = self.conn.execute(
+            "SELECT MIN(sort_date), MAX(sort_date) FROM cases WHERE sort_date IS NOT NULL"
+        ).fetchone()
+        if not earliest:
+            return None
+        return tuple(f"{d[:4]}-{d[4:6]}-{d[6:]}" for d in (earliest, latest))
+
+    def frame(self, columns=None):
+        """All cases as a DataFrame in insertion order (only for vectorizing and exports)"""
+        return pd.read_sql_query(f"SELECT {', '.join(columns or CASE_FIELDS)} FROM cases ORDER BY id", self.conn)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+import config
+
+
+class CheckpointLog:
+    """Append-only write-ahead log of harvested URLs and finished cases
+
+    Every harvested case URL and every extracted case is appended as one JSON
+    line. Lines are buffered and fsynced in batches (every `sync_every`
+    records or `sync_interval` seconds), so logging costs little in the hot
+    loop while a crash loses at most one batch. On resume the log is replayed:
+    finished cases are restored instead of fetched again and URLs that were
+    harvested but never finished are extracted before the listing is clicked
+    any further. Only the URLs of finished cases are kept in memory; the
+    cases themselves are read back from the log by restored_cases().
+    """
+
+    def __init__(self, path=None, sync_every=None, sync_interval=None, on_sync=None):
+        self.path = path or os.path.join(config.OUTPUT_DIR, config.CHECKPOINT_FILE)
+        self.sync_every = sync_every or config.CHECKPOINT_SYNC_EVERY
+        self.sync_interval = sync_interval or config.CHECKPOINT_SYNC_INTERVAL
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.last_sync = time.monotonic()
+        # Called after every fsync, e.g. to mark the now durable cases as seen
+        self.on_sync = on_sync
+        # Replayed state
+        self.harvested = {}
+        self.done = set()
+        self.skipped = set()
+        self.dead = set()
+        self.pages_done = set()
+        self.replay()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def replay(self):
+        """Rebuild harvested URLs, finished URLs and finished pages from the log"""
+        if not os.path.exists(self.path):
+            return
+        records = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line of a crashed run
+                    continue
+                records += 1
+                kind = record.get('type')
+                if kind == 'url':
+                    self.harvested.setdefault(record['url'], record.get('page'))
+                elif kind == 'case':
+                    self.done.add(record['url'])
+                elif kind == 'skip':
+                    self.skipped.add(record['url'])
+                elif kind == 'dead':
+                    self.dead.add(record['url'])
+                elif kind == 'page':
+                    self.pages_done.add(record['page'])
+        print(f"[Checkpoint] Replayed {records} records: {len(self.harvested)} URLs harvested, "
+              f"{len(self.done)} cases finished, {len(self.pending())} pending")
+
+    def restored_cases(self):
+        """Yield (url, case_data) for every finished case in the log, reading it from disk"""
+        if not os.path.exists(self.path):
+            return
+        restored = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('type') == 'case' and record['url'] not in restored:
+                    restored.add(record['url'])
+                    yield record['url'], record['case']
+
+    def pending(self):
+        """URLs harvested in an earlier session that never finished extraction"""
+        return [url for url in self.harvested if not self.is_done(url)]
+
+    def is_done(self, url):
+        # Dead-lettered URLs count as done; --retry-failed picks them up
+        return url in self.done or url in self.skipped or url in self.dead
+
+    def _append(self, record):
+        with self.lock:
+            self.buffer.append(json.dumps(record, ensure_ascii=False))
+            if len(self.buffer) >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+                self._sync()
+
+    def _sync(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+        if self.on_sync:
+            self.on_sync()
+
+    def sync(self):
+        """Force buffered records to disk"""
+        with self.lock:
+            self._sync()
+
+    def url_harvested(self, url, page=None):
+        if url in self.harvested:
+            return
+        self.harvested[url] = page
+        self._append({'type': 'url', 'url': url, 'page': page})
+
+    def case_done(self, url, case_data):
+        self.done.add(url)
+        self._append({'type': 'case', 'url': url, 'case': case_data})
+
+    def case_skipped(self, url):
+        """A case that was extracted but has no output (e.g. outside the subject)"""
+        self.skipped.add(url)
+        self._append({'type': 'skip', 'url': url})
+
+    def case_dead(self, url):
+        self.dead.add(url)
+        self._append({'type': 'dead', 'url': url})
+
+    def page_done(self, page):
+        self.pages_done.add(page)
+        self._append({'type': 'page', 'page': page})
+        # Page boundaries are natural sync points for the progress file
+        self.sync()
+
+    def reset(self):
+        """Start an empty log once the run's outputs are complete"""
+        with self.lock:
+            self.buffer = []
+            self.file.close()
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self.harvested, self.done, self.skipped, self.dead, self.pages_done = {}, set(), set(), set(), set()
+
+    def settle(self):
+        """Compact the log once its finished cases are in settled output files
+
+        Only URLs that are still pending, skipped URLs and the finished pages
+        are kept, so the next run neither writes those cases again nor
+        forgets lost work.
+        """
+        with self.lock:
+            self._sync()
+            pending = [(url, page) for url, page in self.harvested.items() if not self.is_done(url)]
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for url, page in pending:
+                    f.write(json.dumps({'type': 'url', 'url': url, 'page': page}, ensure_ascii=False) + "\n")
+                for url in self.skipped:
+                    f.write(json.dumps({'type': 'skip', 'url': url}, ensure_ascii=False) + "\n")
+                for page in sorted(self.pages_done):
+                    f.write(json.dumps({'type': 'page', 'page': page}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.file.close()
+            os.replace(tmp_path, self.path)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            self.harvested, self.done, self.dead = dict(pending), set(), set()
+
+    def close(self):
+        with self.lock:
+            self._sync()
+            self.file.close()
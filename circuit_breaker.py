@@ -0,0 +1,77 @@
+import threading
+import time
+import config
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `allow()` refuses calls for `reset_timeout` seconds. Then one trial call
+    is let through (half-open): success closes the breaker, failure opens it
+    again with the timeout doubled, up to `max_timeout`.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=None, reset_timeout=None, max_timeout=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or config.BREAKER_FAILURE_THRESHOLD
+        self.base_timeout = reset_timeout or config.BREAKER_RESET_TIMEOUT
+        self.max_timeout = max_timeout or config.BREAKER_MAX_TIMEOUT
+        self.reset_timeout = self.base_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def remaining(self):
+        """Seconds until an open breaker lets a trial call through"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def allow(self):
+        """True if a call may go ahead now"""
+        with self.lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def trip(self):
+        """Open the breaker right away, e.g. after a failed health probe"""
+        with self.lock:
+            self.opened_at = self.clock()
+            self.trial_running = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+            self.reset_timeout = self.base_timeout
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running:
+                # Failed trial: stay open for longer
+                self.reset_timeout = min(self.max_timeout, self.reset_timeout * 2)
+                self.opened_at = self.clock()
+            elif self.opened_at is None and self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self.trial_running = False
@@ -35,6 +35,41 @@ LAW_CATEGORIES = [
     "Volkenrecht"
 ]
 
+# Open-data rechtsgebied identifiers for each law category
+RECHTSGEBIED_URIS = {
+    "Bestuursrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht",
+    "Ambtenarenrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_ambtenarenrecht",
+    "Belastingrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_belastingrecht",
+    "Bestuursprocesrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_bestuursprocesrecht",
+    "Bestuursstrafrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_bestuursstrafrecht",
+    "Europees Bestuursrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_europeesBestuursrecht",
+    "Mededingingsrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_mededingingsrecht",
+    "Omgevingsrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_omgevingsrecht",
+    "Socialezekerheidsrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_socialezekerheidsrecht",
+    "Vreemdelingenrecht": "http://psi.rechtspraak.nl/rechtsgebied#bestuursrecht_vreemdelingenrecht",
+    "Civiel recht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht",
+    "Aanbestedingsrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_aanbestedingsrecht",
+    "Arbeidsrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_arbeidsrecht",
+    "Burgerlijk procesrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_burgerlijkProcesrecht",
+    "Europees civiel recht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_europeesCivielRecht",
+    "Goederenrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_goederenrecht",
+    "Insolventierecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_insolventierecht",
+    "Intellectueel-eigendomsrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_intellectueelEigendomsrecht",
+    "Internationaal privaatrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_internationaalPrivaatrecht",
+    "Ondernemingsrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_ondernemingsrecht",
+    "Personen- en familierecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_personenEnFamilierecht",
+    "Verbintenissenrecht": "http://psi.rechtspraak.nl/rechtsgebied#civielRecht_verbintenissenrecht",
+    "Strafrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht",
+    "Europees strafrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht_europeesStrafrecht",
+    "Internationaal strafrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht_internationaalStrafrecht",
+    "Materieel strafrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht_materieelStrafrecht",
+    "Penitentiair strafrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht_penitentiairStrafrecht",
+    "Strafprocesrecht": "http://psi.rechtspraak.nl/rechtsgebied#strafRecht_strafprocesrecht",
+    "Internationaal publiekrecht": "http://psi.rechtspraak.nl/rechtsgebied#internationaalPubliekrecht",
+    "Mensenrechten": "http://psi.rechtspraak.nl/rechtsgebied#internationaalPubliekrecht_mensenrechten",
+    "Volkenrecht": "http://psi.rechtspraak.nl/rechtsgebied#internationaalPubliekrecht_volkenrecht"
+}
+
 # Current law category to scrape
 CURRENT_LAW = "Vreemdelingenrecht"
 
@@ -44,10 +79,180 @@ DELAY_BETWEEN_PAGES = 3  # seconds
 DELAY_BETWEEN_CASES = 2   # seconds
 DELAY_AFTER_ERROR = 5     # seconds
 
+# Adaptive pacing (AIMD): speed up while the server is healthy, back off on errors and 429s
+PACER_INITIAL_RATE = 0.3     # requests/second to start with
+PACER_MIN_RATE = 0.05        # requests/second floor when backing off
+PACER_MAX_RATE = 2.0         # requests/second ceiling when healthy
+PACER_INCREASE = 0.05        # requests/second added after each healthy response
+PACER_DECREASE = 0.5         # rate multiplier after an error, 429 or slow response
+PACER_TARGET_LATENCY = 5.0   # seconds; slower responses count as unhealthy
+
+# Readiness conditions instead of fixed sleeps
+PAGE_READY_TIMEOUT = 15      # seconds to wait for a page to become ready
+DETAIL_READY_SELECTOR = "div.rnl-detail-uitspraaktekst"
+LISTING_READY_SELECTOR = "a[href*='ECLI']"
+SELECTOR_PROMOTE_AFTER = 25  # consecutive wins before a fallback selector is tried first (0 = never)
+
+# Lean Chrome profile: eager page loads and no assets the scraper doesn't read
+LEAN_PROFILE = False
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*.css",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*siteimprove*", "*hotjar*", "*piwik*", "*matomo*"
+]
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run"
+]
+
+# Browser memory watchdog: recycle the driver after this many pages or this much memory
+DRIVER_MAX_PAGES = 1000
+DRIVER_MAX_RSS_MB = 1500     # chromedriver + all Chrome processes
+WATCHDOG_SAMPLE_EVERY = 10   # pages between memory samples
+
+# Concurrent fetching (http engine)
+MAX_IN_FLIGHT = 8           # maximum simultaneous requests
+REQUESTS_PER_SECOND = 4.0   # token-bucket rate limit
+RATE_BURST = 8              # tokens the bucket can hold
+ASYNC_BACKOFF_STATUSES = [429, 503]  # only these slow the http engine down; other errors are retried
+ASYNC_BACKOFF_COOLDOWN = 2.0         # seconds; a burst of throttled responses counts as one back-off
+ASYNC_RECOVERY = 0.1                 # fraction of the rate limit regained per healthy response
+
+# Selenium worker pool: one headless Chrome process per worker
+BROWSER_WORKERS = 1
+
+# Producer/consumer pipeline: extract cases while the listing is still loading
+PIPELINE = True
+PIPELINE_QUEUE_SIZE = 200   # harvested URLs waiting for extraction
+PIPELINE_BATCH_SIZE = 32    # URLs handed to the detail engine at once
+
+# Seen-ECLI index: skip cases already scraped in earlier runs
+SKIP_SEEN = True
+SEEN_INDEX_FILE = "seen_ecli.sqlite"   # inside OUTPUT_DIR, shared by all runs
+SEEN_INDEX_CAPACITY = 1000000         # bloom filter sizing
+
+# Metrics and logging
+METRICS_ENABLED = True
+METRICS_FILE = "metrics.json"          # inside OUTPUT_DIR, rewritten every METRICS_INTERVAL
+METRICS_INTERVAL = 15                  # seconds
+METRICS_PORT = 0                       # serve Prometheus text at :PORT/metrics (0 = off)
+METRICS_HOST = "127.0.0.1"             # interface the endpoint binds to; "0.0.0.0" exposes it to the network
+LOG_LEVEL = "INFO"                     # DEBUG shows per-selector and per-click detail
+
+# Local stand-in server and benchmarks (standin_server.py, benchmark.py)
+STANDIN_PORT = 8765
+STANDIN_CASES = 2000                   # synthetic rulings served
+STANDIN_LATENCY = 0.05                 # mean seconds per response
+STANDIN_ERROR_RATE = 0.0               # fraction of responses that are 503s
+STANDIN_PAGE_KB = 40                   # ruling text per detail page / content document
+STANDIN_LISTING_BATCH = 10             # cards added per 'Laad meer resultaten' click
+BENCH_CASES = 500                      # cases fetched per scenario
+BENCH_CONCURRENCY = [1, 8, 32]         # in-flight requests (http engine)
+BENCH_WORKERS = [1, 2]                 # Chrome processes (selenium engine)
+BENCH_RATE = 1000.0                    # requests/second cap; high so the engine is measured, not the limiter
+BENCH_TOLERANCE = 0.2                  # allowed cases/second drop against a baseline
+
+# Circuit breakers (defaults)
+BREAKER_FAILURE_THRESHOLD = 5          # consecutive failures before the breaker opens
+BREAKER_RESET_TIMEOUT = 30             # seconds before the first trial call
+BREAKER_MAX_TIMEOUT = 600              # upper bound after repeated failed trials
+
+# Retries and dead letters
+RETRY_MAX_ATTEMPTS = 4                 # attempts per case for transient failures
+RETRY_BASE_DELAY = 1.0                 # seconds; backoff is U(0, base * 2**attempt)
+RETRY_MAX_DELAY = 60
+MAX_PAGE_FAILURES = 5                  # consecutive failed listing pages before the run stops
+DEAD_LETTER_FILE = "dead_letters.jsonl"  # inside OUTPUT_DIR
+
+# Proxy pool
+PROXY_VALIDATE = True                  # probe all proxies concurrently before the run
+PROXY_TEST_URL = "https://uitspraken.rechtspraak.nl/"
+PROXY_EXPECT_TEXT = "Rechtspraak"      # must appear in the probe response ('' to skip)
+PROXY_TEST_TIMEOUT = 10
+PROXY_VALIDATE_CONCURRENCY = 50
+PROXY_FAILURE_THRESHOLD = 3            # consecutive failures before a proxy is quarantined
+PROXY_QUARANTINE = 120                 # seconds a failing proxy sits out
+PROXY_WAIT_TIMEOUT = 300               # seconds to wait for a proxy when all are quarantined, then stop
+PROXY_ALLOW_DIRECT = False             # fall back to a direct connection (your own IP) instead of waiting
+
+# Listing cards
+LISTING_PREFILTER = True               # drop cards of other subjects before fetching details
+METADATA_ONLY = False                  # emit rows from the listing cards; content stays empty
+
+# Partitioned Parquet output (needs pyarrow)
+PARQUET_OUTPUT = False
+PARQUET_DIR = "parquet"                # inside OUTPUT_DIR, partitioned rechtsgebied=/year=
+PARQUET_FLUSH_ROWS = 2000              # rows per written batch of files
+PARQUET_COMPRESSION = "zstd"
+
+# Write-ahead checkpoint log (crash-safe resume per case)
+CHECKPOINT_FILE = "checkpoint.log"     # inside OUTPUT_DIR
+CHECKPOINT_SYNC_EVERY = 50             # records buffered before an fsync
+CHECKPOINT_SYNC_INTERVAL = 2.0         # seconds between fsyncs at the latest
+
+# Streaming output writers
+OUTPUT_FLUSH_EVERY = 50                # cases written before a flush
+OUTPUT_FLUSH_INTERVAL = 5.0            # seconds between flushes at the latest
+
+# WARC archive of raw responses (replayed offline by reextract.py)
+WARC_ARCHIVE = False
+WARC_DIR = "warc"                      # inside OUTPUT_DIR
+WARC_MAX_MB = 100                      # a new file is started beyond this size
+REEXTRACT_WORKERS = None               # processes for reextract.py (None = one per CPU)
+REEXTRACT_BATCH = 200                  # records handed to a worker at once
+
+# On-disk page cache (listing and detail responses)
+USE_CACHE = True
+CACHE_DIR = "cache"
+CACHE_MAX_MB = 2048                    # least recently used entries are evicted beyond this
+CACHE_FRESH_FOR = 7 * 24 * 3600        # seconds a detail page is served without revalidation
+CACHE_LISTING_FRESH_FOR = 3600         # seconds a feed page is served without revalidation
+
+# Date-range backfill (shard_planner.py)
+SHARD_MAX_CASES = 5000   # rulings per shard; denser windows are split
+SHARD_WORKERS = 4        # shards running at the same time
+
 # Output settings
 OUTPUT_DIR = "run"
 CASE_TXT_FILE = "all_cases.txt"
 METADATA_CSV_FILE = "cases_metadata.csv"
 
+# TXT archive import (txt_importer.py)
+TXT_IMPORT_BATCH = 5000                # cases parsed before they are handed to the memory bank
+
+# Memory bank storage: "csv" keeps memory_bank/cases.csv in pandas,
+# "sqlite" keeps memory_bank/cases.sqlite (WAL, FTS5 keyword search) and reads cases on demand
+MEMORY_BANK_BACKEND = "csv"
+
+# Incremental memory bank ingest of OUTPUT_DIR (ingest_run.py)
+INGEST_PATTERNS = ["cases_metadata_*.csv", "scraped_cases.csv"]  # searched recursively
+INGEST_CHUNK_ROWS = 5000               # CSV rows read and compared at once
+
 # Content extraction settings
-MAX_CONTENT_LENGTH = 50000  # characters per case 
\ No newline at end of file
+MAX_CONTENT_LENGTH = 50000  # characters per case
+
+# Detail engine: "selenium" renders each ruling in Chrome,
+# "http" fetches the open-data content document by ECLI (no browser)
+DETAIL_ENGINE = "selenium"
+OPEN_DATA_BASE_URL = "https://data.rechtspraak.nl"
+HTTP_TIMEOUT = 30  # seconds
+
+# Case discovery: "search" clicks "Load More" on the website,
+# "feed" pages through the open-data ECLI search feed
+CASE_SOURCE = "search"
+FEED_PAGE_SIZE = 1000         # ECLIs per feed page (the feed's maximum)
+FEED_DATE_FROM = "03-03-1984"  # DD-MM-YYYY, oldest uitspraakdatum to enumerate 
\ No newline at end of file
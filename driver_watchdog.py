@@ -0,0 +1,108 @@
+import os
+import config
+
+try:
+    import psutil
+except ImportError:  # Optional; fall back to /proc on Linux
+    psutil = None
+
+
+def _proc_children():
+    """Map parent pid -> child pids by scanning /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # The command name may contain spaces; fields after ')' are fixed
+                fields = f.read().rsplit(')', 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def _proc_rss(pid):
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and all of its descendants"""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    if not os.path.isdir('/proc'):
+        return 0
+    children = _proc_children()
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _proc_rss(current)
+        stack.extend(children.get(current, []))
+    return total
+
+
+class DriverWatchdog:
+    """Track browser memory and page count and decide when to recycle the driver
+
+    Memory is the RSS of chromedriver plus every Chrome process it spawned,
+    sampled every `sample_every` pages. A recycle is due after `max_pages`
+    pages or once the sample exceeds `max_rss_mb`.
+    """
+
+    def __init__(self, max_pages=None, max_rss_mb=None, sample_every=None):
+        self.max_pages = max_pages or config.DRIVER_MAX_PAGES
+        self.max_rss = (max_rss_mb or config.DRIVER_MAX_RSS_MB) * 1024 * 1024
+        self.sample_every = sample_every or config.WATCHDOG_SAMPLE_EVERY
+        self.pid = None
+        self.pages = 0
+        self.rss = 0
+        self.recycle_due = False
+
+    def attach(self, driver):
+        """Start watching a freshly started driver"""
+        service = getattr(driver, 'service', None)
+        process = getattr(service, 'process', None)
+        self.pid = process.pid if process else None
+        self.pages = 0
+        self.rss = 0
+        self.recycle_due = False
+
+    def sample(self):
+        if self.pid:
+            self.rss = process_tree_rss(self.pid)
+        return self.rss
+
+    def tick(self):
+        """Count one page; returns True when the driver should be recycled"""
+        self.pages += 1
+        if self.pages % self.sample_every == 0:
+            self.sample()
+        if self.pages >= self.max_pages:
+            reason = f"{self.pages} pages loaded"
+        elif self.rss >= self.max_rss:
+            reason = f"browser RSS {self.rss / 1048576:.0f} MB"
+        else:
+            return False
+        if not self.recycle_due:
+            print(f"[Watchdog] Driver recycle due: {reason}")
+        self.recycle_due = True
+        return True
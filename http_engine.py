@@ -0,0 +1,59 @@
+import time
+import httpx
+import config
+from case_parsers import ecli_from_url, parse_content_document
+from page_cache import cached_fetch
+from retry_policy import CaseFailure
+
+
+def content_url(ecli_code, base_url=None):
+    """URL of the open-data content document for an ECLI code"""
+    base_url = (base_url or config.OPEN_DATA_BASE_URL).rstrip('/')
+    return f"{base_url}/uitspraken/content?id=ECLI:{ecli_code}"
+
+
+class HttpCaseEngine:
+    """Browserless case-detail engine backed by the open-data content service
+
+    Keeps one pooled HTTP/2 connection open and fetches the machine-readable
+    document for each ruling by ECLI instead of rendering the details page.
+    """
+
+    def __init__(self, user_agent=None, proxy=None, base_url=None, timeout=None, cache=None, archive=None):
+        self.base_url = (base_url or config.OPEN_DATA_BASE_URL).rstrip('/')
+        self.cache = cache
+        self.archive = archive
+        headers = {'Accept': 'application/xml'}
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        self.client = httpx.Client(
+            http2=True,
+            proxy=proxy,
+            headers=headers,
+            timeout=timeout or config.HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            follow_redirects=True
+        )
+
+    def fetch_document(self, ecli_code):
+        """Fetch the raw XML content document for an ECLI code (through the page cache)"""
+        return cached_fetch(self.cache, self.client, content_url(ecli_code, self.base_url), archive=self.archive)
+
+    def extract_case_content(self, url):
+        """Fetch and parse a ruling into the case_data dict used by the scraper"""
+        ecli_code = ecli_from_url(url)
+        if not ecli_code:
+            print(f"[Error] No ECLI code found in URL: {url}")
+            return CaseFailure(url, "No ECLI code in URL", kind='permanent')
+        try:
+            start = time.perf_counter()
+            document = self.fetch_document(ecli_code)
+            case_data = parse_content_document(document, url=url)
+            print(f"[HTTP] Fetched ECLI:{ecli_code} in {time.perf_counter() - start:.3f}s")
+            return case_data
+        except Exception as e:
+            print(f"[Error] Failed to fetch case content for ECLI:{ecli_code}: {e}")
+            return CaseFailure(url, e)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,115 @@
+import argparse
+import glob
+import os
+import time
+from datetime import datetime
+import pandas as pd
+import config
+from case_index import file_digest
+
+
+def source_files(run_dir, patterns=None):
+    """Finished scraper CSVs under run_dir, oldest first; files still being written are skipped"""
+    paths = set()
+    for pattern in patterns or config.INGEST_PATTERNS:
+        paths.update(glob.glob(os.path.join(run_dir, '**', pattern), recursive=True))
+    paths = [path for path in paths if '_inprogress' not in path]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def changed_files(memory_bank, paths):
+    """Yield (path, record) for files that are new or changed since they were consumed
+
+    A file whose mtime and size match its consumed_files entry is skipped
+    without being read; otherwise it is hashed, and only a different hash
+    makes it worth ingesting (a touched but unchanged file just has its
+    entry refreshed).
+    """
+    consumed = memory_bank.metadata.setdefault("consumed_files", {})
+    for path in paths:
+        key = os.path.normpath(path)
+        stat = os.stat(path)
+        previous = consumed.get(key)
+        if previous and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+            continue
+        digest = file_digest(path)
+        if previous and previous['sha256'] == digest:
+            previous.update(mtime=stat.st_mtime, size=stat.st_size)
+            continue
+        yield key, {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': digest}
+
+
+def ingest_file(memory_bank, path, chunk_rows):
+    """Append the new and changed rows of one CSV; returns (rows read, appended frames)"""
+    rows = 0
+    frames = []
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+        if 'ecli_code' not in chunk.columns:
+            print(f"[Ingest] Skipping {path}: no ecli_code column")
+            break
+        rows += len(chunk)
+        frames.append(memory_bank.append_cases(chunk, source=path, update_loaded=False))
+    return rows, frames
+
+
+def ingest_run_dir(memory_bank, run_dir=None, patterns=None, chunk_rows=None):
+    """Append new or changed cases from run_dir's CSVs to a LawCaseMemoryBank
+
+    Only files not yet consumed (by mtime, size and hash) are read, in
+    chunks, and only rows whose ECLI is new or whose content changed are
+    appended to the bank. Returns the number of cases appended.
+    """
+    run_dir = run_dir or config.OUTPUT_DIR
+    chunk_rows = chunk_rows or config.INGEST_CHUNK_ROWS
+    start = time.perf_counter()
+    paths = source_files(run_dir, patterns)
+    consumed = memory_bank.metadata.setdefault("consumed_files", {})
+
+    appended = []
+    files = 0
+    for path, record in changed_files(memory_bank, paths):
+        rows, frames = ingest_file(memory_bank, path, chunk_rows)
+        new_rows = sum(len(frame) for frame in frames)
+        files += 1
+        appended.extend(frames)
+        record.update(rows=rows, new_rows=new_rows, ingested_at=datetime.now().isoformat())
+        consumed[path] = record
+        memory_bank.metadata["data_sources"].append({
+            "source": path,
+            "date": record['ingested_at'],
+            "cases_added": new_rows
+        })
+        print(f"[Ingest] {os.path.basename(path)}: {new_rows} new or changed of {rows} rows")
+
+    added = sum(len(frame) for frame in appended)
+    # Also saves the refreshed entries of touched but unchanged files
+    memory_bank.extend_loaded(appended)
+    print(f"[Ingest] {added} cases appended from {files} of {len(paths)} files in "
+          f"{time.perf_counter() - start:.1f}s. Total cases: {memory_bank.case_count()}")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append new or changed scraper CSVs to the memory bank')
+    parser.add_argument('run_dir', nargs='?', default=config.OUTPUT_DIR,
+                        help='Directory searched recursively for scraper CSVs (default: run)')
+    parser.add_argument('--pattern', action='append', dest='patterns',
+                        help='File pattern to ingest; repeatable (default: config.INGEST_PATTERNS)')
+    parser.add_argument('--chunk-rows', type=int, default=config.INGEST_CHUNK_ROWS,
+                        help='CSV rows read and compared at once')
+    parser.add_argument('--memory-bank', default='memory_bank', help='Memory bank directory')
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default=config.MEMORY_BANK_BACKEND,
+                        help='Memory bank storage backend')
+    parser.add_argument('--vectorize', action='store_true', help='Vectorize afterwards if cases were added')
+
+    args = parser.parse_args()
+
+    from memory_bank import LawCaseMemoryBank
+    memory_bank = LawCaseMemoryBank(args.memory_bank, backend=args.backend)
+    added = ingest_run_dir(memory_bank, args.run_dir, patterns=args.patterns, chunk_rows=args.chunk_rows)
+    if added and args.vectorize:
+        memory_bank.vectorize_cases()
+
+
+if __name__ == "__main__":
+    main()
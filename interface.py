@@ -1,4 +1,3 @@
-import pandas as pd
 from memory_bank import LawCaseMemoryBank
 import os
 
@@ -11,22 +10,24 @@ def main():
     
     while True:
         print("\nOptions:")
-        print("1. Load scraped data and vectorize")
+        print("1. Ingest new scraped data from run/ and vectorize")
         print("2. Search similar cases")
         print("3. Get case by ECLI code")
         print("4. Show statistics")
         print("5. Export all cases to CSV")
-        print("6. Exit")
+        print("6. Import all_cases_*.txt archives from run/ and vectorize")
+        print("7. Keyword search")
+        print("8. Exit")
         
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == "1":
-            if os.path.exists("run/scraped_cases.csv"):
-                print("Loading scraped cases...")
-                scraped_df = pd.read_csv("run/scraped_cases.csv")
-                memory_bank.add_cases(scraped_df, source="scraper")
-                memory_bank.vectorize_cases()
-                print("✓ Data loaded and vectorized!")
+            if os.path.exists("run"):
+                print("Ingesting scraped cases...")
+                added = memory_bank.ingest_run_dir("run")
+                if added or not memory_bank.metadata["vectorized"]:
+                    memory_bank.vectorize_cases()
+                print(f"✓ {added} new or changed cases ingested and vectorized!")
             else:
                 print("❌ No scraped data found. Run the scraper first.")
         
@@ -88,11 +89,41 @@ def main():
                 print(f"✓ Exported to: {output_file}")
         
         elif choice == "6":
+            path = input("Archive file or directory [run]: ").strip() or "run"
+            if os.path.exists(path):
+                added = memory_bank.add_txt_cases(path)
+                if added:
+                    memory_bank.vectorize_cases()
+                    print(f"✓ Imported {added} cases and vectorized!")
+                else:
+                    print("❌ No cases found in the TXT archives.")
+            else:
+                print(f"❌ {path} does not exist.")
+        
+        elif choice == "7":
+            query = input("Enter keywords: ").strip()
+            if query:
+                rechtsgebied = input("Rechtsgebied (optional): ").strip() or None
+                results = memory_bank.search_cases(query, top_k=10, rechtsgebied=rechtsgebied)
+                if results:
+                    print(f"\n{len(results)} matching cases:")
+                    for i, result in enumerate(results, 1):
+                        print(f"\n{i}. {result['title']}")
+                        print(f"   ECLI: {result['ecli_code']}")
+                        print(f"   Court: {result['court']}")
+                        print(f"   Date: {result['date']}")
+                        print(f"   {' '.join(result['snippet'].split())}")
+                else:
+                    print("No matching cases found.")
+            else:
+                print("Please enter keywords.")
+        
+        elif choice == "8":
             print("Goodbye!")
             break
         
         else:
-            print("Invalid choice. Please enter 1-6.")
+            print("Invalid choice. Please enter 1-8.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,19 +4,33 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import pickle
 import os
+import csv
 import json
 from datetime import datetime
 import re
+import config
+from case_index import RowHashIndex, row_hash
+from case_store import SqliteCaseStore
+from output_writers import CASE_FIELDS, sortable_date
+
+
+def _case_frame(df):
+    """The CASE_FIELDS columns of a DataFrame as strings, missing values as ''"""
+    return df.reindex(columns=CASE_FIELDS).fillna('').astype(str)
+
 
 class LawCaseMemoryBank:
     """Memory bank for storing and analyzing Dutch law cases"""
     
-    def __init__(self, data_dir="memory_bank"):
+    def __init__(self, data_dir="memory_bank", backend=None):
         self.data_dir = data_dir
+        self.backend = backend or config.MEMORY_BANK_BACKEND
         self.cases_file = os.path.join(data_dir, "cases.csv")
+        self.store_file = os.path.join(data_dir, "cases.sqlite")
         self.vectors_file = os.path.join(data_dir, "case_vectors.pkl")
         self.metadata_file = os.path.join(data_dir, "metadata.json")
         self.vectorizer_file = os.path.join(data_dir, "vectorizer.pkl")
+        self.index_file = os.path.join(data_dir, "ecli_index.sqlite")
         
         # Create directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
@@ -25,6 +39,8 @@ class LawCaseMemoryBank:
         self.cases_df = None
         self.vectorizer = None
         self.case_vectors = None
+        self.row_index = None
+        self.store = None
         self.metadata = self._load_metadata()
         
         # Load existing data
@@ -42,13 +58,14 @@ class LawCaseMemoryBank:
                 "total_cases": 0,
                 "vectorized": False,
                 "search_terms": [],
-                "data_sources": []
+                "data_sources": [],
+                "consumed_files": {}
             }
     
     def _save_metadata(self):
         """Save metadata"""
         self.metadata["last_updated"] = datetime.now().isoformat()
-        self.metadata["total_cases"] = len(self.cases_df) if self.cases_df is not None else 0
+        self.metadata["total_cases"] = self.case_count()
         
         with open(self.metadata_file, 'w', encoding='utf-8') as f:
             json.dump(self.metadata, f, indent=2, ensure_ascii=False)
@@ -56,8 +73,17 @@ class LawCaseMemoryBank:
     def _load_data(self):
         """Load existing cases and vectors"""
         # Load cases
-        if os.path.exists(self.cases_file):
-            self.cases_df = pd.read_csv(self.cases_file)
+        if self.backend == "sqlite":
+            # Cases stay on disk; cases_df is only read for vectorizing and exports
+            self.store = SqliteCaseStore(self.store_file)
+            if not len(self.store) and os.path.exists(self.cases_file):
+                self._import_csv_file()
+            print(f"Opened {len(self.store)} existing cases in {self.store_file}")
+        elif os.path.exists(self.cases_file):
+            self.cases_df = pd.read_csv(self.cases_file, dtype=str, keep_default_na=False)
+            # Incremental ingests append changed cases, so the last row of an ECLI wins
+            if 'ecli_code' in self.cases_df.columns:
+                self.cases_df = self.cases_df.drop_duplicates(subset=['ecli_code'], keep='last')
             print(f"Loaded {len(self.cases_df)} existing cases")
         else:
             self.cases_df = pd.DataFrame()
@@ -72,8 +98,39 @@ class LawCaseMemoryBank:
             self.metadata["vectorized"] = True
             print("Loaded existing vectors")
     
+    def _import_csv_file(self):
+        """Move the cases of an existing cases.csv into a new SQLite store, in chunks"""
+        added = 0
+        for chunk in pd.read_csv(self.cases_file, dtype=str, keep_default_na=False,
+                                 chunksize=config.INGEST_CHUNK_ROWS):
+            added += len(self.append_cases(chunk, source=os.path.basename(self.cases_file), update_loaded=False))
+        print(f"Imported {added} cases from {self.cases_file}")
+    
+    def _cases(self):
+        """All cases as a DataFrame; with the sqlite backend they are read on first use"""
+        if self.cases_df is None and self.store is not None:
+            self.cases_df = self.store.frame()
+        return self.cases_df
+    
+    def case_count(self):
+        if self.store is not None:
+            return len(self.store)
+        return len(self.cases_df) if self.cases_df is not None else 0
+    
     def add_cases(self, new_cases_df, source="scraper"):
         """Add new cases to the memory bank"""
+        if self.store is not None:
+            # Only the rows of this batch are written
+            written = self.append_cases(new_cases_df, source=source, update_loaded=False)
+            self.metadata["data_sources"].append({
+                "source": source,
+                "date": datetime.now().isoformat(),
+                "cases_added": len(written)
+            })
+            self.extend_loaded([written])
+            print(f"Added {len(written)} new or changed cases. Total cases: {self.case_count()}")
+            return
+        
         if self.cases_df is None or self.cases_df.empty:
             self.cases_df = new_cases_df
         else:
@@ -92,22 +149,150 @@ class LawCaseMemoryBank:
         self.cases_df.to_csv(self.cases_file, index=False)
         self._save_metadata()
         
+        # Keep the row index in step with the rewritten cases file
+        frame = _case_frame(new_cases_df)
+        self._row_index().record(zip(frame['ecli_code'], map(row_hash, frame.itertuples(index=False, name=None))),
+                                 source)
+        
         # Reset vectors since we have new data
+        self._reset_vectors()
+        
+        print(f"Added {len(new_cases_df)} new cases. Total cases: {len(self.cases_df)}")
+    
+    def _reset_vectors(self):
         self.metadata["vectorized"] = False
         self.case_vectors = None
         self.vectorizer = None
+    
+    def _row_index(self):
+        """ECLI -> row hash index of cases.csv, built from the loaded cases the first time"""
+        if self.store is not None:
+            # The store keeps a row hash per case itself
+            return self.store
+        if self.row_index is None:
+            self.row_index = RowHashIndex(self.index_file)
+            if not len(self.row_index) and self.cases_df is not None and not self.cases_df.empty:
+                frame = _case_frame(self.cases_df)
+                self.row_index.record(zip(frame['ecli_code'], map(row_hash, frame.itertuples(index=False, name=None))),
+                                      os.path.basename(self.cases_file))
+                print(f"Indexed {len(frame)} existing cases")
+        return self.row_index
+    
+    def _csv_columns(self):
+        """Columns of cases.csv, widened once to CASE_FIELDS if an older file lacks some"""
+        if not os.path.exists(self.cases_file) or os.path.getsize(self.cases_file) == 0:
+            pd.DataFrame(columns=CASE_FIELDS).to_csv(self.cases_file, index=False)
+            return list(CASE_FIELDS)
+        with open(self.cases_file, 'r', encoding='utf-8', newline='') as f:
+            columns = next(csv.reader(f))
+        missing = [field for field in CASE_FIELDS if field not in columns]
+        if missing:
+            columns += missing
+            existing = pd.read_csv(self.cases_file, dtype=str, keep_default_na=False)
+            existing.reindex(columns=columns, fill_value='').to_csv(self.cases_file, index=False)
+            self.cases_df = self.cases_df.reindex(columns=columns, fill_value='')
+        return columns
+    
+    def append_cases(self, new_cases_df, source="ingest", update_loaded=True):
+        """Append only new or changed cases to cases.csv (or the store); returns the appended rows
         
-        print(f"Added {len(new_cases_df)} new cases. Total cases: {len(self.cases_df)}")
+        Rows are compared with the ECLI -> row hash index, so the existing
+        cases are neither concatenated nor rewritten. With update_loaded=False
+        the caller adds the returned rows to cases_df itself (see ingest_run.py).
+        """
+        frame = _case_frame(new_cases_df)
+        frame = frame[frame['ecli_code'] != ''].drop_duplicates(subset=['ecli_code'], keep='last')
+        hashes = pd.Series([row_hash(values) for values in frame.itertuples(index=False, name=None)],
+                           index=frame.index, dtype=object)
+        known = self._row_index().lookup(frame['ecli_code'])
+        changed = [known.get(ecli) != digest for ecli, digest in zip(frame['ecli_code'], hashes)]
+        frame, hashes = frame[changed], hashes[changed]
+        if frame.empty:
+            return frame
+        
+        if self.store is not None:
+            self.store.upsert(frame, hashes, source)
+        else:
+            frame = frame.reindex(columns=self._csv_columns(), fill_value='')
+            frame.to_csv(self.cases_file, mode='a', header=False, index=False)
+            self.row_index.record(zip(frame['ecli_code'], hashes), source)
+        if update_loaded:
+            self.extend_loaded([frame])
+        return frame
+    
+    def extend_loaded(self, frames):
+        """Add appended rows to the in-memory cases once, reset the vectors and save the metadata"""
+        frames = [frame for frame in frames if not frame.empty]
+        if frames:
+            if self.store is not None:
+                # The rows are stored already; a cached cases_df is read again when needed
+                self.cases_df = None
+            else:
+                self.cases_df = pd.concat([self.cases_df, *frames], ignore_index=True)
+                self.cases_df = self.cases_df.drop_duplicates(subset=['ecli_code'], keep='last')
+            self._reset_vectors()
+        self._save_metadata()
+    
+    def ingest_run_dir(self, run_dir="run", patterns=None, chunk_rows=None):
+        """Append new or changed cases from the scraper's CSV outputs in run_dir"""
+        from ingest_run import ingest_run_dir
+        
+        return ingest_run_dir(self, run_dir, patterns=patterns, chunk_rows=chunk_rows)
     
+    def add_parquet_cases(self, parquet_dir, columns=None, rechtsgebieden=None, years=None, source="parquet"):
+        """Add cases from a scraper Parquet dataset, reading only the needed columns and partitions"""
+        from parquet_sink import read_cases
+        
+        new_cases_df = read_cases(parquet_dir, columns=columns or CASE_FIELDS,
+                                  rechtsgebieden=rechtsgebieden, years=years)
+        self.add_cases(new_cases_df, source=source)
+    
+    def add_case_batches(self, batches, source="stream"):
+        """Add cases from an iterator of case-dict lists (e.g. txt_importer.batched)
+
+        Each batch is appended as it arrives, keeping only new or changed
+        rows, so the existing cases are never concatenated or rewritten. The
+        in-memory cases and the metadata are updated once at the end.
+        Returns the number of cases read.
+        """
+        read = 0
+        written = []
+        for batch in batches:
+            if not batch:
+                continue
+            read += len(batch)
+            frame = self.append_cases(pd.DataFrame(batch, columns=CASE_FIELDS), source=source, update_loaded=False)
+            # The store holds the rows already; extend_loaded only needs to know something changed
+            written.append(frame[['ecli_code']] if self.store is not None else frame)
+        if not read:
+            print("No cases to add")
+            return 0
+        added = sum(len(frame) for frame in written)
+        self.metadata["data_sources"].append({
+            "source": source,
+            "date": datetime.now().isoformat(),
+            "cases_added": added
+        })
+        self.extend_loaded(written)
+        print(f"Added {added} new or changed cases. Total cases: {self.case_count()}")
+        return read
+
+    def add_txt_cases(self, path="run", batch_size=None, source="txt_archive"):
+        """Stream all_cases_*.txt archives (both layouts) into the memory bank"""
+        from txt_importer import import_txt_archives
+
+        return import_txt_archives(self, path, batch_size=batch_size, source=source)
+
     def vectorize_cases(self, max_features=5000):
         """Create TF-IDF vectors for case content"""
-        if self.cases_df is None or self.cases_df.empty:
+        cases_df = self._cases()
+        if cases_df is None or cases_df.empty:
             print("No cases to vectorize")
             return
         
         # Combine title and content for vectorization
         texts = []
-        for _, case in self.cases_df.iterrows():
+        for _, case in cases_df.iterrows():
             title = case.get('title', '')
             content = case.get('content', '')
             combined_text = f"{title} {content}"
@@ -153,7 +338,7 @@ class LawCaseMemoryBank:
         
         results = []
         for idx in top_indices:
-            case = self.cases_df.iloc[idx]
+            case = self._cases().iloc[idx]
             results.append({
                 'ecli_code': case['ecli_code'],
                 'title': case['title'],
@@ -165,8 +350,53 @@ class LawCaseMemoryBank:
         
         return results
     
+    def search_cases(self, query, top_k=10, court=None, rechtsgebied=None, date_from=None, date_to=None):
+        """Keyword search over title, inhoudsindicatie and content; every word must occur
+        
+        The sqlite backend answers from its FTS5 index (ranked by BM25)
+        without loading the cases; the csv backend scans cases_df.
+        Dates are DD-MM-YYYY.
+        """
+        if self.store is not None:
+            return self.store.search(query, limit=top_k, court=court, rechtsgebied=rechtsgebied,
+                                     date_from=date_from, date_to=date_to)
+        
+        words = re.findall(r'\w+', query)
+        if not words or self.cases_df is None or self.cases_df.empty:
+            return []
+        cases_df = _case_frame(self.cases_df)
+        text = cases_df['title'] + ' ' + cases_df['inhoudsindicatie'] + ' ' + cases_df['content']
+        mask = pd.Series(True, index=cases_df.index)
+        for word in words:
+            mask &= text.str.contains(word, case=False, regex=False)
+        if court:
+            mask &= cases_df['court'] == court
+        if rechtsgebied:
+            mask &= cases_df['rechtsgebieden'].apply(
+                lambda value: rechtsgebied.lower() in [r.strip().lower() for r in value.split(',')])
+        sort_dates = cases_df['date'].map(sortable_date)
+        if sortable_date(date_from):
+            mask &= sort_dates.fillna('') >= sortable_date(date_from)
+        if sortable_date(date_to):
+            mask &= sort_dates.fillna('~') <= sortable_date(date_to)
+        
+        results = []
+        for _, case in cases_df[mask].head(top_k).iterrows():
+            results.append({
+                'ecli_code': case['ecli_code'],
+                'title': case['title'],
+                'court': case['court'],
+                'date': case['date'],
+                'url': case['url'],
+                'rechtsgebieden': case['rechtsgebieden'],
+                'snippet': case['inhoudsindicatie'][:200]
+            })
+        return results
+    
     def get_case_by_ecli(self, ecli_code):
         """Get a specific case by ECLI code"""
+        if self.store is not None:
+            return self.store.get(ecli_code)
         if self.cases_df is None:
             return None
         
@@ -178,14 +408,19 @@ class LawCaseMemoryBank:
     def get_statistics(self):
         """Get memory bank statistics"""
         stats = {
-            "total_cases": len(self.cases_df) if self.cases_df is not None else 0,
+            "total_cases": self.case_count(),
             "vectorized": self.metadata["vectorized"],
             "courts": {},
             "date_range": {},
             "data_sources": len(self.metadata["data_sources"])
         }
         
-        if self.cases_df is not None and not self.cases_df.empty:
+        if self.store is not None:
+            stats["courts"] = self.store.court_counts()
+            date_range = self.store.date_range()
+            if date_range:
+                stats["date_range"] = {"earliest": date_range[0], "latest": date_range[1]}
+        elif self.cases_df is not None and not self.cases_df.empty:
             # Court statistics
             court_counts = self.cases_df['court'].value_counts()
             stats["courts"] = court_counts.to_dict()
@@ -208,9 +443,10 @@ class LawCaseMemoryBank:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"run/law_cases_export_{timestamp}.csv"
         
-        if self.cases_df is not None:
-            self.cases_df.to_csv(output_file, index=False)
-            print(f"Exported {len(self.cases_df)} cases to {output_file}")
+        cases_df = self._cases()
+        if cases_df is not None:
+            cases_df.to_csv(output_file, index=False)
+            print(f"Exported {len(cases_df)} cases to {output_file}")
             return output_file
         else:
             print("No cases to export")
@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+
+# Logger for per-selector and per-click detail; silent unless LOG_LEVEL is DEBUG
+log = logging.getLogger('rechtspraak')
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def setup_logging(level=None):
+    logging.basicConfig(level=getattr(logging, (level or config.LOG_LEVEL).upper(), logging.INFO),
+                        format="%(message)s")
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """Bucket upper bound below which a fraction `q` of the observations fall
+
+        Past the highest bucket the largest observation is the bound, so the
+        result is always finite (and valid JSON).
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return round(self.max, 3)
+
+    def merge(self, counts, count, total, largest):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.count += count
+        self.sum += total
+        if largest is not None:
+            self.max = largest if self.max is None else max(self.max, largest)
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _label_value(value):
+    # Selectors carry quotes and backslashes
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_label_value(value)}"' for name, value in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms, labelled by stage and proxy
+
+    Rendered as Prometheus text (`prometheus_text`) or as a JSON snapshot
+    that also carries the live cases-per-minute rate.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        # Completion times of recent cases, for the cases/minute rate
+        self.recent_cases = deque()
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            key = (name, _label_key(labels))
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        with self.lock:
+            key = (name, _label_key(labels))
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def drain(self):
+        """Take everything recorded so far as plain, picklable data and start from zero
+
+        Used by browser pool workers, whose Metrics live in another process,
+        to ship their page loads and errors to the parent's `merge()`.
+        """
+        with self.lock:
+            counters, self.counters = self.counters, {}
+            histograms, self.histograms = self.histograms, {}
+        return {'counters': counters,
+                'histograms': {key: (h.counts, h.count, h.sum, h.max) for key, h in histograms.items()}}
+
+    def merge(self, data):
+        """Add counters and histograms drained from another Metrics"""
+        with self.lock:
+            for key, value in data['counters'].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, values in data['histograms'].items():
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                self.histograms[key].merge(*values)
+
+    def case_done(self, outcome):
+        self.inc('cases_total', outcome=outcome)
+        if outcome == 'ok':
+            now = time.time()
+            with self.lock:
+                self.recent_cases.append(now)
+                while self.recent_cases and self.recent_cases[0] < now - 60:
+                    self.recent_cases.popleft()
+
+    def cases_per_minute(self):
+        now = time.time()
+        with self.lock:
+            while self.recent_cases and self.recent_cases[0] < now - 60:
+                self.recent_cases.popleft()
+            window = min(60.0, max(1.0, now - self.started))
+            return len(self.recent_cases) * 60.0 / window
+
+    def prometheus_text(self):
+        lines = []
+        with self.lock:
+            for (name, key), value in sorted(self.counters.items()):
+                lines.append(f"scraper_{name}{_label_text(key)} {value:g}")
+            for (name, key), histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"scraper_{name}_bucket{_label_text(key, [('le', f'{bound:g}')])} {cumulative}")
+                lines.append(f"scraper_{name}_bucket{_label_text(key, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"scraper_{name}_sum{_label_text(key)} {histogram.sum:.6f}")
+                lines.append(f"scraper_{name}_count{_label_text(key)} {histogram.count}")
+        lines.append(f"scraper_cases_per_minute {self.cases_per_minute():.2f}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(key), 'value': value}
+                        for (name, key), value in sorted(self.counters.items())]
+            histograms = [{'name': name, 'labels': dict(key), 'count': h.count, 'sum': round(h.sum, 3),
+                           'mean': round(h.sum / h.count, 3) if h.count else None,
+                           'p50': h.quantile(0.5), 'p99': h.quantile(0.99)}
+                          for (name, key), h in sorted(self.histograms.items())]
+        return {
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'cases_per_minute': round(self.cases_per_minute(), 2),
+            'counters': counters,
+            'histograms': histograms
+        }
+
+
+class MetricsReporter:
+    """Expose a Metrics object: a JSON file rewritten every `interval` seconds
+    and, when `port` is set, a Prometheus-text endpoint at /metrics"""
+
+    def __init__(self, metrics, json_path=None, interval=None, port=None, host=None):
+        self.metrics = metrics
+        self.json_path = json_path
+        self.interval = interval or config.METRICS_INTERVAL
+        self.port = port
+        self.host = host or config.METRICS_HOST
+        self.stop = threading.Event()
+        self.thread = None
+        self.server = None
+
+    def start(self):
+        if self.json_path:
+            self.thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.thread.start()
+        if self.port:
+            metrics = self.metrics
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.rstrip('/') not in ('', '/metrics'):
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus_text().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            print(f"[Metrics] Prometheus endpoint at http://{self.host}:{self.port}/metrics")
+        return self
+
+    def write_json(self):
+        tmp_path = self.json_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+        os.replace(tmp_path, self.json_path)
+
+    def _write_loop(self):
+        while not self.stop.wait(self.interval):
+            try:
+                self.write_json()
+            except OSError as e:
+                print(f"[Metrics] Could not write {self.json_path}: {e}")
+
+    def close(self):
+        self.stop.set()
+        if self.json_path:
+            self.write_json()
+        if self.server:
+            self.server.shutdown()
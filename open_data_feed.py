@@ -0,0 +1,115 @@
+import re
+from datetime import datetime
+import httpx
+from lxml import etree
+import config
+from case_parsers import details_url
+from page_cache import cached_fetch
+
+ATOM = {'atom': 'http://www.w3.org/2005/Atom'}
+
+_ENTRIES = etree.XPath('//atom:entry', namespaces=ATOM)
+_SUBTITLE = etree.XPath('string(//atom:subtitle)', namespaces=ATOM)
+
+
+def to_iso_date(dutch_date):
+    """Convert DD-MM-YYYY (the website's date format) to YYYY-MM-DD"""
+    return datetime.strptime(dutch_date, "%d-%m-%Y").strftime("%Y-%m-%d")
+
+
+def subject_uri(subject):
+    """Look up the open-data rechtsgebied URI for a LAW_CATEGORIES name"""
+    for name, uri in config.RECHTSGEBIED_URIS.items():
+        if name.lower() == (subject or '').lower():
+            return uri
+    raise ValueError(f"No open-data rechtsgebied known for subject '{subject}'")
+
+
+def parse_feed(document):
+    """Parse an Atom search feed page into (total, entries)
+
+    Each entry is a dict with ecli_code, url, last_modified, title and summary.
+    """
+    root = etree.fromstring(document)
+    total_match = re.search(r'(\d+)', _SUBTITLE(root))
+    total = int(total_match.group(1)) if total_match else None
+    entries = []
+    for entry in _ENTRIES(root):
+        identifier = entry.findtext('atom:id', default='', namespaces=ATOM).strip()
+        if not identifier.startswith('ECLI:'):
+            continue
+        ecli_code = identifier[len('ECLI:'):]
+        entries.append({
+            'ecli_code': ecli_code,
+            'url': details_url(ecli_code),
+            'last_modified': entry.findtext('atom:updated', default='', namespaces=ATOM).strip(),
+            'title': entry.findtext('atom:title', default='', namespaces=ATOM).strip(),
+            'summary': " ".join(entry.findtext('atom:summary', default='', namespaces=ATOM).split())
+        })
+    return total, entries
+
+
+class OpenDataFeed:
+    """Enumerate ECLIs for a subject and date range from the open-data search feed
+
+    Pages through /uitspraken/zoeken in pages of up to 1000 entries instead of
+    clicking "Laad meer resultaten" in a browser.
+    """
+
+    def __init__(self, subject, date_from=None, date_to=None, page_size=None, base_url=None,
+                 user_agent=None, client=None, cache=None, archive=None):
+        self.subject = subject
+        self.date_from = date_from or config.FEED_DATE_FROM
+        self.date_to = date_to or datetime.now().strftime("%d-%m-%Y")
+        self.page_size = page_size or config.FEED_PAGE_SIZE
+        self.base_url = (base_url or config.OPEN_DATA_BASE_URL).rstrip('/')
+        headers = {'User-Agent': user_agent} if user_agent else {}
+        self.client = client or httpx.Client(headers=headers, timeout=config.HTTP_TIMEOUT, follow_redirects=True)
+        self.total = None
+        self.cache = cache
+        self.archive = archive
+
+    def params(self, offset, max_results=None):
+        return [
+            ('subject', subject_uri(self.subject)),
+            ('date', to_iso_date(self.date_from)),
+            ('date', to_iso_date(self.date_to)),
+            ('max', max_results or self.page_size),
+            ('from', offset),
+            ('sort', 'DESC'),
+            ('return', 'DOC')
+        ]
+
+    def fetch_page(self, offset, max_results=None):
+        """Fetch one feed page starting at `offset`; returns the list of entries"""
+        url = str(httpx.URL(f"{self.base_url}/uitspraken/zoeken", params=self.params(offset, max_results)))
+        document = cached_fetch(self.cache, self.client, url, fresh_for=config.CACHE_LISTING_FRESH_FOR,
+                                archive=self.archive)
+        total, entries = parse_feed(document)
+        if total is not None:
+            self.total = total
+        return entries
+
+    def count(self):
+        """Number of rulings matching the subject and date range"""
+        self.fetch_page(0, max_results=1)
+        return self.total or 0
+
+    def page(self, page):
+        """Entries of the 1-based feed page `page`"""
+        return self.fetch_page((page - 1) * self.page_size)
+
+    def iter_pages(self, start_page=1):
+        """Yield lists of entries page by page until the feed is exhausted"""
+        page = start_page
+        while True:
+            entries = self.page(page)
+            if not entries:
+                return
+            yield entries
+            if len(entries) < self.page_size:
+                return
+            page += 1
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,253 @@
+import abc
+import csv
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+import config
+
+# Column order of the metadata CSV (the keys of a case_data dict)
+CASE_FIELDS = ['ecli_code', 'title', 'court', 'date', 'date_uitspraak', 'date_publicatie',
+               'inhoudsindicatie', 'content', 'url', 'rechtsgebieden']
+
+# Marks the end of the case stream
+CLOSE = object()
+
+# Name of a file a StreamingCaseWriter has not published yet
+INPROGRESS_PATTERN = re.compile(r'_inprogress_\d{14}_\d+\.(txt|csv)$')
+
+
+def sortable_date(date_str):
+    """DD-MM-YYYY to YYYYMMDD, or None for anything else"""
+    parts = (date_str or '').split('-')
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    day, month, year = parts
+    return f"{year}{month}{day}"
+
+
+def date_range_label(first, last):
+    """The YYYYMMDD_YYYYMMDD part of an output filename (today when no dates are known)"""
+    if not first or not last:
+        return datetime.now().strftime("%Y%m%d_%Y%m%d")
+    return f"{first}_{last}"
+
+
+def format_case_txt(case):
+    """One case in the all_cases_*.txt layout"""
+    return (
+        f"ECLI Code: {case.get('ecli_code', '')}\n"
+        f"Title: {case.get('title', '')}\n"
+        f"Court: {case.get('court', '')}\n"
+        f"Date: {case.get('date', '')}\n"
+        f"Date Uitspraak: {case.get('date_uitspraak', '')}\n"
+        f"Date Publicatie: {case.get('date_publicatie', '')}\n"
+        f"Inhoudsindicatie: {case.get('inhoudsindicatie', '')}\n"
+        f"Rechtsgebieden: {case.get('rechtsgebieden', '')}\n"
+        f"URL: {case.get('url', '')}\n"
+        f"Content:\n{case.get('content', '')}\n"
+        + "-" * 80 + "\n\n"
+    )
+
+
+def remove_inprogress_files(output_dir):
+    """Delete the unfinished output files of a crashed run; returns how many were removed
+
+    Their cases are still in the checkpoint log (or were never marked seen),
+    so the next run writes them again; publishing the files as well would
+    duplicate them.
+    """
+    if not os.path.isdir(output_dir):
+        return 0
+    removed = 0
+    for filename in os.listdir(output_dir):
+        if INPROGRESS_PATTERN.search(filename):
+            os.remove(os.path.join(output_dir, filename))
+            removed += 1
+    if removed:
+        print(f"[Save] Removed {removed} unfinished output files of an interrupted run")
+    return removed
+
+
+class StreamingCaseWriter(abc.ABC):
+    """Append cases to an output file from a background writer thread
+
+    Cases are queued by the caller and written in batches (every
+    `flush_every` cases or `flush_interval` seconds), so extraction never
+    waits on disk. The file is written as
+    <prefix>_<subject>_inprogress_<run id><ext> and renamed to the usual
+    <prefix>_<subject>_<date range><ext> on close, with the date range
+    tracked incrementally as cases pass by. An existing file of that name is
+    never overwritten; the new one gets a _2, _3, ... suffix instead.
+    """
+
+    extension = ''
+
+    def __init__(self, output_dir, prefix, subject, flush_every=None, flush_interval=None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.subject = subject or "Vreemdelingenrecht"
+        self.flush_every = flush_every or config.OUTPUT_FLUSH_EVERY
+        self.flush_interval = flush_interval or config.OUTPUT_FLUSH_INTERVAL
+        run_id = f"{datetime.now():%Y%m%d%H%M%S}_{os.getpid()}"
+        self.path = os.path.join(output_dir, f"{prefix}_{self.subject}_inprogress_{run_id}{self.extension}")
+        self.cases = queue.Queue()
+        self.written = 0
+        self.first_date = None
+        self.last_date = None
+        self.error = None
+        self.closed = False
+        os.makedirs(output_dir, exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8', newline='')
+        self.start_file()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def start_file(self):
+        """Write whatever precedes the first case (e.g. a header)"""
+
+    @abc.abstractmethod
+    def write_case(self, case):
+        """Write one case to self.file (runs on the writer thread)"""
+
+    def write(self, case):
+        """Queue one case for writing; returns immediately"""
+        self.cases.put(case)
+
+    def _run(self):
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                case = self.cases.get(timeout=self.flush_interval)
+            except queue.Empty:
+                case = None
+            if case is CLOSE:
+                break
+            if case is not None:
+                try:
+                    self.write_case(case)
+                except Exception as e:
+                    # Keep draining; the error is reported on close
+                    self.error = e
+                    continue
+                self.written += 1
+                pending += 1
+                date = sortable_date(case.get('date'))
+                if date:
+                    self.first_date = min(self.first_date or date, date)
+                    self.last_date = max(self.last_date or date, date)
+            if pending and (pending >= self.flush_every or time.monotonic() - last_flush >= self.flush_interval):
+                self.file.flush()
+                pending = 0
+                last_flush = time.monotonic()
+        self.file.flush()
+
+    def finish(self):
+        """Drain the queue and fsync the in-progress file; raises if a case could not be written"""
+        self.cases.put(CLOSE)
+        self.thread.join()
+        # Callers treat a published file as durable (checkpoint settle, seen index)
+        os.fsync(self.file.fileno())
+        self.file.close()
+        if self.error:
+            self.discard()
+            raise RuntimeError(f"Output {self.path} was not written: {self.error}") from self.error
+
+    def discard(self):
+        """Remove the in-progress file instead of publishing it"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def publish(self):
+        """Give the finished file its date-range name; returns the final path, or None without cases"""
+        if not self.written:
+            os.remove(self.path)
+            return None
+        stem = os.path.join(self.output_dir,
+                            f"{self.prefix}_{self.subject}_{date_range_label(self.first_date, self.last_date)}")
+        final_path = f"{stem}{self.extension}"
+        counter = 1
+        while True:
+            try:
+                # Unlike a rename, a hard link fails instead of replacing an earlier run's file
+                os.link(self.path, final_path)
+                break
+            except FileExistsError:
+                counter += 1
+                final_path = f"{stem}_{counter}{self.extension}"
+        os.remove(self.path)
+        return final_path
+
+    def close(self):
+        """Finish and publish the file; returns the final path
+
+        A case that could not be written is raised here and nothing is
+        published, so callers keep the file's cases pending.
+        """
+        if self.closed:
+            return None
+        self.closed = True
+        self.finish()
+        return self.publish()
+
+
+class TxtCaseWriter(StreamingCaseWriter):
+    extension = '.txt'
+
+    def __init__(self, output_dir, subject, **kwargs):
+        super().__init__(output_dir, 'all_cases', subject, **kwargs)
+
+    def write_case(self, case):
+        self.file.write(format_case_txt(case))
+
+
+class CsvCaseWriter(StreamingCaseWriter):
+    extension = '.csv'
+
+    def __init__(self, output_dir, subject, **kwargs):
+        super().__init__(output_dir, 'cases_metadata', subject, **kwargs)
+
+    def start_file(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=CASE_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write_case(self, case):
+        self.writer.writerow(case)
+
+
+class CaseOutputWriters:
+    """The TXT dump and metadata CSV (and optionally Parquet) of one run, written side by side"""
+
+    def __init__(self, output_dir, subject, parquet=False):
+        self.writers = [TxtCaseWriter(output_dir, subject), CsvCaseWriter(output_dir, subject)]
+        if parquet:
+            from parquet_sink import ParquetCaseWriter
+            self.writers.append(ParquetCaseWriter(os.path.join(output_dir, config.PARQUET_DIR)))
+
+    def write(self, case):
+        for writer in self.writers:
+            writer.write(case)
+
+    def close(self):
+        """Finish every writer and publish their files only if all of them succeeded
+
+        Otherwise every file of the run is discarded and the first failure is
+        raised, so the same cases are never left in some outputs but not others.
+        """
+        error = None
+        for writer in self.writers:
+            try:
+                writer.finish()
+            except Exception as e:
+                error = error or e
+        if error:
+            for writer in self.writers:
+                writer.discard()
+            raise error
+        for writer in self.writers:
+            path = writer.publish()
+            if path:
+                print(f"[Save] Saved {writer.written} cases to {path}")
@@ -0,0 +1,69 @@
+import random
+import threading
+import time
+import config
+
+# Responses that mean "slow down"
+BACKOFF_STATUSES = {429, 502, 503, 504}
+
+
+class AimdPacer:
+    """Additive-increase/multiplicative-decrease request pacing
+
+    The request rate grows by `increase` requests/second after every healthy
+    response and is multiplied by `decrease` after an error, a throttling
+    status (429/5xx) or a response slower than `target_latency`. `wait()`
+    spaces requests according to the current rate.
+
+    With `errors_back_off=False` only a status in `backoff_statuses` slows
+    down (other errors are left to the retry layer), and `cooldown` makes a
+    burst of such responses count as a single decrease.
+    """
+
+    def __init__(self, initial_rate=None, min_rate=None, max_rate=None, increase=None,
+                 decrease=None, target_latency=None, jitter=0.1, backoff_statuses=None,
+                 errors_back_off=True, cooldown=0.0):
+        self.min_rate = min_rate or config.PACER_MIN_RATE
+        self.max_rate = max_rate or config.PACER_MAX_RATE
+        self.rate = min(self.max_rate, max(self.min_rate, initial_rate or config.PACER_INITIAL_RATE))
+        self.increase = increase or config.PACER_INCREASE
+        self.decrease = decrease or config.PACER_DECREASE
+        self.target_latency = target_latency or config.PACER_TARGET_LATENCY
+        self.jitter = jitter
+        self.backoff_statuses = set(backoff_statuses or BACKOFF_STATUSES)
+        self.errors_back_off = errors_back_off
+        self.cooldown = cooldown
+        self.last_decrease = None
+        self.last_request = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def delay(self):
+        return 1.0 / self.rate
+
+    def record(self, latency, ok=True, status=None):
+        """Feed back one observed response and adjust the rate"""
+        with self.lock:
+            throttled = status in self.backoff_statuses
+            unhealthy = not ok or latency > self.target_latency
+            if throttled or (unhealthy and self.errors_back_off):
+                now = time.monotonic()
+                if self.last_decrease is None or now - self.last_decrease >= self.cooldown:
+                    self.last_decrease = now
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    print(f"[Pacer] Backing off to {self.rate:.2f} req/s "
+                          f"(status: {status}, latency: {latency:.2f}s, ok: {ok})")
+                return False
+            if not unhealthy:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+        return not unhealthy
+
+    def wait(self):
+        """Sleep until the next request is allowed at the current rate"""
+        with self.lock:
+            delay = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            remaining = self.last_request + delay - time.monotonic()
+            self.last_request = time.monotonic() + max(0.0, remaining)
+        if remaining > 0:
+            time.sleep(remaining)
+        return max(0.0, remaining)
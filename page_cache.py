@@ -0,0 +1,183 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import config
+
+
+class PageCache:
+    """Content-addressed, compressed on-disk cache of fetched pages
+
+    Bodies are stored once per SHA-256 digest as zlib-compressed blobs under
+    objects/; a SQLite index maps each URL to its blob together with the
+    validators (ETag / Last-Modified) needed for conditional revalidation.
+    When the blobs exceed `max_mb`, the least recently used URLs are evicted.
+    """
+
+    def __init__(self, cache_dir=None, max_mb=None):
+        self.cache_dir = cache_dir or config.CACHE_DIR
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.max_bytes = (max_mb or config.CACHE_MAX_MB) * 1024 * 1024
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"), timeout=30,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "url TEXT PRIMARY KEY, digest TEXT, size INTEGER, etag TEXT, last_modified TEXT, "
+            "stored_at REAL, accessed_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+        # Running estimate so put() does not have to sum the index every time
+        self.size_estimate = self.total_size()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + ".z")
+
+    def get(self, url, fresh_for=None):
+        """Return the cached entry for a URL, or None
+
+        The entry is a dict with body, etag, last_modified and `fresh`, which
+        is True while the entry is younger than `fresh_for` seconds.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT digest, etag, last_modified, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._blob_path(row[0]), 'rb') as f:
+                    body = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            self.hits += 1
+        fresh_for = config.CACHE_FRESH_FOR if fresh_for is None else fresh_for
+        return {
+            'body': body,
+            'etag': row[1],
+            'last_modified': row[2],
+            'fresh': time.time() - row[3] < fresh_for
+        }
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a response body for a URL"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(body, 6))
+            os.replace(tmp_path, blob_path)
+            self.size_estimate += os.path.getsize(blob_path)
+        size = os.path.getsize(blob_path)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (url, digest, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, size, etag, last_modified, now, now)
+            )
+            self.conn.commit()
+        if self.size_estimate > self.max_bytes:
+            self.evict()
+
+    def revalidated(self, url):
+        """Mark an entry as fresh again after a 304 Not Modified"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def conditional_headers(self, entry):
+        """Request headers that let the server answer 304 for an unchanged entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def total_size(self):
+        # Blobs shared by several URLs are counted once
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        ).fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in its size bound"""
+        with self.lock:
+            total = self.total_size()
+            self.size_estimate = total
+            if total <= self.max_bytes:
+                return 0
+            evicted = 0
+            rows = self.conn.execute("SELECT url, digest FROM entries ORDER BY accessed_at").fetchall()
+            for url, digest in rows:
+                if total <= self.max_bytes * 0.9:
+                    break
+                self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                still_used = self.conn.execute(
+                    "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+                ).fetchone()
+                if not still_used:
+                    blob_path = self._blob_path(digest)
+                    try:
+                        total -= os.path.getsize(blob_path)
+                        os.remove(blob_path)
+                    except OSError:
+                        pass
+                evicted += 1
+            self.conn.commit()
+            self.size_estimate = total
+        print(f"[Cache] Evicted {evicted} least recently used entries")
+        return evicted
+
+    def close(self):
+        self.conn.close()
+
+
+def cached_fetch(cache, client, url, fresh_for=None, archive=None, **kwargs):
+    """GET a URL through the cache with conditional revalidation (sync httpx client)
+
+    Returns the response body as bytes. Fresh entries are served from disk
+    without a request; stale ones are revalidated with If-None-Match /
+    If-Modified-Since and reused on 304. New responses also go to the WARC
+    `archive` when one is given.
+    """
+    entry = cache.get(url, fresh_for=fresh_for) if cache else None
+    if entry and entry['fresh']:
+        return entry['body']
+    headers = cache.conditional_headers(entry) if cache else {}
+    resp = client.get(url, headers=headers, **kwargs)
+    return store_response(cache, url, entry, resp, archive)
+
+
+def store_response(cache, url, entry, resp, archive=None):
+    """Handle a (possibly conditional) response: reuse the entry on 304, store on 200"""
+    if resp.status_code == 304 and entry:
+        cache.revalidated(url)
+        return entry['body']
+    resp.raise_for_status()
+    if archive:
+        archive.write_response(url, resp)
+    if cache:
+        cache.put(url, resp.content, etag=resp.headers.get('ETag'),
+                  last_modified=resp.headers.get('Last-Modified'))
+    return resp.content
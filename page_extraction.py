@@ -0,0 +1,266 @@
+import json
+import config
+from metrics import log
+
+# Selector cascades per page layout. Selectors starting with "//" are XPath,
+# everything else is CSS. Within a cascade the first non-empty match wins;
+# InPageExtractor may move a fallback that keeps winning to the front.
+PAGE_LAYOUTS = {
+    'detail': {
+        'fields': {
+            'title': [
+                "h2.rs-panel-title",
+                "h1",
+                ".title",
+                ".case-title"
+            ],
+            'content': [
+                "div.rnl-detail-uitspraaktekst.printthis.ng-star-inserted",
+                ".rnl-detail-uitspraaktekst--content",
+                ".uitspraak",
+                ".content",
+                ".case-content",
+                "main",
+                ".uitspraak-tekst",
+                ".case-text"
+            ],
+            'court': [
+                "//label[contains(text(), 'Instantie')]/following-sibling::span",
+                "//label[contains(text(), 'Rechter')]/following-sibling::span",
+                ".court",
+                ".rechter"
+            ],
+            'date': [
+                "//label[contains(text(), 'Datum')]/following-sibling::span",
+                ".date",
+                ".datum"
+            ],
+            'date_uitspraak': ["//label[contains(text(), 'Datum uitspraak')]/following-sibling::span"],
+            'date_publicatie': ["//label[contains(text(), 'Datum publicatie')]/following-sibling::span"],
+            'inhoudsindicatie': ["//label[contains(text(), 'Inhoudsindicatie')]/following-sibling::span"]
+        },
+        # Fields whose match must be longer than this to count
+        'min_length': {'content': 100},
+        # Fall back to the whole body text when no cascade produced enough
+        'body_fallback': ['content'],
+        # Fields collected from every match instead of the first
+        'lists': {'rechtsgebieden': "span.hl0"}
+    },
+    # One search result card; selectors are relative to the card element
+    'listing_card': {
+        'fields': {
+            'court': [
+                ".//label[contains(text(), 'Instantie')]/following-sibling::span",
+                ".rnl-listresults-item-instantie",
+                ".instantie",
+                ".court"
+            ],
+            'date_uitspraak': [
+                ".//label[contains(text(), 'Datum uitspraak')]/following-sibling::span",
+                ".rnl-listresults-item-uitspraakdatum",
+                ".datum-uitspraak"
+            ],
+            'date_publicatie': [
+                ".//label[contains(text(), 'Datum publicatie')]/following-sibling::span",
+                ".rnl-listresults-item-publicatiedatum",
+                ".datum-publicatie"
+            ],
+            'inhoudsindicatie': [
+                ".rnl-listresults-item-inhoudsindicatie",
+                ".inhoudsindicatie",
+                "p"
+            ]
+        },
+        # Fallbacks on the card text when no selector matched
+        'patterns': {
+            'court': r"Instantie\s*:?\s*([^\n]+)",
+            'date_uitspraak': r"Datum uitspraak\s*:?\s*(\d{2}-\d{2}-\d{4})",
+            'date_publicatie': r"Datum publicatie\s*:?\s*(\d{2}-\d{2}-\d{4})",
+            'rechtsgebieden': r"Rechtsgebied(?:en)?\s*:?\s*([^\n]+)"
+        },
+        'lists': {'rechtsgebieden': "span.hl0, .rechtsgebied"}
+    }
+}
+
+# Runs in the page. arguments[0] is the layout spec; cascades are tried in the order given.
+_EXTRACTION_JS = """
+const spec = arguments[0];
+function find(selector) {
+    if (selector.startsWith('//')) {
+        return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+const result = {fields: {}, matched: {}};
+for (const [field, selectors] of Object.entries(spec.fields)) {
+    const minLength = spec.min_length[field] || 0;
+    let value = '';
+    for (const selector of selectors) {
+        let elem = null;
+        try { elem = find(selector); } catch (e) { continue; }
+        const text = elem ? (elem.innerText || '').trim() : '';
+        if (text.length > minLength) {
+            value = text;
+            result.matched[field] = selector;
+            break;
+        }
+        if (text && !value) { value = text; }
+    }
+    if (spec.body_fallback.includes(field) && value.length < minLength && document.body) {
+        value = document.body.innerText.trim();
+        result.matched[field] = 'body';
+    }
+    result.fields[field] = value;
+}
+for (const [field, selector] of Object.entries(spec.lists)) {
+    result.fields[field] = Array.from(document.querySelectorAll(selector), e => (e.innerText || '').trim()).filter(t => t);
+}
+return JSON.stringify(result);
+"""
+
+
+# Runs in the page. arguments[0] is the card layout spec, arguments[1] the number of
+# ECLI links already handled; returns one card per further ECLI link, in listing order.
+_CARDS_JS = """
+const spec = arguments[0];
+const links = Array.from(document.querySelectorAll("a[href*='ECLI']")).slice(arguments[1]);
+function ecliCount(node) {
+    return new Set(Array.from(node.querySelectorAll("a[href*='ECLI']"), a => a.href)).size;
+}
+function cardOf(link) {
+    // Widest ancestor that still holds only this ruling
+    let node = link;
+    while (node.parentElement && node.parentElement !== document.body && ecliCount(node.parentElement) <= 1) {
+        node = node.parentElement;
+    }
+    return node;
+}
+function find(card, selector) {
+    if (selector.startsWith('.//')) {
+        return document.evaluate(selector, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return card.querySelector(selector);
+}
+const cards = [];
+for (const link of links) {
+    const card = cardOf(link);
+    const text = (card.innerText || '').trim();
+    const result = {url: link.href, title: (link.innerText || '').trim(), fields: {}, matched: {}};
+    for (const [field, selectors] of Object.entries(spec.fields)) {
+        let value = '';
+        for (const selector of selectors) {
+            let elem = null;
+            try { elem = find(card, selector); } catch (e) { continue; }
+            value = elem ? (elem.innerText || '').trim() : '';
+            if (value) { result.matched[field] = selector; break; }
+        }
+        result.fields[field] = value;
+    }
+    for (const [field, selector] of Object.entries(spec.lists)) {
+        result.fields[field] = Array.from(card.querySelectorAll(selector), e => (e.innerText || '').trim()).filter(t => t);
+    }
+    for (const [field, pattern] of Object.entries(spec.patterns)) {
+        const current = result.fields[field];
+        if (current && current.length) { continue; }
+        const match = text.match(new RegExp(pattern));
+        if (match) {
+            const value = match[1].trim();
+            result.fields[field] = Array.isArray(current) ? value.split(/[;,]/).map(t => t.trim()).filter(t => t) : value;
+            result.matched[field] = 'text';
+        }
+    }
+    cards.push(result);
+}
+return JSON.stringify(cards);
+"""
+
+
+class InPageExtractor:
+    """Extract every field of a page layout with a single execute_script call
+
+    The script returns all fields as one JSON object together with the
+    selector that matched each field. Matches are counted as the
+    selector_hits_total metric, so a selector that stopped matching after a
+    site change shows up in the metrics. A fallback selector is moved to the
+    front of its cascade only after it won `promote_after` extractions in a
+    row, i.e. every selector before it failed that often; a generic fallback
+    that matched once never shadows a more specific selector.
+    """
+
+    def __init__(self, layout='detail', metrics=None, promote_after=None):
+        spec = PAGE_LAYOUTS[layout]
+        self.layout = layout
+        self.fields = {field: list(selectors) for field, selectors in spec['fields'].items()}
+        self.min_length = dict(spec.get('min_length', {}))
+        self.body_fallback = list(spec.get('body_fallback', []))
+        self.lists = dict(spec.get('lists', {}))
+        self.patterns = dict(spec.get('patterns', {}))
+        self.metrics = metrics
+        self.promote_after = config.SELECTOR_PROMOTE_AFTER if promote_after is None else promote_after
+        # field -> (fallback selector on a winning streak, length of the streak)
+        self.streaks = {}
+
+    def spec(self):
+        return {
+            'fields': self.fields,
+            'min_length': self.min_length,
+            'body_fallback': self.body_fallback,
+            'lists': self.lists,
+            'patterns': self.patterns
+        }
+
+    def record(self, matched):
+        """Count which selector matched each field"""
+        if not self.metrics:
+            return
+        for field, selector in matched.items():
+            self.metrics.inc('selector_hits_total', stage=self.layout, field=field, selector=selector)
+
+    def learn(self, matched):
+        """Promote a fallback selector once it won `promote_after` times in a row"""
+        if not self.promote_after:
+            return
+        for field, selector in matched.items():
+            cascade = self.fields.get(field)
+            if not cascade or selector not in cascade:
+                continue
+            if cascade[0] == selector:
+                self.streaks.pop(field, None)
+                continue
+            streak_selector, streak = self.streaks.get(field, (None, 0))
+            streak = streak + 1 if streak_selector == selector else 1
+            if streak < self.promote_after:
+                self.streaks[field] = (selector, streak)
+                continue
+            cascade.remove(selector)
+            cascade.insert(0, selector)
+            self.streaks.pop(field, None)
+            log.debug("[Extract] %s.%s: trying %s first after %s wins in a row", self.layout, field, selector, streak)
+
+    def extract(self, driver):
+        """Run the extraction script; returns (fields, matched selectors)"""
+        result = json.loads(driver.execute_script(_EXTRACTION_JS, self.spec()))
+        self.record(result['matched'])
+        self.learn(result['matched'])
+        return result['fields'], result['matched']
+
+
+class ListingCardExtractor(InPageExtractor):
+    """Parse every new search result card in a single execute_script call
+
+    Each ECLI link on the listing is mapped to its card (the widest ancestor
+    holding only that ruling) and the card's metadata is read with the
+    'listing_card' cascades, falling back to label patterns on the card text.
+    """
+
+    def __init__(self, layout='listing_card', metrics=None, promote_after=None):
+        super().__init__(layout, metrics=metrics, promote_after=promote_after)
+
+    def extract(self, driver, offset=0):
+        """Return the cards of all ECLI links after the first `offset`, in listing order"""
+        cards = json.loads(driver.execute_script(_CARDS_JS, self.spec(), offset) or '[]')
+        for card in cards:
+            matched = {field: selector for field, selector in card['matched'].items() if selector != 'text'}
+            self.record(matched)
+            self.learn(matched)
+        return cards
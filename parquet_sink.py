@@ -0,0 +1,168 @@
+import functools
+import operator
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime
+import config
+from output_writers import CASE_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Optional; only needed for Parquet output
+    pa = pc = pq = None
+
+# Everything except the full text; what dashboards and the memory bank usually need
+METADATA_COLUMNS = [field for field in CASE_FIELDS if field != 'content']
+
+# Partition columns derived from each case
+PARTITION_COLUMNS = ['rechtsgebied', 'year']
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+
+
+def partition_of(case):
+    """(rechtsgebied, year) partition of a case: its first rechtsgebied and ruling year
+
+    A case is stored once, under its first (primary) rechtsgebied; the full
+    list stays in the rechtsgebieden column, which is what read_cases filters on.
+    """
+    rechtsgebieden = [r.strip() for r in (case.get('rechtsgebieden') or '').split(',') if r.strip()]
+    # Path-safe, readable partition value
+    rechtsgebied = re.sub(r'[^\w-]+', '_', rechtsgebieden[0]).strip('_') if rechtsgebieden else 'onbekend'
+    year_match = re.search(r'(\d{4})$', case.get('date') or '')
+    return rechtsgebied, int(year_match.group(1)) if year_match else 0
+
+
+class ParquetCaseWriter:
+    """Write cases to a Hive-partitioned Parquet dataset (rechtsgebied=/year=)
+
+    Rows are buffered and written as a new zstd-compressed file per partition
+    every `flush_rows` cases, on a background thread so extraction never waits
+    for compression. Like every column, the large `content` column has its own
+    column chunks, so readers that project METADATA_COLUMNS never read it.
+    Files are staged under _inprogress/<run id>/ (ignored by readers) and moved
+    into the dataset on close, so an interrupted run never leaves half its
+    rows. A failed write is raised from close(), and nothing of the run is
+    published then.
+    """
+
+    def __init__(self, root, flush_rows=None, compression=None):
+        require_pyarrow()
+        self.root = root
+        self.flush_rows = flush_rows or config.PARQUET_FLUSH_ROWS
+        self.compression = compression or config.PARQUET_COMPRESSION
+        self.buffer = []
+        self.written = 0
+        self.flusher = None
+        self.error = None
+        self.closed = False
+        # Per run, so concurrent writers never touch each other's files; rows of a
+        # crashed run are written again from the checkpoint log, its staging is ignored
+        self.staging = os.path.join(root, "_inprogress", f"{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}")
+        os.makedirs(self.staging, exist_ok=True)
+
+    def write(self, case):
+        self.buffer.append(case)
+        if len(self.buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered rows to the background flusher"""
+        if self.flusher:
+            self.flusher.join()
+        rows, self.buffer = self.buffer, []
+        if rows:
+            self.flusher = threading.Thread(target=self._write_rows, args=(rows,), daemon=True)
+            self.flusher.start()
+
+    def _write_rows(self, rows):
+        try:
+            self._write_table(rows)
+        except Exception as e:
+            # Raised from close(); later batches are still attempted
+            print(f"[Error] Writing {len(rows)} rows to Parquet failed: {e}")
+            self.error = self.error or e
+
+    def _write_table(self, rows):
+        columns = {field: [str(row.get(field) or '') for row in rows] for field in CASE_FIELDS}
+        partitions = [partition_of(row) for row in rows]
+        columns['rechtsgebied'] = [rechtsgebied for rechtsgebied, _ in partitions]
+        columns['year'] = [year for _, year in partitions]
+        table = pa.table(columns)
+        pq.write_to_dataset(
+            table, self.staging, partition_cols=PARTITION_COLUMNS,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            compression=self.compression,
+            # Low-cardinality metadata compresses to a few bytes per row
+            use_dictionary=['court', 'rechtsgebieden', 'date', 'date_uitspraak', 'date_publicatie']
+        )
+        self.written += len(rows)
+
+    def finish(self):
+        """Write the buffered rows and wait for the flusher; raises if any batch failed"""
+        self.flush()
+        if self.flusher:
+            self.flusher.join()
+        if self.error:
+            self.discard()
+            raise RuntimeError(f"Parquet output {self.root} was not written: {self.error}") from self.error
+
+    def discard(self):
+        """Drop the staged files instead of publishing them"""
+        self._drop_staging()
+
+    def publish(self):
+        """Move the staged files into the dataset; returns the root, or None without rows"""
+        for directory, _, filenames in os.walk(self.staging):
+            target_dir = os.path.join(self.root, os.path.relpath(directory, self.staging))
+            for filename in filenames:
+                os.makedirs(target_dir, exist_ok=True)
+                os.replace(os.path.join(directory, filename), os.path.join(target_dir, filename))
+        self._drop_staging()
+        return self.root if self.written else None
+
+    def close(self):
+        """Publish the staged files into the dataset; returns the root, or None without rows"""
+        if self.closed:
+            return None
+        self.closed = True
+        self.finish()
+        return self.publish()
+
+    def _drop_staging(self):
+        shutil.rmtree(self.staging, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(self.staging))
+        except OSError:
+            pass  # Another run is still staging
+
+
+def read_cases(root, columns=None, rechtsgebieden=None, years=None):
+    """Read cases from a Parquet dataset as a DataFrame
+
+    Only the requested `columns` are read (default: METADATA_COLUMNS, i.e.
+    no content) and only the partitions matching `years` are opened. A case
+    matches `rechtsgebieden` if any of its rechtsgebieden contains one of
+    them (case-insensitive, like the scraper's subject filter), not just the
+    first one it is partitioned by.
+    """
+    require_pyarrow()
+    conditions = []
+    if rechtsgebieden:
+        conditions.append(functools.reduce(operator.or_, [
+            pc.match_substring(pc.field('rechtsgebieden'), r.strip(), ignore_case=True) for r in rechtsgebieden
+        ]))
+    if years:
+        conditions.append(pc.field('year').isin([int(year) for year in years]))
+    filters = functools.reduce(operator.and_, conditions) if conditions else None
+    table = pq.read_table(root, columns=list(columns or METADATA_COLUMNS), filters=filters)
+    return table.to_pandas()
@@ -0,0 +1,83 @@
+import queue
+import threading
+import config
+
+# Marks the end of the harvested URL stream
+DONE = object()
+
+
+class CasePipeline:
+    """Overlap listing harvest and case extraction through a bounded queue
+
+    A producer thread drains `producer` (an iterator of case URLs, e.g.
+    scrape_search_page) into a bounded queue while the caller's thread pulls
+    whatever is queued in small batches and hands them to `extract_batch`,
+    which yields (url, case_data) pairs. The queue bound applies
+    back-pressure so harvesting never runs far ahead of extraction.
+    """
+
+    def __init__(self, producer, extract_batch, queue_size=None, batch_size=None):
+        self.producer = producer
+        self.extract_batch = extract_batch
+        self.url_queue = queue.Queue(maxsize=queue_size or config.PIPELINE_QUEUE_SIZE)
+        self.batch_size = batch_size or config.PIPELINE_BATCH_SIZE
+        self.stop = threading.Event()
+        self.harvested = 0
+        self.done = False
+
+    def _put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.url_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        seen = set()
+        try:
+            for case_url in self.producer:
+                if self.stop.is_set():
+                    break
+                if case_url in seen:
+                    continue
+                seen.add(case_url)
+                if not self._put(case_url):
+                    break
+                self.harvested += 1
+        except Exception as e:
+            print(f"[Error] Listing harvest failed: {e}")
+        finally:
+            self._put(DONE)
+
+    def _next_batch(self):
+        """Block for the next URL, then take whatever else is already queued"""
+        item = self.url_queue.get()
+        if item is DONE:
+            self.done = True
+            return []
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.url_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is DONE:
+                self.done = True
+                break
+            batch.append(item)
+        return batch
+
+    def run(self):
+        """Yield (url, case_data) pairs while the listing is still being harvested"""
+        producer = threading.Thread(target=self._produce, daemon=True)
+        producer.start()
+        try:
+            while not self.done:
+                batch = self._next_batch()
+                if batch:
+                    yield from self.extract_batch(batch)
+        finally:
+            self.stop.set()
+            producer.join(timeout=5)
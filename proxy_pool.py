@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import time
+import httpx
+import config
+from circuit_breaker import CircuitBreaker
+
+
+class NoProxyAvailable(RuntimeError):
+    """Every proxy is quarantined and a direct connection is not allowed"""
+
+
+def normalize_proxy(proxy):
+    """'host:port' -> 'http://host:port'; URLs with a scheme are kept as they are"""
+    proxy = proxy.strip()
+    return proxy if '://' in proxy else f"http://{proxy}"
+
+
+class ProxyHealth:
+    """Running latency and success statistics of one proxy"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.successes = 0
+        self.failures = 0
+        self.latency = None
+        self.in_use = 0
+        self.breaker = CircuitBreaker(failure_threshold=config.PROXY_FAILURE_THRESHOLD,
+                                      reset_timeout=config.PROXY_QUARANTINE)
+
+    def record(self, ok, latency=None):
+        if ok:
+            self.successes += 1
+            if latency is not None:
+                # Exponentially weighted, so a proxy that slows down drops in rank
+                self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+            self.breaker.record_success()
+        else:
+            self.failures += 1
+            self.breaker.record_failure()
+
+    @property
+    def success_rate(self):
+        # Laplace smoothing: an untried proxy starts at 0.5
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def score(self):
+        """Higher is better: success rate per second of latency, shared between current users"""
+        latency = self.latency if self.latency is not None else config.PROXY_TEST_TIMEOUT
+        return self.success_rate / max(latency, 0.05) / (1 + self.in_use)
+
+
+class ProxyPool:
+    """Health-scored pool of proxies with concurrent validation
+
+    `validate()` probes all candidates at once against `test_url` and keeps
+    the ones that answer. `acquire()` hands out the healthiest proxy that is
+    not quarantined; callers report outcomes with `report()`, and a proxy
+    that keeps failing is quarantined by its circuit breaker until a trial
+    request succeeds again. When every proxy is quarantined, `acquire()`
+    waits for one rather than exposing the real IP, unless `allow_direct`.
+    """
+
+    def __init__(self, proxies, test_url=None, timeout=None, max_concurrent=None, expect_text=None,
+                 allow_direct=None, wait_timeout=None):
+        self.health = {}
+        for proxy in proxies or []:
+            if proxy and proxy.strip():
+                proxy = normalize_proxy(proxy)
+                self.health[proxy] = ProxyHealth(proxy)
+        self.test_url = test_url or config.PROXY_TEST_URL
+        self.timeout = timeout or config.PROXY_TEST_TIMEOUT
+        self.max_concurrent = max_concurrent or config.PROXY_VALIDATE_CONCURRENCY
+        self.expect_text = config.PROXY_EXPECT_TEXT if expect_text is None else expect_text
+        self.allow_direct = config.PROXY_ALLOW_DIRECT if allow_direct is None else allow_direct
+        self.wait_timeout = config.PROXY_WAIT_TIMEOUT if wait_timeout is None else wait_timeout
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.health)
+
+    async def _probe(self, proxy, semaphore):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with httpx.AsyncClient(proxy=proxy, timeout=self.timeout, follow_redirects=True) as client:
+                    resp = await client.get(self.test_url)
+                ok = resp.status_code < 400 and (not self.expect_text or self.expect_text in resp.text)
+            except Exception:
+                ok = False
+            return proxy, ok, time.perf_counter() - start
+
+    async def _validate(self):
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        return await asyncio.gather(*(self._probe(proxy, semaphore) for proxy in self.health))
+
+    def validate(self):
+        """Probe every proxy concurrently; returns the working ones, best first"""
+        if not self.health:
+            return []
+        print(f"[Proxy] Validating {len(self.health)} proxies against {self.test_url} "
+              f"({self.max_concurrent} at a time)...")
+        start = time.perf_counter()
+        results = asyncio.run(self._validate())
+        with self.lock:
+            for proxy, ok, latency in results:
+                health = self.health[proxy]
+                health.record(ok, latency)
+                if not ok:
+                    # One failed probe is enough to skip a candidate for now
+                    health.breaker.trip()
+        working = self.healthy()
+        print(f"[Proxy] {len(working)}/{len(self.health)} proxies work "
+              f"(validated in {time.perf_counter() - start:.1f}s)")
+        return working
+
+    def healthy(self):
+        """Proxies that are not quarantined, best score first"""
+        candidates = [health for health in self.health.values() if health.breaker.state != CircuitBreaker.OPEN]
+        return [health.proxy for health in sorted(candidates, key=lambda health: health.score, reverse=True)]
+
+    def is_quarantined(self, proxy):
+        health = self.health.get(normalize_proxy(proxy)) if proxy else None
+        return health is not None and health.breaker.state == CircuitBreaker.OPEN
+
+    def try_acquire(self):
+        """Hand out the healthiest proxy that is not quarantined, or None right away"""
+        with self.lock:
+            for proxy in self.healthy():
+                health = self.health[proxy]
+                if health.breaker.allow():
+                    health.in_use += 1
+                    return proxy
+        return None
+
+    def acquire(self):
+        """Hand out the healthiest proxy that is not quarantined
+
+        With every proxy quarantined, returns None (a direct connection) only
+        if `allow_direct`; otherwise waits up to `wait_timeout` seconds for a
+        proxy's trial request and then raises NoProxyAvailable.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            proxy = self.try_acquire()
+            if proxy or self.allow_direct:
+                return proxy
+            now = time.monotonic()
+            if now >= deadline:
+                raise NoProxyAvailable(f"All {len(self.health)} proxies are quarantined and a direct "
+                                       f"connection is not allowed (waited {self.wait_timeout:.0f}s)")
+            with self.lock:
+                # A half-open breaker whose trial is running reports 0; poll it
+                soonest = min((health.breaker.remaining() for health in self.health.values()), default=0.0)
+            delay = min(max(soonest, 0.5), deadline - now)
+            print(f"[Proxy] All proxies are quarantined; waiting {delay:.0f}s for a trial request")
+            time.sleep(delay)
+
+    def release(self, proxy):
+        with self.lock:
+            if proxy in self.health:
+                self.health[proxy].in_use = max(0, self.health[proxy].in_use - 1)
+
+    def report(self, proxy, ok, latency=None):
+        """Feed back the outcome of a request made through `proxy`"""
+        if not proxy:
+            return
+        with self.lock:
+            health = self.health.get(normalize_proxy(proxy))
+            if health is None:
+                return
+            health.record(ok, latency)
+            if not ok and health.breaker.state == CircuitBreaker.OPEN:
+                print(f"[Proxy] Quarantined {proxy} for {health.breaker.remaining():.0f}s "
+                      f"(success rate {health.success_rate:.0%})")
+
+    def summary(self):
+        return [{'proxy': health.proxy, 'score': round(health.score, 3),
+                 'success_rate': round(health.success_rate, 3),
+                 'latency': round(health.latency, 3) if health.latency is not None else None,
+                 'state': health.breaker.state}
+                for health in sorted(self.health.values(), key=lambda health: health.score, reverse=True)]
@@ -0,0 +1,166 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+import config
+from case_parsers import details_url, ecli_from_url, parse_content_document, parse_detail_html
+from output_writers import CaseOutputWriters
+from warc_archive import archive_files, iter_records
+
+
+def record_kind(record):
+    """'content' (open-data XML), 'detail' (rendered page) or None for records that hold no ruling"""
+    if record['status'] not in (None, 200):
+        return None
+    path = urlparse(record['url']).path
+    if path.endswith('/uitspraken/content'):
+        return 'content'
+    if path.endswith('/details') and 'ECLI' in record['url']:
+        return 'detail'
+    return None
+
+
+def extract_record(kind, url, payload):
+    """Run the parser for one archived document; returns case_data"""
+    if kind == 'content':
+        # Rows keep the public details URL, as they do when the http engine fetches live
+        return parse_content_document(payload, url=details_url(ecli_from_url(url)))
+    return parse_detail_html(payload.decode('utf-8', errors='replace'), url)
+
+
+def matches_subject(case_data, subject):
+    """Same rule as MassiveLawScraper.matches_subject"""
+    rechtsgebieden = [r.strip() for r in case_data.get('rechtsgebieden', '').split(',') if r.strip()]
+    if not subject or not rechtsgebieden:
+        return True
+    return any(subject.lower() in rechtsgebied.lower() for rechtsgebied in rechtsgebieden)
+
+
+def _extract_batch(batch, subject):
+    """Worker: parse a batch of (kind, url, payload); returns (case_data or None, error) pairs"""
+    results = []
+    for kind, url, payload in batch:
+        try:
+            case_data = extract_record(kind, url, payload)
+        except Exception as e:
+            results.append((None, f"{url}: {type(e).__name__}: {e}"))
+            continue
+        results.append((case_data if matches_subject(case_data, subject) else None, None))
+    return results
+
+
+def latest_records(path, seen):
+    """Index of the last ruling record per ECLI in one WARC file, for ECLIs not in `seen`
+
+    Records are appended as they are fetched, so within a file the last copy
+    of an ECLI is the newest one.
+    """
+    latest = {}
+    for index, record in enumerate(iter_records(path)):
+        if record_kind(record):
+            ecli_code = ecli_from_url(record['url'])
+            if ecli_code not in seen:
+                latest[ecli_code] = index
+    return latest
+
+
+def iter_batches(files, batch_size, stats):
+    """Read the archive newest file first and batch the records that hold a ruling
+
+    The newest copy of an ECLI wins: the one in the newest file, and within
+    that file the last one written. Older copies are skipped before parsing.
+    Each file is streamed twice (once to find the last copies, once to
+    batch them), never loaded whole.
+    """
+    seen = set()
+    batch = []
+    for path in reversed(files):
+        latest = latest_records(path, seen)
+        for index, record in enumerate(iter_records(path)):
+            stats['records'] += 1
+            kind = record_kind(record)
+            if not kind:
+                continue
+            if latest.get(ecli_from_url(record['url'])) != index:
+                stats['duplicates'] += 1
+                continue
+            batch.append((kind, record['url'], record['payload']))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        seen.update(latest)
+    if batch:
+        yield batch
+
+
+def reextract(archive, output_dir=None, subject=None, workers=None, batch_size=None, parquet=False):
+    """Re-derive case rows from a WARC archive with a process pool; no browser, no network"""
+    files = archive_files(archive)
+    if not files:
+        print(f"[Reextract] No WARC files found in {archive}")
+        return 0
+    output_dir = output_dir or os.path.join(config.OUTPUT_DIR, "reextracted")
+    workers = workers or config.REEXTRACT_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or config.REEXTRACT_BATCH
+    print(f"[Reextract] {len(files)} WARC files, {workers} worker processes")
+
+    stats = {'records': 0, 'duplicates': 0, 'cases': 0, 'skipped': 0, 'errors': 0}
+    writers = CaseOutputWriters(output_dir, subject or 'reextracted', parquet=parquet)
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            batches = iter_batches(files, batch_size, stats)
+            for batch in batches:
+                # Bounded window, so reading the archive never runs far ahead of the workers
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        land(future.result(), writers, stats)
+                pending.add(pool.submit(_extract_batch, batch, subject))
+            for future in pending:
+                land(future.result(), writers, stats)
+    finally:
+        writers.close()
+    elapsed = time.perf_counter() - start
+    print(f"[Reextract] {stats['cases']} cases from {stats['records']} records in {elapsed:.1f}s "
+          f"({stats['cases'] / elapsed if elapsed else 0:.0f} cases/s); {stats['duplicates']} older copies, "
+          f"{stats['skipped']} not in subject, {stats['errors']} parse errors")
+    print(f"[Reextract] Output written to {output_dir}")
+    return stats['cases']
+
+
+def land(results, writers, stats):
+    for case_data, error in results:
+        if error:
+            stats['errors'] += 1
+            print(f"[Error] Could not re-extract {error}")
+        elif case_data:
+            writers.write(case_data)
+            stats['cases'] += 1
+        else:
+            stats['skipped'] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract cases from a WARC archive without a browser or network')
+    parser.add_argument('archive', nargs='?', default=os.path.join(config.OUTPUT_DIR, config.WARC_DIR),
+                        help='WARC file or directory (default: run/warc)')
+    parser.add_argument('--output-dir', help='Where to write the re-extracted files (default: run/reextracted)')
+    parser.add_argument('--subject', help='Only keep cases with this rechtsgebied')
+    parser.add_argument('--workers', type=int, default=config.REEXTRACT_WORKERS,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--batch-size', type=int, default=config.REEXTRACT_BATCH,
+                        help='Records parsed per worker task')
+    parser.add_argument('--parquet', action='store_true', default=config.PARQUET_OUTPUT,
+                        help='Also write a partitioned Parquet dataset (needs pyarrow)')
+
+    args = parser.parse_args()
+
+    reextract(args.archive, output_dir=args.output_dir, subject=args.subject, workers=args.workers,
+              batch_size=args.batch_size, parquet=args.parquet)
+
+
+if __name__ == "__main__":
+    main()
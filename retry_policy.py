@@ -0,0 +1,166 @@
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+import config
+from circuit_breaker import CircuitBreaker
+
+# HTTP statuses worth retrying; anything else in 4xx is final
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Error class names (httpx, selenium, urllib3, builtins) that mean "try again later"
+TRANSIENT_ERRORS = {
+    'TimeoutException', 'ReadTimeout', 'ConnectTimeout', 'WriteTimeout', 'PoolTimeout',
+    'ConnectError', 'ReadError', 'WriteError', 'RemoteProtocolError', 'ProxyError', 'NetworkError',
+    'WebDriverException', 'InvalidSessionIdException', 'NoSuchWindowException',
+    'ConnectionError', 'ConnectionResetError', 'ProtocolError', 'TimeoutError', 'BrokenPipeError'
+}
+
+
+def classify(error, status=None):
+    """'transient' for errors worth retrying, 'permanent' for everything else
+
+    Judged by the HTTP status (passed in, or on the error's response) and
+    otherwise by the error's type. A bare message says nothing about either,
+    so it is permanent unless the caller passes kind='transient' to CaseFailure.
+    """
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return 'transient' if status in TRANSIENT_STATUSES else 'permanent'
+    if isinstance(error, str):
+        return 'permanent'
+    for cls in type(error).__mro__:
+        if cls.__name__ in TRANSIENT_ERRORS:
+            return 'transient'
+    return 'permanent'
+
+
+class CaseFailure:
+    """A failed extraction, in place of case_data
+
+    Falsy, so code that only checks `if case_data` treats it like a missing
+    case, but it carries the error and its classification for the retry
+    layer. Only plain strings are kept so it pickles across worker processes.
+    """
+
+    def __init__(self, url, error, kind=None, status=None):
+        self.url = url
+        self.kind = kind or classify(error, status)
+        self.error = f"{type(error).__name__}: {error}" if not isinstance(error, str) else error
+
+    def __bool__(self):
+        return False
+
+    @property
+    def transient(self):
+        return self.kind == 'transient'
+
+    def __repr__(self):
+        return f"CaseFailure({self.url!r}, {self.kind}, {self.error!r})"
+
+
+def host_healthy(result):
+    """Whether a result speaks for the host's health; only transient failures count against it"""
+    return not (isinstance(result, CaseFailure) and result.transient)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits U(0, min(max_delay, base * 2**n))"""
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None):
+        self.max_attempts = max_attempts or config.RETRY_MAX_ATTEMPTS
+        self.base_delay = base_delay or config.RETRY_BASE_DELAY
+        self.max_delay = max_delay or config.RETRY_MAX_DELAY
+
+    def should_retry(self, failure, attempt):
+        return failure.transient and attempt < self.max_attempts
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class HostBreakers:
+    """One circuit breaker per host, so an outage pauses only the host that is down"""
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def get(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+
+    def wait(self, host):
+        """Block until the host's breaker lets a call through"""
+        breaker = self.get(host)
+        while not breaker.allow():
+            remaining = max(breaker.remaining(), 0.5)
+            print(f"[Breaker] {host} is failing; pausing {remaining:.0f}s before a trial request")
+            time.sleep(remaining)
+
+    def record(self, host, ok):
+        breaker = self.get(host)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+
+class DeadLetterQueue:
+    """JSONL file of cases that kept failing, for a later --retry-failed run"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(config.OUTPUT_DIR, config.DEAD_LETTER_FILE)
+        self.lock = threading.Lock()
+        self.added = 0
+
+    def add(self, failure, attempts):
+        record = {'url': failure.url, 'error': failure.error, 'kind': failure.kind,
+                  'attempts': attempts, 'failed_at': datetime.now().isoformat()}
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.added += 1
+        print(f"[Dead letter] {failure.url} after {attempts} attempts ({failure.kind}: {failure.error})")
+
+    def take(self):
+        """Move the queued entries aside and return their URLs (each once)
+
+        The entries stay in <path>.replaying until `done()`, so a crash during
+        the replay loses nothing.
+        """
+        replaying = self.path + ".replaying"
+        if os.path.exists(self.path):
+            if os.path.exists(replaying):
+                # Left over from an interrupted replay: merge
+                with open(self.path, 'r', encoding='utf-8') as src, open(replaying, 'a', encoding='utf-8') as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, replaying)
+        if not os.path.exists(replaying):
+            return []
+        urls = []
+        with open(replaying, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    url = json.loads(line)['url']
+                except (ValueError, KeyError):
+                    continue
+                if url not in urls:
+                    urls.append(url)
+        return urls
+
+    def done(self):
+        """Drop the replayed entries; failures of the replay were added anew"""
+        replaying = self.path + ".replaying"
+        if os.path.exists(replaying):
+            os.remove(replaying)
@@ -1,44 +1,90 @@
 import time
 import pandas as pd
 from tqdm import tqdm
-from fake_useragent import UserAgent
 import os
 import re
 import json
 from datetime import datetime
-from selenium import webdriver
+from urllib.parse import quote
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 import config
+from case_parsers import ecli_from_url, listing_case_data, feed_card
+from async_fetcher import AsyncCaseFetcher
+from browser_pool import BrowserPool
+from browser_session import BrowserSession
+from open_data_feed import OpenDataFeed
+from pipeline import CasePipeline
+from page_extraction import ListingCardExtractor
+from seen_index import SeenEcliIndex, PendingSeen
+from checkpoint_log import CheckpointLog
+from retry_policy import CaseFailure, RetryPolicy, HostBreakers, DeadLetterQueue, host_healthy
+from urllib.parse import urlparse
+from output_writers import CaseOutputWriters, TxtCaseWriter, CsvCaseWriter, remove_inprogress_files
+from metrics import MetricsReporter, log, setup_logging
 import argparse
-import random
+import logging
 import threading
 
 stop_loading_flag = threading.Event()
 stop_loading_flag.clear()  # Not stopping by default
 
-class MassiveLawScraper:
-    def __init__(self, proxies=None, start_url=None, subject=None):
-        self.ua = UserAgent()
+
+class MassiveLawScraper(BrowserSession):
+    def __init__(self, proxies=None, start_url=None, subject=None, engine=None,
+                 max_in_flight=None, rate=None, workers=None, source=None, date_from=None, date_to=None,
+                 pipeline=None, lean=None, output_dir=None, skip_seen=None, use_cache=None, parquet=None,
+                 metadata_only=None, prefilter=None, metrics_port=None, archive=None, allow_direct=None,
+                 seen_index_path=None):
+        # Create output directory
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        os.makedirs(self.output_dir, exist_ok=True)
+        archive = config.WARC_ARCHIVE if archive is None else archive
+        super().__init__(subject=subject, proxies=proxies, lean=lean, use_cache=use_cache,
+                         archive_dir=os.path.join(self.output_dir, config.WARC_DIR) if archive else None,
+                         allow_direct=allow_direct)
         self.data = []
         self.case_urls = []
-        self.driver = None
+        self.engine = engine or config.DETAIL_ENGINE
+        self.async_fetcher = None
+        self.max_in_flight = max_in_flight or config.MAX_IN_FLIGHT
+        self.rate = rate or config.REQUESTS_PER_SECOND
+        self.workers = workers or config.BROWSER_WORKERS
+        self.browser_pool = None
+        self.source = source or config.CASE_SOURCE
+        self.date_from = date_from
+        self.date_to = date_to
+        self.feed = None
+        self.pipeline = config.PIPELINE if pipeline is None else pipeline
+        self.card_extractor = ListingCardExtractor(metrics=self.metrics)
+        self.listing_cards = {}
+        self.metadata_only = config.METADATA_ONLY if metadata_only is None else metadata_only
+        self.prefilter = config.LISTING_PREFILTER if prefilter is None else prefilter
+        self.cases_prefiltered = 0
+        self.listing_exhausted = False
+        self.skip_seen = config.SKIP_SEEN if skip_seen is None else skip_seen
+        # Default: the index shared by all runs in config.OUTPUT_DIR
+        self.seen_index_path = seen_index_path
+        self.seen_index = None
+        self.seen_pending = None
+        self.last_modified = {}
+        self.cases_skipped = 0
+        self.urls_harvested = 0
+        self.checkpoint = None
+        self.writers = None
+        self.output_failed = False
+        self.parquet = config.PARQUET_OUTPUT if parquet is None else parquet
         self.current_page = 1
         self.cases_found = 0
-        self.proxies = proxies or []
-        self.current_proxy_index = 0
+        self.retry_policy = RetryPolicy()
+        self.host_breakers = HostBreakers()
+        self.metrics_port = config.METRICS_PORT if metrics_port is None else metrics_port
+        self.metrics_reporter = None
         self.start_url = start_url
-        self.subject = subject
-        
-        # Create output directory
-        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
         
         # Initialize progress tracking
-        self.progress_file = os.path.join(config.OUTPUT_DIR, "scraping_progress.json")
+        self.progress_file = os.path.join(self.output_dir, "scraping_progress.json")
+        self.dead_letters = DeadLetterQueue(os.path.join(self.output_dir, config.DEAD_LETTER_FILE))
         self.load_progress()
     
     def load_progress(self):
@@ -61,35 +107,23 @@ class MassiveLawScraper:
         with open(self.progress_file, 'w') as f:
             json.dump(progress, f)
 
+    def get_window_url(self):
+        """Search URL restricted to the configured uitspraakdatum window"""
+        subject = (self.subject or config.CURRENT_LAW).lower()
+        date_from = self.date_from or config.FEED_DATE_FROM
+        date_to = self.date_to or datetime.now().strftime("%d-%m-%Y")
+        return (f"https://uitspraken.rechtspraak.nl/resultaat?zoekterm={quote(subject)}&inhoudsindicatie=zt0"
+                f"&publicatiestatus=ps1&sort=UitspraakDatumDesc&uitspraakdatumrange=tussen"
+                f"&uitspraakdatuma={date_from}&uitspraakdatumb={date_to}")
+
     def get_default_url(self):
         """Get the default URL with correct date range parameters"""
         return "https://uitspraken.rechtspraak.nl/resultaat?zoekterm=vreemdelingenrecht&inhoudsindicatie=zt0&publicatiestatus=ps1&sort=UitspraakDatumDesc&uitspraakdatumrange=tussen&uitspraakdatuma=03-03-1984&uitspraakdatumb=19-06-2025"
     
-    def get_next_proxy(self):
-        if not self.proxies:
-            return None
-        proxy = self.proxies[self.current_proxy_index % len(self.proxies)]
-        self.current_proxy_index += 1
-        print(f"[Proxy] Using proxy: {proxy}")
-        return proxy
-
-    def setup_driver(self, proxy=None):
-        """Setup Chrome driver with options"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument(f'--user-agent={self.ua.random}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        if proxy:
-            options.add_argument(f'--proxy-server={proxy}')
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
+    def result_count(self):
+        """Number of case links currently in the search listing"""
+        return self.driver.execute_script("return document.querySelectorAll(\"a[href*='ECLI']\").length;")
+
     def extract_rechtsgebieden(self):
         rechtsgebieden = []
         if not self.driver:
@@ -102,182 +136,236 @@ class MassiveLawScraper:
             print(f"[Error] Could not extract rechtsgebieden: {e}")
         return rechtsgebieden
 
-    def extract_case_content(self, url):
-        if not self.driver:
-            print("[Error] WebDriver is not initialized when extracting case content.")
-            return None
-        try:
-            if not self.driver:
-                print("[Error] WebDriver is not initialized before get().")
-                return None
-            self.driver.get(url)
-            time.sleep(2)
-            
-            # Extract ECLI code from URL
-            ecli_match = re.search(r'ECLI:([^&]+)', url)
-            ecli_code = ecli_match.group(1) if ecli_match else ""
-            
-            # Extract title
-            title = ""
-            title_selectors = [
-                "h2.rs-panel-title",
-                "h1",
-                ".title",
-                ".case-title"
-            ]
-            for selector in title_selectors:
-                try:
-                    if not self.driver:
-                        continue
-                    title_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    title = title_elem.text.strip()
-                    if title:
-                        break
-                except:
-                    continue
-            
-            # Extract content with multiple methods
-            content = ""
-            content_selectors = [
-                "div.rnl-detail-uitspraaktekst.printthis.ng-star-inserted",
-                ".rnl-detail-uitspraaktekst--content",
-                ".uitspraak",
-                ".content",
-                ".case-content",
-                "main",
-                ".uitspraak-tekst",
-                ".case-text"
-            ]
-            
-            for selector in content_selectors:
-                try:
-                    if not self.driver:
-                        continue
-                    content_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    content = content_elem.text.strip()
-                    if len(content) > 100:  # Ensure we got meaningful content
-                        break
-                except:
-                    continue
-            
-            # If no content found, try getting all text from body
-            if not content or len(content) < 100:
-                try:
-                    if not self.driver:
-                        pass
-                    body = self.driver.find_element(By.TAG_NAME, "body")
-                    content = body.text.strip()
-                except:
-                    pass
-            
-            # Extract court information
-            court = ""
-            court_selectors = [
-                "//label[contains(text(), 'Instantie')]/following-sibling::span",
-                "//label[contains(text(), 'Rechter')]/following-sibling::span",
-                ".court",
-                ".rechter"
-            ]
-            
-            for selector in court_selectors:
-                try:
-                    if not self.driver:
-                        continue
-                    if selector.startswith("//"):
-                        court_elem = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        court_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    court = court_elem.text.strip()
-                    if court:
-                        break
-                except:
-                    continue
-            
-            # Extract date uitspraak
-            date_uitspraak = ""
-            try:
-                date_uitspraak_elem = self.driver.find_element(By.XPATH, "//label[contains(text(), 'Datum uitspraak')]/following-sibling::span")
-                date_uitspraak = date_uitspraak_elem.text.strip()
-            except:
-                pass
-            # Extract date publicatie
-            date_publicatie = ""
-            try:
-                date_publicatie_elem = self.driver.find_element(By.XPATH, "//label[contains(text(), 'Datum publicatie')]/following-sibling::span")
-                date_publicatie = date_publicatie_elem.text.strip()
-            except:
-                pass
-            
-            # Extract date (main date)
-            date = ""
-            date_selectors = [
-                "//label[contains(text(), 'Datum')]/following-sibling::span",
-                ".date",
-                ".datum"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    if not self.driver:
-                        continue
-                    if selector.startswith("//"):
-                        date_elem = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        date_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    date = date_elem.text.strip()
-                    if date:
-                        break
-                except:
+    def setup_http_engine(self, proxy=None):
+        """Setup the browserless open-data detail fetcher"""
+        if proxy is None and self.proxy_pool:
+            proxy = self.get_next_proxy()
+        # Kept for the whole run so its pacer remembers how the server behaved
+        self.async_fetcher = AsyncCaseFetcher(max_in_flight=self.max_in_flight, rate=self.rate,
+                                              user_agent=self.ua.random, proxy=proxy, cache=self.page_cache,
+                                              metrics=self.metrics, archive=self.archive)
+
+    def setup_browser_pool(self, size=None):
+        """Start one headless Chrome process per worker, each with its own proxy"""
+        size = size or self.workers
+        proxies = [self.get_next_proxy() for _ in range(size)]
+        self.browser_pool = BrowserPool(
+            size, subject=self.subject, proxies=proxies, lean=self.lean, metrics=self.metrics,
+            use_cache=self.use_cache, archive_dir=self.archive.directory if self.archive else None,
+            proxy_pool=self.proxy_pool.healthy() if self.proxy_pool else None,
+            allow_direct=self.proxy_pool.allow_direct if self.proxy_pool else None
+        )
+        self.browser_pool.start()
+
+    def keep_case(self, case_data):
+        """Apply the subject filter to an already extracted case"""
+        rechtsgebieden = [r.strip() for r in case_data.get('rechtsgebieden', '').split(',') if r.strip()]
+        return self.matches_subject(rechtsgebieden)
+
+    def unseen_urls(self, case_urls):
+        """Drop case URLs whose ECLI was already scraped (and not modified since)"""
+        if self.checkpoint:
+            case_urls = [case_url for case_url in case_urls if not self.checkpoint.is_done(case_url)]
+        if not self.seen_index:
+            return list(case_urls)
+        unseen = []
+        for case_url in case_urls:
+            if self.seen_index.is_fresh(ecli_from_url(case_url), self.last_modified.get(case_url)):
+                self.cases_skipped += 1
+            else:
+                unseen.append(case_url)
+        if len(unseen) < len(case_urls):
+            print(f"[Seen] Skipping {len(case_urls) - len(unseen)} already scraped cases "
+                  f"({self.cases_skipped} this run)")
+        return unseen
+
+    def fetch_host(self, case_url):
+        """Host that actually serves a case with the configured engine"""
+        if self.engine == 'http':
+            return urlparse(config.OPEN_DATA_BASE_URL).netloc
+        return urlparse(case_url).netloc
+
+    def extract_cases(self, case_urls):
+        """Extract a batch of cases with retries, yielding (url, case_data) pairs
+
+        Transient failures (timeouts, network errors, 429/5xx) are retried
+        with jittered exponential backoff, and each fetch host has a circuit
+        breaker that pauses requests while the host keeps failing. Permanent
+        failures, and transient ones that run out of attempts, are written to
+        the dead-letter file and yielded as their CaseFailure (falsy).
+        """
+        pending = list(case_urls)
+        attempt = 1
+        while pending:
+            retry = []
+            for case_url, case_data in self.extract_batch(pending, filter_seen=attempt == 1):
+                failure = case_data if isinstance(case_data, CaseFailure) else None
+                if failure is not None and self.retry_policy.should_retry(failure, attempt):
+                    self.metrics.inc('retries_total', stage='fetch')
+                    retry.append(case_url)
                     continue
-            
-            # Extract inhoudsindicatie
-            inhoudsindicatie = ""
-            try:
-                inhoudsindicatie_elem = self.driver.find_element(By.XPATH, "//label[contains(text(), 'Inhoudsindicatie')]/following-sibling::span")
-                inhoudsindicatie = inhoudsindicatie_elem.text.strip()
-            except:
-                pass
-            
-            # Extract rechtsgebieden
-            rechtsgebieden = self.extract_rechtsgebieden()
-            
-            # Check if this case matches our subject
-            if self.subject and rechtsgebieden:
-                subject_found = False
-                for rechtsgebied in rechtsgebieden:
-                    if self.subject.lower() in rechtsgebied.lower():
-                        subject_found = True
-                        break
-                if not subject_found:
-                    print(f"[Filter] Skipping case - subject '{self.subject}' not found in rechtsgebieden: {rechtsgebieden}")
-                    return None
-            
-            case_data = {
-                'ecli_code': ecli_code,
-                'title': title,
-                'court': court,
-                'date': date,
-                'date_uitspraak': date_uitspraak,
-                'date_publicatie': date_publicatie,
-                'inhoudsindicatie': inhoudsindicatie,
-                'content': content,
-                'url': url,
-                'rechtsgebieden': ', '.join(rechtsgebieden) if rechtsgebieden else ''
-            }
-            
-            # Add random delay between case extractions (3.00 to 3.50 seconds)
-            delay = random.uniform(3.00, 3.50)
-            print(f"[Stealth] Sleeping for {delay:.2f} seconds after extracting a case...")
-            time.sleep(delay)
-            
-            return case_data
-            
-        except Exception as e:
-            print(f"[Error] Failed to extract case content from {url}: {e}")
-            return None
+                if failure is not None:
+                    self.metrics.inc('errors_total', stage='fetch', kind=failure.kind)
+                    self.dead_letters.add(failure, attempts=attempt)
+                yield case_url, case_data
+            if retry:
+                delay = self.retry_policy.delay(attempt)
+                print(f"[Retry] {len(retry)} cases failed transiently; attempt {attempt + 1} "
+                      f"of {self.retry_policy.max_attempts} in {delay:.1f}s")
+                self.metrics.inc('sleep_seconds_total', delay, stage='retry')
+                time.sleep(delay)
+            pending = retry
+            attempt += 1
+
+    def extract_batch(self, case_urls, filter_seen=True):
+        """Extract a batch of cases once, yielding (url, case_data) pairs
+
+        In metadata-only mode the rows come straight from the listing cards.
+        URLs already in the seen-ECLI index are skipped before any fetch. The
+        http engine fetches the batch concurrently under the configured
+        in-flight and requests/second budget; Selenium spreads it over the
+        browser pool when more than one worker is configured. The fetch
+        host's circuit breaker is consulted before, and told about, every
+        case; only transient errors count against the host.
+        """
+        cards = {case_url: self.listing_cards.pop(case_url, None) for case_url in case_urls}
+        if filter_seen:
+            case_urls = self.unseen_urls(case_urls)
+        if not case_urls:
+            return
+        if self.metadata_only:
+            for case_url in case_urls:
+                card = cards.get(case_url)
+                yield case_url, listing_case_data(card) if card else None
+            return
+        breaker = self.host_breakers.get(self.fetch_host(case_urls[0]))
+        if self.engine != 'http' and self.browser_pool:
+            yield from self.browser_pool.extract(case_urls, breaker)
+            return
+        if self.engine != 'http':
+            for case_url in case_urls:
+                host = self.fetch_host(case_url)
+                self.host_breakers.wait(host)
+                case_data = self.extract_case_content(case_url)
+                self.host_breakers.record(host, ok=host_healthy(case_data))
+                yield case_url, case_data
+            return
+        if not self.async_fetcher:
+            self.setup_http_engine()
+        results = self.async_fetcher.run(case_urls, breaker)
+        for case_url, case_data in zip(case_urls, results):
+            if case_data is None:
+                case_data = CaseFailure(case_url, "No result from the async fetcher", kind='transient')
+            elif case_data and not self.keep_case(case_data):
+                case_data = None
+            yield case_url, case_data
+
+    def logged_urls(self, case_urls, page):
+        """Write each harvested URL ahead to the checkpoint log as it passes by"""
+        for case_url in case_urls:
+            self.urls_harvested += 1
+            if self.checkpoint:
+                self.checkpoint.url_harvested(case_url, page)
+            yield case_url
+
+    def land_results(self, results, page):
+        """Keep extracted cases and log them; returns the number of results seen"""
+        extracted = 0
+        for case_url, case_data in results:
+            extracted += 1
+            print(f"[Page {page}] Extracted case {extracted}: {case_url}")
+            
+            if case_data:
+                self.writers.write(case_data)
+                if self.checkpoint:
+                    self.checkpoint.case_done(case_url, case_data)
+                # Committed to the seen index once the checkpoint record is fsynced
+                self.mark_seen(case_url, case_data)
+                self.cases_found += 1
+                self.metrics.case_done('ok')
+                print(f"[Page {page}] Successfully extracted case {self.cases_found}")
+            elif isinstance(case_data, CaseFailure):
+                if self.checkpoint:
+                    self.checkpoint.case_dead(case_url)
+                self.metrics.case_done('failed')
+                print(f"[Page {page}] Failed to extract case data; kept in {self.dead_letters.path}")
+            else:
+                if self.checkpoint:
+                    # Filtered out after the fetch; a resume must not fetch it again
+                    self.checkpoint.case_skipped(case_url)
+                self.metrics.case_done('skipped')
+                print(f"[Page {page}] Skipped case (not in subject)")
+        return extracted
+
+    def open_seen_index(self, path=None):
+        """Open the seen-ECLI index and the queue of cases waiting to be recorded in it"""
+        self.seen_index = SeenEcliIndex(path or self.seen_index_path)
+        self.seen_pending = PendingSeen(self.seen_index)
+
+    def mark_seen(self, case_url, case_data):
+        """Queue a landed case for the seen index; commit_seen() records it once it is durable
+
+        Metadata-only rows have no content, so they must not make a later
+        full-text run skip their ECLIs.
+        """
+        if self.seen_pending and not self.metadata_only:
+            self.seen_pending.add(case_data, self.last_modified.pop(case_url, None))
+
+    def commit_seen(self):
+        if self.seen_pending:
+            self.seen_pending.commit()
+
+    def restore_checkpoint(self):
+        """Replay the checkpoint log of an interrupted run before continuing it"""
+        self.checkpoint = CheckpointLog(os.path.join(self.output_dir, config.CHECKPOINT_FILE),
+                                        on_sync=self.commit_seen)
+        if self.checkpoint.done:
+            # The output files of this run are rewritten from the log, then appended to
+            for case_url, case_data in self.checkpoint.restored_cases():
+                self.writers.write(case_data)
+                # Already durable in the log; a crash may have kept them out of the index
+                self.mark_seen(case_url, case_data)
+            self.commit_seen()
+            print(f"[Checkpoint] Restored {len(self.checkpoint.done)} cases extracted before the interruption")
+        if self.checkpoint.pages_done and max(self.checkpoint.pages_done) >= self.current_page:
+            self.current_page = max(self.checkpoint.pages_done) + 1
+        pending = self.checkpoint.pending()
+        if pending:
+            # Only the lost work is redone; the listing is not clicked again for these
+            print(f"[Checkpoint] Extracting {len(pending)} harvested URLs that never finished...")
+            self.land_results(self.extract_cases(pending), self.current_page)
+
+    def keep_card(self, card):
+        """Listing-level subject filter; cards without rechtsgebieden are kept"""
+        rechtsgebieden = card['fields'].get('rechtsgebieden') or []
+        if not self.prefilter or not rechtsgebieden or self.matches_subject(rechtsgebieden):
+            return True
+        self.cases_prefiltered += 1
+        return False
+
+    def new_case_links(self, offset):
+        """Return case links added to the listing after the first `offset` links
+
+        All new result cards are parsed in one script call, so each click
+        costs a single round trip. Cards whose rechtsgebieden do not match the
+        subject are dropped here, before any detail page is fetched.
+        """
+        cards = self.card_extractor.extract(self.driver, offset)
+        links = []
+        for card in cards:
+            if not card['url'] or 'ECLI' not in card['url'] or not self.keep_card(card):
+                continue
+            self.listing_cards[card['url']] = card
+            links.append(card['url'])
+        return offset + len(cards), links
 
     def scrape_search_page(self, page):
-        """Scrape search results page and yield case URLs"""
+        """Scrape search results page and yield case URLs
+
+        URLs are yielded as soon as they become visible (after the initial
+        load and after every 'Load More' click), so a pipeline can start
+        extracting while the listing is still growing.
+        """
         if not self.driver:
             print("[Error] WebDriver is not initialized when scraping search page.")
             return
@@ -286,9 +374,17 @@ class MassiveLawScraper:
         url = self.start_url or "https://uitspraken.rechtspraak.nl/resultaat?zoekterm=vreemdelingenrecht&inhoudsindicatie=zt0&publicatiestatus=ps1&sort=UitspraakDatumDesc&uitspraakdatumrange=tussen&uitspraakdatuma=03-03-1984&uitspraakdatumb=19-06-2025"
         
         try:
+            if not self.rotate_proxy_if_quarantined() and self.watchdog.recycle_due:
+                self.recycle_driver()
             print(f"[Page {page}] Loading search results...")
-            self.driver.get(url)
-            time.sleep(3)
+            self.load_page(url, config.LISTING_READY_SELECTOR)
+            
+            yielded = set()
+            link_offset, new_links = self.new_case_links(0)
+            for case_url in new_links:
+                if case_url not in yielded:
+                    yielded.add(case_url)
+                    yield case_url
             
             # Click "Load More" button in batches
             batch_size = 500  # Increased from 100 to 500 clicks
@@ -301,6 +397,11 @@ class MassiveLawScraper:
                         print("[User] Stopping loading more results as requested.")
                         break
                     
+                    # The listing DOM only grows; end the batch early when the browser gets too big
+                    if self.watchdog.tick():
+                        print(f"[Page {page}] Watchdog limit reached. Ending batch after {total_clicks} clicks.")
+                        break
+                    
                     # Look for "Laad meer resultaten" button with more comprehensive selectors
                     load_more_button = None
                     button_selectors = [
@@ -322,7 +423,7 @@ class MassiveLawScraper:
                         "//button[@class='btn btn-secondary']"
                     ]
                     
-                    print(f"[Page {page}] Looking for 'Load More' button...")
+                    log.debug("[Page %s] Looking for 'Load More' button...", page)
                     for i, selector in enumerate(button_selectors):
                         try:
                             if selector.startswith("//"):
@@ -335,37 +436,54 @@ class MassiveLawScraper:
                                     button_text = element.text.strip().lower()
                                     if any(keyword in button_text for keyword in ['laad meer', 'load more', 'meer', 'more']):
                                         load_more_button = element
-                                        print(f"[Page {page}] Found 'Load More' button with selector {i}: '{element.text}'")
+                                        log.debug("[Page %s] Found 'Load More' button with selector %s: '%s'",
+                                                  page, i, button_text)
                                         break
                             
                             if load_more_button:
                                 break
                         except Exception as e:
-                            print(f"[Debug] Selector {i} failed: {e}")
+                            log.debug("[Debug] Selector %s failed: %s", i, e)
                             continue
                     
                     if not load_more_button:
                         print(f"[Page {page}] No 'Load More' button found. Checking page content...")
-                        # Debug: print all buttons on the page
-                        try:
-                            all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
-                            print(f"[Debug] Found {len(all_buttons)} buttons on page:")
-                            for i, btn in enumerate(all_buttons[:10]):  # Show first 10 buttons
-                                if btn.is_displayed():
-                                    print(f"  Button {i}: '{btn.text}' (class: {btn.get_attribute('class')})")
-                        except:
-                            pass
+                        # Debug: print all buttons on the page (each text/attribute is a WebDriver round trip)
+                        if log.isEnabledFor(logging.DEBUG):
+                            try:
+                                all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
+                                log.debug("[Debug] Found %s buttons on page:", len(all_buttons))
+                                for i, btn in enumerate(all_buttons[:10]):  # Show first 10 buttons
+                                    if btn.is_displayed():
+                                        log.debug("  Button %s: '%s' (class: %s)", i, btn.text, btn.get_attribute('class'))
+                            except:
+                                pass
                         print(f"[Page {page}] No more 'Load More' button found. All results loaded.")
+                        self.listing_exhausted = True
                         break
                     
                     # Click the button
-                    print(f"[Page {page}] Clicking 'Load More' button...")
+                    log.debug("[Page %s] Clicking 'Load More' button...", page)
+                    self.metrics.inc('sleep_seconds_total', self.pacer.wait(), stage='pacer')
+                    start = time.perf_counter()
                     self.driver.execute_script("arguments[0].click();", load_more_button)
                     total_clicks += 1
-                    print(f"[Page {page}] Clicked 'Load More' button ({total_clicks} clicks so far)")
+                    log.debug("[Page %s] Clicked 'Load More' button (%s clicks so far)", page, total_clicks)
+                    
+                    # Wait until the result count has grown
+                    grew = self.wait_for(lambda driver: self.result_count() > link_offset)
+                    self.pacer.record(time.perf_counter() - start, ok=grew)
+                    self.metrics.observe('listing_click_seconds', time.perf_counter() - start,
+                                         stage='listing', proxy=self.driver_proxy or 'direct')
+                    if not grew:
+                        self.metrics.inc('errors_total', stage='listing', kind='not_ready')
                     
-                    # Wait a bit for content to load
-                    time.sleep(2)
+                    # Hand newly visible cases downstream right away
+                    link_offset, new_links = self.new_case_links(link_offset)
+                    for case_url in new_links:
+                        if case_url not in yielded:
+                            yielded.add(case_url)
+                            yield case_url
                     
                     # Check if we've reached the batch size
                     if total_clicks % batch_size == 0:
@@ -404,18 +522,40 @@ class MassiveLawScraper:
                         print(f"[Page {page}] Found {len(case_links)} case URLs with selector: {selector}")
                         break
                 except Exception as e:
-                    print(f"[Debug] Link selector failed: {e}")
+                    log.debug("[Debug] Link selector failed: %s", e)
                     continue
             
-            print(f"[Page {page}] Total unique case URLs found: {len(set(case_links))}")
-            
-            # Yield each case URL
-            for case_url in set(case_links):  # Remove duplicates
-                yield case_url
+            yielded_before = len(yielded)
+            for case_url in case_links:
+                if case_url not in yielded:
+                    yielded.add(case_url)
+                    yield case_url
+            print(f"[Page {page}] Total unique case URLs found: {len(yielded)} "
+                  f"({len(yielded) - yielded_before} found in the final sweep)")
                 
         except Exception as e:
             print(f"[Error] Failed to scrape search page {page}: {e}")
 
+    def scrape_feed_page(self, page):
+        """Return the case URLs of one open-data feed page"""
+        if not self.feed:
+            self.feed = OpenDataFeed(self.subject or config.CURRENT_LAW, date_from=self.date_from,
+                                     date_to=self.date_to, user_agent=self.ua.random, cache=self.page_cache,
+                                     archive=self.archive)
+        try:
+            print(f"[Page {page}] Fetching open-data feed page ({self.feed.page_size} ECLIs per page)...")
+            entries = self.feed.page(page)
+        except Exception as e:
+            print(f"[Error] Failed to fetch feed page {page}: {e}")
+            # Not "feed exhausted": let the run loop retry the page
+            raise
+        if self.feed.total is not None:
+            print(f"[Page {page}] Feed lists {self.feed.total} rulings in total")
+        for entry in entries:
+            self.last_modified[entry['url']] = entry['last_modified']
+            self.listing_cards[entry['url']] = feed_card(entry)
+        return [entry['url'] for entry in entries]
+
     def update_url_with_oldest_date(self):
         """Update the start URL with the oldest date from previous scrapes"""
         try:
@@ -423,15 +563,15 @@ class MassiveLawScraper:
             oldest_date = None
             
             # Check the most recent metadata file for the oldest date
-            metadata_files = [f for f in os.listdir(config.OUTPUT_DIR) if f.startswith('cases_metadata_Vreemdelingenrecht_') and f.endswith('.csv')]
+            metadata_files = [f for f in os.listdir(self.output_dir) if f.startswith('cases_metadata_Vreemdelingenrecht_') and f.endswith('.csv')]
             
             if metadata_files:
                 # Sort by modification time to get the most recent
-                metadata_files.sort(key=lambda x: os.path.getmtime(os.path.join(config.OUTPUT_DIR, x)), reverse=True)
+                metadata_files.sort(key=lambda x: os.path.getmtime(os.path.join(self.output_dir, x)), reverse=True)
                 latest_file = metadata_files[0]
                 
                 # Read the file to find the oldest date
-                filepath = os.path.join(config.OUTPUT_DIR, latest_file)
+                filepath = os.path.join(self.output_dir, latest_file)
                 try:
                     df = pd.read_csv(filepath)
                     if 'date' in df.columns:
@@ -471,146 +611,221 @@ class MassiveLawScraper:
             self.start_url = "https://uitspraken.rechtspraak.nl/resultaat?zoekterm=vreemdelingenrecht&inhoudsindicatie=zt0&publicatiestatus=ps1&sort=UitspraakDatumDesc&uitspraakdatumrange=tussen&uitspraakdatuma=03-03-1984&uitspraakdatumb=19-06-2025"
 
     def save_to_txt(self):
-        """Save scraped data to text file"""
+        """Save all cases in self.data to a text file in one go (e.g. merged shard output)"""
         if not self.data:
             print("[Warning] No data to save")
             return
-        
-        # Determine date range
-        dates = [case['date'] for case in self.data if case.get('date')]
-        if dates:
-            # Parse dates in DD-MM-YYYY format
-            try:
-                parsed_dates = []
-                for date_str in dates:
-                    if date_str and '-' in date_str:
-                        day, month, year = date_str.split('-')
-                        parsed_dates.append(f"{year}{month}{day}")
-                
-                if parsed_dates:
-                    min_date = min(parsed_dates)
-                    max_date = max(parsed_dates)
-                    date_range = f"{min_date[:4]}{min_date[4:6]}{min_date[6:8]}_{max_date[:4]}{max_date[4:6]}{max_date[6:8]}"
-                else:
-                    date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-            except:
-                date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-        else:
-            date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-        
-        subject_name = self.subject or "Vreemdelingenrecht"
-        filename = f"all_cases_{subject_name}_{date_range}.txt"
-        filepath = os.path.join(config.OUTPUT_DIR, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for case in self.data:
-                f.write(f"ECLI Code: {case.get('ecli_code', '')}\n")
-                f.write(f"Title: {case.get('title', '')}\n")
-                f.write(f"Court: {case.get('court', '')}\n")
-                f.write(f"Date: {case.get('date', '')}\n")
-                f.write(f"Date Uitspraak: {case.get('date_uitspraak', '')}\n")
-                f.write(f"Date Publicatie: {case.get('date_publicatie', '')}\n")
-                f.write(f"Inhoudsindicatie: {case.get('inhoudsindicatie', '')}\n")
-                f.write(f"Rechtsgebieden: {case.get('rechtsgebieden', '')}\n")
-                f.write(f"URL: {case.get('url', '')}\n")
-                f.write(f"Content:\n{case.get('content', '')}\n")
-                f.write("-" * 80 + "\n\n")
-        
-        print(f"[Save] Saved {len(self.data)} cases to {filepath}")
+        writer = TxtCaseWriter(self.output_dir, self.subject)
+        for case in self.data:
+            writer.write(case)
+        print(f"[Save] Saved {len(self.data)} cases to {writer.close()}")
 
     def save_metadata_csv(self):
-        """Save metadata to CSV file"""
+        """Save the metadata of all cases in self.data to a CSV file in one go"""
         if not self.data:
             print("[Warning] No data to save")
             return
-        
-        # Determine date range
-        dates = [case['date'] for case in self.data if case.get('date')]
-        if dates:
+        writer = CsvCaseWriter(self.output_dir, self.subject)
+        for case in self.data:
+            writer.write(case)
+        print(f"[Save] Saved metadata for {len(self.data)} cases to {writer.close()}")
+
+    def close_outputs(self):
+        """Drain the streaming writers and give their files the final date-range name
+
+        Raises if an output could not be written; the run's cases then stay
+        pending (see output_failed).
+        """
+        # Detached first: a failed close must not be retried from a finally block
+        writers, self.writers = self.writers, None
+        if writers:
             try:
-                parsed_dates = []
-                for date_str in dates:
-                    if date_str and '-' in date_str:
-                        day, month, year = date_str.split('-')
-                        parsed_dates.append(f"{year}{month}{day}")
-                
-                if parsed_dates:
-                    min_date = min(parsed_dates)
-                    max_date = max(parsed_dates)
-                    date_range = f"{min_date[:4]}{min_date[4:6]}{min_date[6:8]}_{max_date[:4]}{max_date[4:6]}{max_date[6:8]}"
-                else:
-                    date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-            except:
-                date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-        else:
-            date_range = datetime.now().strftime("%Y%m%d_%Y%m%d")
-        
-        subject_name = self.subject or "Vreemdelingenrecht"
-        filename = f"cases_metadata_{subject_name}_{date_range}.csv"
-        filepath = os.path.join(config.OUTPUT_DIR, filename)
-        
-        df = pd.DataFrame(self.data)
-        df.to_csv(filepath, index=False, encoding='utf-8')
-        print(f"[Save] Saved metadata for {len(self.data)} cases to {filepath}")
+                writers.close()
+            except Exception:
+                self.output_failed = True
+                raise
+
+    def start_metrics(self):
+        """Rewrite the metrics file periodically and serve /metrics if a port is set"""
+        if not config.METRICS_ENABLED or self.metrics_reporter:
+            return
+        self.metrics_reporter = MetricsReporter(self.metrics, os.path.join(self.output_dir, config.METRICS_FILE),
+                                                port=self.metrics_port).start()
+
+    def stop_metrics(self):
+        if self.metrics_reporter:
+            self.metrics_reporter.close()
+            print(f"[Metrics] {self.metrics.cases_per_minute():.1f} cases/min at the end; "
+                  f"details in {self.metrics_reporter.json_path}")
+            self.metrics_reporter = None
+
+    def retry_failed(self):
+        """Extract the cases in the dead-letter file again
+
+        Recovered cases go to fresh output files; cases that fail again are
+        written back to the dead-letter file.
+        """
+        case_urls = self.dead_letters.take()
+        if not case_urls:
+            print(f"[Retry] No failed cases in {self.dead_letters.path}")
+            return
+        print(f"[Retry] Retrying {len(case_urls)} failed cases with the '{self.engine}' engine")
+        recovered = 0
+        self.start_metrics()
+        try:
+            if self.skip_seen:
+                self.open_seen_index()
+            if self.engine == 'http':
+                self.setup_http_engine()
+            elif self.workers > 1:
+                self.setup_browser_pool()
+            else:
+                self.setup_driver(proxy=self.get_next_proxy())
+            self.writers = CaseOutputWriters(self.output_dir, self.subject, parquet=self.parquet)
+            for case_url, case_data in self.extract_cases(case_urls):
+                if case_data:
+                    self.writers.write(case_data)
+                    self.mark_seen(case_url, case_data)
+                    self.metrics.case_done('ok')
+                    recovered += 1
+            # No checkpoint here: cases count as seen once their output files are closed
+            self.close_outputs()
+            self.commit_seen()
+            self.dead_letters.done()
+            print(f"[Retry] Recovered {recovered}/{len(case_urls)} cases; "
+                  f"{self.dead_letters.added} failed again")
+        finally:
+            try:
+                self.close_outputs()
+            except Exception as e:
+                # Nothing was marked seen or taken off the dead-letter file
+                print(f"[Error] Saving the recovered cases failed: {e}")
+            if self.driver:
+                self.driver.quit()
+            if self.browser_pool:
+                self.browser_pool.close()
+            if self.seen_index:
+                self.seen_index.close()
+            if self.archive:
+                self.archive.close()
+            self.stop_metrics()
 
     def run(self):
-        """Main scraping loop"""
+        """Main scraping loop; returns True if the crawl completed, False if it was interrupted or failed"""
         print(f"[Start] Starting massive scraping for {self.subject or 'Vreemdelingenrecht'}")
         
-        # Set the URL properly - either from start_url or default
-        if not self.start_url:
+        # Set the URL properly - either from start_url, an explicit date window or default
+        if not self.start_url and (self.date_from or self.date_to):
+            self.start_url = self.get_window_url()
+            print(f"[Window] Restricting search to {self.date_from or config.FEED_DATE_FROM} - {self.date_to or 'today'}")
+        elif not self.start_url:
             self.start_url = self.get_default_url()
         
         # Only update URL with oldest date if we're starting fresh (no progress file exists)
-        # or if we're resuming from a stopped session
-        if not os.path.exists(self.progress_file):
+        # or if we're resuming from a stopped session. An explicit date window is kept as is.
+        windowed = bool(self.date_from or self.date_to)
+        if not windowed and not os.path.exists(self.progress_file):
             print("[New Session] No progress file found. Updating URL with oldest date from previous scrapes...")
             self.update_url_with_oldest_date()
-        else:
+        elif not windowed:
             print("[Resume] Progress file found. Continuing with existing URL and progress.")
             # Ensure we have a valid URL when resuming
             if not self.start_url:
                 self.start_url = self.get_default_url()
         
-        print(f"[URL] Using URL: {self.start_url}")
-        print(f"[Batch Size] 500 clicks per batch before extracting cases")
+        if self.source == 'feed':
+            print(f"[Feed] Enumerating ECLIs from the open-data feed "
+                  f"({self.date_from or config.FEED_DATE_FROM} to {self.date_to or 'today'})")
+        else:
+            print(f"[URL] Using URL: {self.start_url}")
+            print(f"[Batch Size] 500 clicks per batch before extracting cases")
+        print(f"[Engine] Extracting case details with the '{self.engine}' engine")
+        if self.engine == 'http':
+            print(f"[Rate] Up to {self.max_in_flight} requests in flight, {self.rate:g} requests/second")
+        else:
+            print(f"[Profile] {'Lean' if self.lean else 'Full'} Chrome profile")
+            print(f"[Pacer] Starting at {self.pacer.rate:g} requests/second, adapting between "
+                  f"{self.pacer.min_rate:g} and {self.pacer.max_rate:g}")
         
+        self.start_metrics()
+        completed = False
         try:
-            self.setup_driver()
+            if self.skip_seen:
+                self.open_seen_index()
+            if self.proxy_pool and config.PROXY_VALIDATE:
+                self.proxy_pool.validate()
+            
+            # Selenium is still needed for the search listings
+            if self.source == 'search' or (self.engine != 'http' and self.workers <= 1 and not self.metadata_only):
+                self.setup_driver(proxy=self.get_next_proxy())
+            if self.metadata_only:
+                print("[Metadata] Emitting rows from the listing only; no detail pages are fetched")
+            elif self.engine == 'http':
+                self.setup_http_engine()
+            elif self.workers > 1:
+                self.setup_browser_pool()
+            elif self.pipeline and self.source == 'search':
+                # The listing driver is busy harvesting; details need their own browser
+                self.setup_browser_pool(size=1)
+            
+            # The cases of a crashed run's unfinished files are written again from the checkpoint log
+            remove_inprogress_files(self.output_dir)
+            self.writers = CaseOutputWriters(self.output_dir, self.subject, parquet=self.parquet)
+            self.restore_checkpoint()
             
             page = self.current_page
+            page_failures = 0
             while page <= config.MAX_PAGES:
                 print(f"\n[Page {page}] Starting to scrape page {page}")
+                self.urls_harvested = 0
                 
-                # Scrape search page and get case URLs
-                case_urls = list(self.scrape_search_page(page))
+                # A failing page is retried with backoff instead of ending the crawl
+                try:
+                    # Scrape search page and get case URLs
+                    if self.source == 'feed':
+                        case_urls = list(self.logged_urls(self.scrape_feed_page(page), page))
+                        if not case_urls:
+                            print(f"[Page {page}] Feed exhausted. All rulings enumerated.")
+                            break
+                        results = self.extract_cases(case_urls)
+                    elif self.pipeline:
+                        print(f"[Page {page}] Extracting cases while the listing loads...")
+                        results = CasePipeline(self.logged_urls(self.scrape_search_page(page), page),
+                                               self.extract_cases).run()
+                    else:
+                        case_urls = list(self.logged_urls(self.scrape_search_page(page), page))
+                        print(f"[Page {page}] Found {len(case_urls)} case URLs. Starting extraction...")
+                        results = self.extract_cases(case_urls)
                 
-                if not case_urls:
+                    # Extract content from each case
+                    extracted = self.land_results(results, page)
+                except Exception as e:
+                    page_failures += 1
+                    if page_failures >= config.MAX_PAGE_FAILURES:
+                        raise
+                    delay = self.retry_policy.delay(page_failures)
+                    print(f"[Error] Page {page} failed ({e}); retrying in {delay:.1f}s "
+                          f"({page_failures}/{config.MAX_PAGE_FAILURES})")
+                    self.metrics.inc('errors_total', stage='page', kind=type(e).__name__)
+                    self.metrics.inc('sleep_seconds_total', delay, stage='retry')
+                    time.sleep(delay)
+                    continue
+                page_failures = 0
+                
+                # A page whose cases were all seen or done already is finished, not empty
+                if not extracted and not self.urls_harvested:
                     print(f"[Page {page}] No case URLs found. Moving to next page.")
                     page += 1
                     continue
                 
-                print(f"[Page {page}] Found {len(case_urls)} case URLs. Starting extraction...")
-                
-                # Extract content from each case
-                for i, case_url in enumerate(case_urls, 1):
-                    print(f"[Page {page}] Extracting case {i}/{len(case_urls)}: {case_url}")
-                    
-                    case_data = self.extract_case_content(case_url)
-                    if case_data:
-                        self.data.append(case_data)
-                        self.cases_found += 1
-                        print(f"[Page {page}] Successfully extracted case {self.cases_found}")
-                    else:
-                        print(f"[Page {page}] Failed to extract case data")
-                
                 # Save progress after each page
+                self.checkpoint.page_done(page)
                 self.save_progress()
                 
-                # Save data periodically
-                if page % 5 == 0 or page == config.MAX_PAGES:
-                    self.save_to_txt()
-                    self.save_metadata_csv()
+                # A date window fits in one listing; once it is fully loaded the window is done
+                if windowed and self.source == 'search' and self.listing_exhausted:
+                    print("[Window] All results in the date window loaded.")
+                    break
                 
                 page += 1
                 self.current_page = page
@@ -621,40 +836,102 @@ class MassiveLawScraper:
                     break
             
             # Final save
-            self.save_to_txt()
-            self.save_metadata_csv()
+            self.close_outputs()
+            # Everything is in the output files now; the next run starts a new log
+            self.commit_seen()
+            self.checkpoint.reset()
             
             print(f"[Complete] Scraping completed. Total cases found: {self.cases_found}")
+            if self.cases_prefiltered:
+                print(f"[Filter] {self.cases_prefiltered} cases dropped at the listing before any detail fetch")
+            completed = True
             
         except KeyboardInterrupt:
             print("\n[Interrupt] Scraping interrupted by user")
             self.save_progress()
-            self.save_to_txt()
-            self.save_metadata_csv()
         except Exception as e:
             print(f"[Error] Scraping failed: {e}")
             self.save_progress()
-            self.save_to_txt()
-            self.save_metadata_csv()
         finally:
+            try:
+                self.close_outputs()
+            except Exception as e:
+                print(f"[Error] Saving the output failed: {e}")
+            if self.output_failed:
+                print("[Checkpoint] Output was not written; its cases stay in the checkpoint log")
+            elif self.checkpoint:
+                # Cases in the settled files must not be written again on resume
+                self.checkpoint.settle()
             if self.driver:
                 self.driver.quit()
+            if self.browser_pool:
+                self.browser_pool.close()
+            if self.feed:
+                self.feed.close()
+            if self.seen_index:
+                self.seen_index.close()
+            if self.checkpoint:
+                self.checkpoint.close()
+            if self.page_cache:
+                print(f"[Cache] {self.page_cache.hits} hits, {self.page_cache.misses} misses")
+            if self.archive:
+                self.archive.close()
+                print(f"[Archive] {self.archive.records} responses archived in {self.archive.directory}")
+            self.stop_metrics()
+        return completed
 
 def main():
     parser = argparse.ArgumentParser(description='Massive Law Case Scraper')
     parser.add_argument('--subject', default='Vreemdelingenrecht', help='Subject to search for')
     parser.add_argument('--url', help='Custom start URL')
     parser.add_argument('--proxies', nargs='+', help='List of proxy servers')
+    parser.add_argument('--allow-direct', action='store_true', default=config.PROXY_ALLOW_DIRECT,
+                        help='Connect directly (exposing your own IP) when every proxy is quarantined, '
+                             'instead of waiting and then stopping')
     parser.add_argument('--fresh', action='store_true', help='Start fresh (ignore progress)')
+    parser.add_argument('--engine', choices=['selenium', 'http'], default=config.DETAIL_ENGINE,
+                        help='Case detail engine: render in Chrome or fetch open-data documents over HTTP')
+    parser.add_argument('--concurrency', type=int, default=config.MAX_IN_FLIGHT,
+                        help='Maximum number of in-flight requests (http engine)')
+    parser.add_argument('--rate', type=float, default=config.REQUESTS_PER_SECOND,
+                        help='Rate limit in requests/second (http engine)')
+    parser.add_argument('--workers', type=int, default=config.BROWSER_WORKERS,
+                        help='Number of headless Chrome worker processes (selenium engine)')
+    parser.add_argument('--source', choices=['search', 'feed'], default=config.CASE_SOURCE,
+                        help="Case discovery: click 'Load More' on the website or page through the open-data feed")
+    parser.add_argument('--date-from', help='Oldest uitspraakdatum to scrape, DD-MM-YYYY')
+    parser.add_argument('--date-to', help='Newest uitspraakdatum to scrape, DD-MM-YYYY')
+    parser.add_argument('--no-pipeline', action='store_true',
+                        help='Harvest the whole listing before extracting (disables the producer/consumer pipeline)')
+    parser.add_argument('--rescrape', action='store_true',
+                        help='Fetch cases again even if their ECLI is in the seen index')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the on-disk page cache')
+    parser.add_argument('--parquet', action='store_true', default=config.PARQUET_OUTPUT,
+                        help='Also write cases to a partitioned Parquet dataset (needs pyarrow)')
+    parser.add_argument('--metadata-only', action='store_true', default=config.METADATA_ONLY,
+                        help='Emit metadata rows straight from the listing cards without fetching case details')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='Only extract the cases in the dead-letter file again')
+    parser.add_argument('--lean', action='store_true', default=config.LEAN_PROFILE,
+                        help='Lean Chrome profile: eager page loads, no images/fonts/media/CSS/trackers')
+    parser.add_argument('--archive', action='store_true', default=config.WARC_ARCHIVE,
+                        help='Keep every fetched page in rolling WARC files for offline re-extraction')
+    parser.add_argument('--metrics-port', type=int, default=config.METRICS_PORT,
+                        help='Serve Prometheus metrics at http://localhost:PORT/metrics (0 = off)')
+    parser.add_argument('--log-level', default=config.LOG_LEVEL, choices=['DEBUG', 'INFO', 'WARNING'],
+                        help='DEBUG also prints per-selector and per-click detail')
     
     args = parser.parse_args()
+    setup_logging(args.log_level)
     
     # Clear progress if fresh start requested
     if args.fresh:
-        progress_file = os.path.join(config.OUTPUT_DIR, "scraping_progress.json")
-        if os.path.exists(progress_file):
-            os.remove(progress_file)
-            print("[Fresh] Cleared previous progress")
+        for filename in ("scraping_progress.json", config.CHECKPOINT_FILE):
+            progress_file = os.path.join(config.OUTPUT_DIR, filename)
+            if os.path.exists(progress_file):
+                os.remove(progress_file)
+                print(f"[Fresh] Cleared previous progress ({filename})")
     
     # Start interactive thread for user commands
     def check_user_input():
@@ -674,10 +951,29 @@ def main():
     scraper = MassiveLawScraper(
         proxies=args.proxies,
         start_url=args.url,
-        subject=args.subject
+        subject=args.subject,
+        engine=args.engine,
+        max_in_flight=args.concurrency,
+        rate=args.rate,
+        workers=args.workers,
+        source=args.source,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        pipeline=not args.no_pipeline and config.PIPELINE,
+        lean=args.lean,
+        skip_seen=not args.rescrape and config.SKIP_SEEN,
+        use_cache=not args.no_cache and config.USE_CACHE,
+        parquet=args.parquet,
+        metadata_only=args.metadata_only,
+        metrics_port=args.metrics_port,
+        archive=args.archive,
+        allow_direct=args.allow_direct
     )
     
-    scraper.run()
+    if args.retry_failed:
+        scraper.retry_failed()
+    else:
+        scraper.run()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
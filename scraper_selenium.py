@@ -13,6 +13,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from seen_index import SeenEcliIndex
+from proxy_pool import ProxyPool
 
 # Configurable output path
 OUTPUT_CSV = r"run\scraped_cases.csv"  # Save to run folder
@@ -56,7 +58,7 @@ def setup_driver(proxy=None):
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument(f'--user-agent={ua.random}')
     if proxy:
-        options.add_argument(f'--proxy-server=https://{proxy}')
+        options.add_argument(f'--proxy-server={proxy}')
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
     return driver
@@ -113,11 +115,13 @@ def extract_case_details(driver, url):
         return None
 
 def main():
-    proxies = fetch_free_proxies()
+    # Probe all candidates at once, then only start Chrome for the ones that answered
+    pool = ProxyPool([f"https://{proxy}" for proxy in fetch_free_proxies()], test_url=SEARCH_URL)
+    proxies = pool.validate()
     proxy_idx = 0
     driver = None
     
-    # Try proxies until one works
+    # Try the healthiest proxies until one works in Chrome
     while proxy_idx < len(proxies):
         proxy = proxies[proxy_idx]
         print(f"Trying proxy: {proxy}")
@@ -131,9 +135,11 @@ def main():
                 break
             else:
                 print(f"Proxy {proxy} failed (wrong title)")
+                pool.report(proxy, ok=False)
                 driver.quit()
         except Exception as e:
             print(f"Proxy {proxy} failed: {e}")
+            pool.report(proxy, ok=False)
             if driver:
                 driver.quit()
         proxy_idx += 1
@@ -141,6 +147,7 @@ def main():
         print("No working proxy found. Exiting.")
         return
     
+    seen_index = SeenEcliIndex()
     try:
         # Step 1: Get case URLs from search results
         case_urls = []
@@ -168,8 +175,14 @@ def main():
                         print(f"  - Found case URL: {href}")
             time.sleep(2)  # Be polite to the server
         print(f"\nTotal unique case URLs found: {len(case_urls)}")
-        # Step 2: Extract details from each case page
-        for i, case_url in enumerate(tqdm(case_urls, desc="Extracting case details")):
+        # Step 2: Extract details from each case page, skipping cases scraped in earlier runs
+        unseen_urls = []
+        for case_url in case_urls:
+            ecli_match = re.search(r'ECLI:([^&]+)', case_url)
+            if not (ecli_match and seen_index.is_fresh(ecli_match.group(1))):
+                unseen_urls.append(case_url)
+        print(f"Skipping {len(case_urls) - len(unseen_urls)} already scraped cases")
+        for i, case_url in enumerate(tqdm(unseen_urls, desc="Extracting case details")):
             case_data = extract_case_details(driver, case_url)
             if case_data:
                 data.append(case_data)
@@ -178,12 +191,24 @@ def main():
         # Save to CSV
         if data:
             df = pd.DataFrame(data)
-            df.to_csv(OUTPUT_CSV, index=False)
-            print(f"\nSaved {len(data)} cases to {OUTPUT_CSV}")
+            # Append: rows from earlier runs are in the seen index and will not be fetched again
+            new_file = not os.path.exists(OUTPUT_CSV) or os.path.getsize(OUTPUT_CSV) == 0
+            if not new_file:
+                # Keep the existing header's column order
+                df = df.reindex(columns=pd.read_csv(OUTPUT_CSV, nrows=0).columns)
+            with open(OUTPUT_CSV, 'a', encoding='utf-8', newline='') as f:
+                df.to_csv(f, index=False, header=new_file)
+                f.flush()
+                os.fsync(f.fileno())
+            print(f"\nAppended {len(data)} cases to {OUTPUT_CSV}")
+            # Only cases that are safely in the CSV count as scraped
+            for case_data in data:
+                seen_index.record(case_data)
         else:
             print("\nNo cases found. Check the website structure or selectors.")
     finally:
         driver.quit()
+        seen_index.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
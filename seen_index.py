@@ -0,0 +1,135 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+import config
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(1024, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:16], 'little') | 1
+        # Double hashing: k positions from two independent 64-bit hashes
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def content_hash(case_data):
+    """Stable hash of a case's content, used to notice changed rulings"""
+    return hashlib.sha256((case_data.get('content') or '').encode('utf-8')).hexdigest()
+
+
+class SeenEcliIndex:
+    """Persistent cross-run index of ECLIs that have already been scraped
+
+    Backed by SQLite (one row per ECLI with content hash and last-modified
+    time) with an in-memory bloom filter in front, so the common "never seen"
+    answer costs no disk access. Scrapers record cases through PendingSeen,
+    so an ECLI only counts as seen once the output holding it is on disk.
+    """
+
+    def __init__(self, path=None, expected_items=None):
+        self.path = path or os.path.join(config.OUTPUT_DIR, config.SEEN_INDEX_FILE)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "ecli TEXT PRIMARY KEY, content_hash TEXT, last_modified TEXT, scraped_at TEXT)"
+        )
+        self.conn.commit()
+        count = self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self.bloom = BloomFilter(max(expected_items or config.SEEN_INDEX_CAPACITY, count * 2))
+        for (ecli,) in self.conn.execute("SELECT ecli FROM seen"):
+            self.bloom.add(ecli)
+        print(f"[Seen] Loaded index of {count} already scraped ECLIs from {self.path}")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def get(self, ecli_code):
+        """Return (content_hash, last_modified) for a seen ECLI, or None"""
+        if ecli_code not in self.bloom:
+            return None
+        return self.conn.execute(
+            "SELECT content_hash, last_modified FROM seen WHERE ecli = ?", (ecli_code,)
+        ).fetchone()
+
+    def is_fresh(self, ecli_code, last_modified=None):
+        """True if the ECLI was scraped and has not been modified since"""
+        row = self.get(ecli_code)
+        if row is None:
+            return False
+        if last_modified and row[1] and last_modified > row[1]:
+            return False
+        return True
+
+    def record(self, case_data, last_modified=None):
+        """Mark a landed case as seen"""
+        ecli_code = case_data.get('ecli_code')
+        if ecli_code:
+            self.record_many([(ecli_code, content_hash(case_data), last_modified)])
+
+    def record_many(self, entries):
+        """Mark (ecli, content_hash, last_modified) entries as seen in one transaction"""
+        if not entries:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO seen (ecli, content_hash, last_modified, scraped_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(ecli) DO UPDATE SET content_hash = excluded.content_hash, "
+                "last_modified = COALESCE(excluded.last_modified, seen.last_modified), "
+                "scraped_at = excluded.scraped_at",
+                [(ecli_code, digest, last_modified, now) for ecli_code, digest, last_modified in entries]
+            )
+        for ecli_code, _, _ in entries:
+            self.bloom.add(ecli_code)
+
+    def close(self):
+        self.conn.close()
+
+
+class PendingSeen:
+    """Landed cases waiting to be marked seen until the output holding them is durable
+
+    A case that is marked seen before its checkpoint record or output file
+    reaches the disk would be skipped after a crash and lost for good, so
+    entries are only committed to the index by commit(), which callers run
+    after an fsync (see CheckpointLog.on_sync).
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.Lock()
+        self.entries = []
+
+    def add(self, case_data, last_modified=None):
+        ecli_code = case_data.get('ecli_code')
+        if not ecli_code:
+            return
+        with self.lock:
+            self.entries.append((ecli_code, content_hash(case_data), last_modified))
+
+    def commit(self):
+        """Record everything added so far; call only once it is on disk"""
+        with self.lock:
+            entries, self.entries = self.entries, []
+        self.index.record_many(entries)
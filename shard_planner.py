@@ -0,0 +1,187 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import pandas as pd
+import config
+from open_data_feed import OpenDataFeed
+from output_writers import CaseOutputWriters
+
+DATE_FORMAT = "%d-%m-%Y"
+
+
+def _parse(date_str):
+    return datetime.strptime(date_str, DATE_FORMAT)
+
+
+def _format(date):
+    return date.strftime(DATE_FORMAT)
+
+
+def plan_shards(date_from, date_to, count, threshold):
+    """Split [date_from, date_to] into windows of at most `threshold` rulings
+
+    `count(date_from, date_to)` returns the number of rulings in a window.
+    Dense windows are halved recursively; a single day is never split.
+    Returns a list of dicts with date_from, date_to and count, newest first.
+    """
+    total = count(date_from, date_to)
+    start, end = _parse(date_from), _parse(date_to)
+    if total <= threshold or start >= end:
+        if total > threshold:
+            print(f"[Planner] {date_from} alone holds {total} rulings; keeping it as one shard")
+        return [{'date_from': date_from, 'date_to': date_to, 'count': total}]
+    middle = start + (end - start) / 2
+    older = plan_shards(date_from, _format(middle), count, threshold)
+    newer = plan_shards(_format(middle + timedelta(days=1)), date_to, count, threshold)
+    return newer + older
+
+
+class ShardPlanner:
+    """Plan, run and merge a parallel date-range backfill for one subject
+
+    Each shard is an independent MassiveLawScraper run restricted to its own
+    uitspraakdatum window, with its own output directory and progress file
+    under run/shards/. All shards consult and update the shared seen-ECLI
+    index, so cases scraped before are not fetched again. The plan file
+    records which shards are finished so an interrupted backfill only re-runs
+    the unfinished ones.
+    """
+
+    def __init__(self, subject, date_from=None, date_to=None, threshold=None, shard_root=None, output_dir=None):
+        self.subject = subject
+        # Where the merged output goes and whose seen index the shards share
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.seen_index_path = os.path.join(self.output_dir, config.SEEN_INDEX_FILE)
+        self.date_from = date_from or config.FEED_DATE_FROM
+        self.date_to = date_to or _format(datetime.now())
+        self.threshold = threshold or config.SHARD_MAX_CASES
+        self.shard_root = shard_root or os.path.join(self.output_dir, "shards", subject.replace(' ', '_'))
+        self.plan_file = os.path.join(self.shard_root, "plan.json")
+        os.makedirs(self.shard_root, exist_ok=True)
+
+    def count(self, date_from, date_to):
+        feed = OpenDataFeed(self.subject, date_from=date_from, date_to=date_to)
+        try:
+            return feed.count()
+        finally:
+            feed.close()
+
+    def shard_dir(self, shard):
+        return os.path.join(self.shard_root, f"{_parse(shard['date_from']):%Y%m%d}_{_parse(shard['date_to']):%Y%m%d}")
+
+    def load_plan(self):
+        if os.path.exists(self.plan_file):
+            with open(self.plan_file, 'r') as f:
+                plan = json.load(f)
+            if plan.get('date_from') == self.date_from and plan.get('date_to') == self.date_to:
+                return plan
+        return None
+
+    def save_plan(self, plan):
+        tmp_file = self.plan_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(plan, f, indent=2)
+        os.replace(tmp_file, self.plan_file)
+
+    def plan(self):
+        """Load the saved plan for this range or build a new one from feed counts"""
+        plan = self.load_plan()
+        if plan:
+            done = sum(1 for shard in plan['shards'] if shard.get('done'))
+            print(f"[Planner] Resuming plan: {done}/{len(plan['shards'])} shards finished")
+            return plan
+        print(f"[Planner] Splitting {self.date_from} - {self.date_to} into shards of at most {self.threshold} rulings...")
+        shards = plan_shards(self.date_from, self.date_to, self.count, self.threshold)
+        for shard in shards:
+            shard['output_dir'] = self.shard_dir(shard)
+            shard['done'] = False
+        plan = {'subject': self.subject, 'date_from': self.date_from, 'date_to': self.date_to,
+                'threshold': self.threshold, 'shards': shards}
+        self.save_plan(plan)
+        print(f"[Planner] Planned {len(shards)} shards covering {sum(s['count'] for s in shards)} rulings")
+        return plan
+
+    def run(self, parallel=None, scraper_options=None):
+        """Run all unfinished shards in parallel worker processes, then merge"""
+        plan = self.plan()
+        pending = [shard for shard in plan['shards'] if not shard.get('done')]
+        parallel = parallel or config.SHARD_WORKERS
+        print(f"[Planner] Running {len(pending)} shards with {parallel} parallel workers")
+        # Not a multiprocessing.Pool: its daemonic workers could not start browser pools of their own
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            options = dict(scraper_options or {}, seen_index_path=self.seen_index_path)
+            futures = [executor.submit(_run_shard, (self.subject, shard, options)) for shard in pending]
+            for future in as_completed(futures):
+                shard_key, ok = future.result()
+                for shard in plan['shards']:
+                    if (shard['date_from'], shard['date_to']) == shard_key:
+                        shard['done'] = ok
+                self.save_plan(plan)
+                print(f"[Planner] Shard {shard_key[0]} - {shard_key[1]} {'finished' if ok else 'failed'}")
+        return self.merge(plan)
+
+    def merge(self, plan=None):
+        """Combine all shard outputs into one TXT and metadata CSV in the output directory"""
+        plan = plan or self.load_plan() or {'shards': []}
+        frames = []
+        for shard in plan['shards']:
+            for filepath in glob.glob(os.path.join(shard['output_dir'], "cases_metadata_*.csv")):
+                frames.append(pd.read_csv(filepath, dtype=str, keep_default_na=False))
+        if not frames:
+            print("[Merge] No shard output to merge")
+            return None
+        merged = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['ecli_code'], keep='last')
+        writers = CaseOutputWriters(self.output_dir, self.subject)
+        for case in merged.to_dict('records'):
+            writers.write(case)
+        writers.close()
+        print(f"[Merge] Merged {len(merged)} unique cases from {len(frames)} shard files")
+        return merged
+
+
+def _run_shard(job):
+    """Worker process: scrape one date window into its own directory"""
+    from scraper_massive import MassiveLawScraper
+
+    subject, shard, options = job
+    key = (shard['date_from'], shard['date_to'])
+    try:
+        scraper = MassiveLawScraper(subject=subject, date_from=shard['date_from'], date_to=shard['date_to'],
+                                    output_dir=shard['output_dir'], **options)
+        # run() handles its own errors and interrupts; only a completed crawl finishes the shard
+        return key, scraper.run()
+    except Exception as e:
+        print(f"[Error] Shard {key[0]} - {key[1]} failed: {e}")
+        return key, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel date-range backfill for one subject')
+    parser.add_argument('--subject', default=config.CURRENT_LAW, help='Subject to backfill')
+    parser.add_argument('--date-from', help='Oldest uitspraakdatum, DD-MM-YYYY')
+    parser.add_argument('--date-to', help='Newest uitspraakdatum, DD-MM-YYYY')
+    parser.add_argument('--threshold', type=int, default=config.SHARD_MAX_CASES,
+                        help='Maximum number of rulings per shard')
+    parser.add_argument('--parallel', type=int, default=config.SHARD_WORKERS,
+                        help='Number of shards to run at the same time')
+    parser.add_argument('--engine', choices=['selenium', 'http'], default=config.DETAIL_ENGINE,
+                        help='Case detail engine used by every shard')
+    parser.add_argument('--source', choices=['search', 'feed'], default=config.CASE_SOURCE,
+                        help='Case discovery used by every shard')
+    parser.add_argument('--merge-only', action='store_true', help='Only merge existing shard outputs')
+
+    args = parser.parse_args()
+
+    planner = ShardPlanner(args.subject, date_from=args.date_from, date_to=args.date_to,
+                           threshold=args.threshold)
+    if args.merge_only:
+        planner.merge()
+    else:
+        planner.run(parallel=args.parallel, scraper_options={'engine': args.engine, 'source': args.source})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import config
+
+# Synthetic corpus: every case is generated from its index, so runs are reproducible
+COURTS = [
+    ('RBDHA', 'Rechtbank Den Haag'),
+    ('RBAMS', 'Rechtbank Amsterdam'),
+    ('RBROT', 'Rechtbank Rotterdam'),
+    ('RBGEL', 'Rechtbank Gelderland'),
+    ('RVS', 'Raad van State'),
+    ('CRVB', 'Centrale Raad van Beroep'),
+    ('GHARL', 'Gerechtshof Arnhem-Leeuwarden'),
+    ('HR', 'Hoge Raad')
+]
+WORDS = ("de het een van en in op te dat voor met is niet aan bij door uit als zijn worden heeft "
+         "eiser verweerder rechtbank beroep besluit bezwaar verzoek uitspraak staatssecretaris "
+         "vreemdeling verblijfsvergunning asiel aanvraag gronden overwegingen beslissing termijn "
+         "ongegrond gegrond motivering zitting gemachtigde partijen vernietigt bepaalt").split()
+
+_LISTING_JS = """
+document.getElementById('lib-rnl-lib-rnl-laadMeerBtn').addEventListener('click', function () {
+    var button = this;
+    var loaded = document.querySelectorAll('#results .rnl-listresults-item').length;
+    fetch('/resultaat/meer?from=' + loaded).then(function (resp) {
+        if (!resp.ok) { throw new Error(resp.status); }
+        return resp.text();
+    }).then(function (html) {
+        document.getElementById('results').insertAdjacentHTML('beforeend', html);
+        if (document.querySelectorAll('#results .rnl-listresults-item').length >= %(total)d) {
+            button.remove();
+        }
+    }).catch(function () {});
+});
+"""
+
+
+def case_ecli(index):
+    """ECLI code (without 'ECLI:') of the synthetic case `index`"""
+    code, _ = COURTS[index % len(COURTS)]
+    return f"NL:{code}:{2000 + index % 25}:{100000 + index}"
+
+
+def case_index(ecli_code):
+    try:
+        return int(ecli_code.rsplit(':', 1)[1]) - 100000
+    except (IndexError, ValueError):
+        return None
+
+
+def synthetic_case(index, page_kb=None):
+    """Metadata and paragraphs of the synthetic case `index`"""
+    rng = random.Random(index)
+    _, court = COURTS[index % len(COURTS)]
+    ruled = date(2000 + index % 25, 1, 1) + timedelta(days=rng.randrange(360))
+    published = ruled + timedelta(days=rng.randint(1, 60))
+    subjects = [config.LAW_CATEGORIES[index % len(config.LAW_CATEGORIES)]]
+    if rng.random() < 0.3:
+        subjects.append(rng.choice(config.LAW_CATEGORIES))
+    case = {
+        'ecli_code': case_ecli(index),
+        'court': court,
+        'date_uitspraak': ruled.strftime("%d-%m-%Y"),
+        'date_iso': ruled.isoformat(),
+        'date_publicatie': published.strftime("%d-%m-%Y"),
+        'issued_iso': published.isoformat(),
+        'zaaknummer': f"AWB {ruled.year % 100}/{rng.randint(1000, 99999)}",
+        'rechtsgebieden': list(dict.fromkeys(subjects)),
+        'inhoudsindicatie': " ".join(rng.choice(WORDS) for _ in range(30)).capitalize() + ".",
+        'paragraphs': []
+    }
+    # Drawn last, so the metadata does not depend on the page size
+    target = (config.STANDIN_PAGE_KB if page_kb is None else page_kb) * 1024
+    size = 0
+    while size < target:
+        paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))).capitalize() + "."
+        case['paragraphs'].append(paragraph)
+        size += len(paragraph)
+    return case
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.standin
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        routes = {
+            '/resultaat': server.listing_page,
+            '/resultaat/meer': server.listing_more,
+            '/details': server.detail_page,
+            '/uitspraken/zoeken': server.feed_page,
+            '/uitspraken/content': server.content_document
+        }
+        route = routes.get(parsed.path.rstrip('/') or '/')
+        if route is None:
+            self.respond(404, 'text/plain', b'Not found')
+            return
+        server.delay()
+        if server.fails():
+            self.respond(503, 'text/plain', b'Service unavailable', {'Retry-After': '1'})
+            return
+        found = route(query, f"http://{self.headers.get('Host')}")
+        if found is None:
+            self.respond(404, 'text/plain', b'Not found')
+            return
+        content_type, body, etag = found
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.respond(304, content_type, b'', {'ETag': etag})
+            return
+        self.respond(200, content_type, body.encode('utf-8'), {'ETag': etag} if etag else None)
+
+    def respond(self, status, content_type, body, headers=None):
+        self.server.standin.count(status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+class StandInServer:
+    """Local stand-in for uitspraken.rechtspraak.nl and data.rechtspraak.nl
+
+    Serves a synthetic corpus of `cases` rulings as a search listing with a
+    working "Laad meer resultaten" button, rendered detail pages, Atom feed
+    pages and open-data content documents, using the markup the scraper's
+    selectors and parsers expect. Every response waits `latency` seconds
+    (+/- 50%) and fails with a 503 at `error_rate`; detail pages and content
+    documents carry about `page_kb` KB of ruling text.
+    """
+
+    def __init__(self, cases=None, latency=None, error_rate=None, page_kb=None, listing_batch=None,
+                 host='127.0.0.1', port=0, seed=0):
+        self.cases = cases or config.STANDIN_CASES
+        self.latency = config.STANDIN_LATENCY if latency is None else latency
+        self.error_rate = config.STANDIN_ERROR_RATE if error_rate is None else error_rate
+        self.page_kb = config.STANDIN_PAGE_KB if page_kb is None else page_kb
+        self.listing_batch = listing_batch or config.STANDIN_LISTING_BATCH
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.responses = {}
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.standin = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def delay(self):
+        if self.latency:
+            with self.lock:
+                seconds = self.latency * self.rng.uniform(0.5, 1.5)
+            time.sleep(seconds)
+
+    def fails(self):
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+    def count(self, status):
+        with self.lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def case(self, query):
+        ecli_code = (query.get('id') or [''])[0]
+        ecli_code = ecli_code[len('ECLI:'):] if ecli_code.startswith('ECLI:') else ecli_code
+        index = case_index(ecli_code)
+        if index is None or not 0 <= index < self.cases or case_ecli(index) != ecli_code:
+            return None
+        return synthetic_case(index, self.page_kb)
+
+    def listing_cards(self, start, base):
+        cards = []
+        for index in range(start, min(self.cases, start + self.listing_batch)):
+            case = synthetic_case(index, page_kb=0)
+            ecli_code = case['ecli_code']
+            rechtsgebieden = "".join(f'<span class="rechtsgebied">{escape(r)}</span>' for r in case['rechtsgebieden'])
+            cards.append(f"""<div class="rnl-listresults-item">
+  <h3><a href="{base}/details?id=ECLI:{ecli_code}">ECLI:{ecli_code}</a></h3>
+  <div><label>Instantie</label> <span class="rnl-listresults-item-instantie">{escape(case['court'])}</span></div>
+  <div><label>Datum uitspraak</label> <span class="rnl-listresults-item-uitspraakdatum">{case['date_uitspraak']}</span></div>
+  <div><label>Datum publicatie</label> <span class="rnl-listresults-item-publicatiedatum">{case['date_publicatie']}</span></div>
+  <div><label>Rechtsgebieden</label> {rechtsgebieden}</div>
+  <p class="rnl-listresults-item-inhoudsindicatie">{escape(case['inhoudsindicatie'])}</p>
+</div>""")
+        return "\n".join(cards)
+
+    def listing_page(self, query, base):
+        button = ('<button id="lib-rnl-lib-rnl-laadMeerBtn" type="button" class="btn btn-primary">'
+                  'Laad meer resultaten</button>') if self.cases > self.listing_batch else ''
+        body = f"""<!DOCTYPE html>
+<html><head><title>Zoekresultaten - Rechtspraak</title></head>
+<body>
+<div id="results">
+{self.listing_cards(0, base)}
+</div>
+{button}
+<script>{_LISTING_JS % {'total': self.cases}}</script>
+</body></html>"""
+        return 'text/html; charset=utf-8', body, None
+
+    def listing_more(self, query, base):
+        start = int((query.get('from') or ['0'])[0])
+        return 'text/html; charset=utf-8', self.listing_cards(start, base), None
+
+    def detail_page(self, query, base):
+        case = self.case(query)
+        if case is None:
+            return None
+        ecli = f"ECLI:{case['ecli_code']}"
+        rechtsgebieden = "".join(f'<span class="hl0">{escape(r)}</span>' for r in case['rechtsgebieden'])
+        text = "\n".join(f"<p>{escape(paragraph)}</p>" for paragraph in case['paragraphs'])
+        body = f"""<!DOCTYPE html>
+<html><head><title>{ecli}</title></head>
+<body>
+<h2 class="rs-panel-title">{ecli}</h2>
+<div><label>Instantie</label><span>{escape(case['court'])}</span></div>
+<div><label>Datum uitspraak</label><span>{case['date_uitspraak']}</span></div>
+<div><label>Datum publicatie</label><span>{case['date_publicatie']}</span></div>
+<div><label>Zaaknummer</label><span>{case['zaaknummer']}</span></div>
+<div><label>Rechtsgebieden</label><span>{rechtsgebieden}</span></div>
+<div><label>Inhoudsindicatie</label><span>{escape(case['inhoudsindicatie'])}</span></div>
+<div class="rnl-detail-uitspraaktekst printthis ng-star-inserted">
+{text}
+</div>
+</body></html>"""
+        return 'text/html; charset=utf-8', body, f'"{case["ecli_code"]}-{self.page_kb}"'
+
+    def feed_page(self, query, base):
+        start = int((query.get('from') or ['0'])[0])
+        size = int((query.get('max') or [str(config.FEED_PAGE_SIZE)])[0])
+        entries = []
+        for index in range(start, min(self.cases, start + size)):
+            case = synthetic_case(index, page_kb=0)
+            ecli = f"ECLI:{case['ecli_code']}"
+            entries.append(f"""<entry>
+<id>{ecli}</id>
+<title type="text">{ecli}, {escape(case['court'])}, {case['date_uitspraak']}, {case['zaaknummer']}</title>
+<summary type="text">{escape(case['inhoudsindicatie'])}</summary>
+<updated>{case['issued_iso']}T12:00:00+02:00</updated>
+<link rel="alternate" type="text/html" href="{base}/details?id={ecli}"/>
+</entry>""")
+        body = f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title type="text">Rechtspraak.nl - Uitspraken</title>
+<subtitle type="text">Aantal gevonden ECLI's: {self.cases}</subtitle>
+<id>{base}/uitspraken/zoeken</id>
+<updated>{date.today().isoformat()}T00:00:00+02:00</updated>
+{"".join(entries)}
+</feed>"""
+        return 'application/atom+xml; charset=utf-8', body, None
+
+    def content_document(self, query, base):
+        case = self.case(query)
+        if case is None:
+            return None
+        paragraphs = "".join(f"<para>{escape(paragraph)}</para>" for paragraph in case['paragraphs'])
+        body = f"""<?xml version="1.0" encoding="utf-8"?>
+<open-rechtspraak xmlns="http://www.rechtspraak.nl/schema/rechtspraak-1.0"
+    xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dcterms="http://purl.org/dc/terms/">
+<rdf:RDF>
+<rdf:Description>
+<dcterms:identifier>ECLI:{case['ecli_code']}</dcterms:identifier>
+<dcterms:creator>{escape(case['court'])}</dcterms:creator>
+<dcterms:date>{case['date_iso']}</dcterms:date>
+<dcterms:issued>{case['issued_iso']}</dcterms:issued>
+<dcterms:subject>{escape('; '.join(case['rechtsgebieden']))}</dcterms:subject>
+</rdf:Description>
+</rdf:RDF>
+<inhoudsindicatie><para>{escape(case['inhoudsindicatie'])}</para></inhoudsindicatie>
+<uitspraak>{paragraphs}</uitspraak>
+</open-rechtspraak>"""
+        return 'application/xml; charset=utf-8', body, f'"{case["ecli_code"]}-{self.page_kb}"'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Rechtspraak website and open-data API')
+    parser.add_argument('--port', type=int, default=config.STANDIN_PORT)
+    parser.add_argument('--cases', type=int, default=config.STANDIN_CASES, help='Number of synthetic rulings')
+    parser.add_argument('--latency', type=float, default=config.STANDIN_LATENCY,
+                        help='Mean response delay in seconds (+/- 50%%)')
+    parser.add_argument('--error-rate', type=float, default=config.STANDIN_ERROR_RATE,
+                        help='Fraction of requests answered with a 503')
+    parser.add_argument('--page-kb', type=int, default=config.STANDIN_PAGE_KB,
+                        help='Approximate ruling text per detail page / content document, in KB')
+    parser.add_argument('--listing-batch', type=int, default=config.STANDIN_LISTING_BATCH,
+                        help="Cards added per 'Laad meer resultaten' click")
+
+    args = parser.parse_args()
+
+    server = StandInServer(cases=args.cases, latency=args.latency, error_rate=args.error_rate,
+                           page_kb=args.page_kb, listing_batch=args.listing_batch, port=args.port).start()
+    print(f"[Stand-in] Serving {server.cases} synthetic rulings at {server.url}")
+    print(f"[Stand-in] Listing:  {server.url}/resultaat")
+    print(f"[Stand-in] Feed:     {server.url}/uitspraken/zoeken")
+    print(f"[Stand-in] Document: {server.url}/uitspraken/content?id=ECLI:{case_ecli(0)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n[Stand-in] Responses by status: {server.responses}")
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
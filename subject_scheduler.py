@@ -0,0 +1,164 @@
+import argparse
+import os
+import config
+from case_parsers import ecli_from_url, subject_matches
+from open_data_feed import OpenDataFeed
+from output_writers import CaseOutputWriters
+
+
+def case_subjects(case_data, subjects):
+    """The requested subjects a case belongs to, judged by its own rechtsgebieden
+
+    Uses the same substring rule as the single-subject filter, so 'Strafrecht'
+    also routes a case labelled 'Internationaal strafrecht'.
+    """
+    rechtsgebieden = [r.strip() for r in (case_data.get('rechtsgebieden') or '').split(',') if r.strip()]
+    return {subject for subject in subjects if subject_matches(subject, rechtsgebieden)}
+
+
+class SubjectScheduler:
+    """Crawl several law categories in one job, fetching every ruling once
+
+    The open-data feed of each subject is paged in turn; an ECLI that was
+    already fetched for an earlier subject is not fetched again. Each fetched
+    case is routed to the output files of every requested subject it carries
+    (plus the subject whose feed listed it), instead of being thrown away by
+    a single-subject filter.
+    """
+
+    def __init__(self, subjects=None, date_from=None, date_to=None, engine=None, workers=None,
+                 output_dir=None, skip_seen=None, parquet=None, archive=None):
+        from scraper_massive import MassiveLawScraper
+
+        self.subjects = list(subjects or config.LAW_CATEGORIES)
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        # No subject: the fetch engine keeps every case and routing decides where it goes
+        self.scraper = MassiveLawScraper(subject=None, engine=engine or 'http', workers=workers, source='feed',
+                                         date_from=date_from, date_to=date_to, output_dir=self.output_dir,
+                                         skip_seen=skip_seen, archive=archive)
+        self.parquet = config.PARQUET_OUTPUT if parquet is None else parquet
+        self.writers = {}
+        self.parquet_writer = None
+        self.fetched = set()
+        self.routed = 0
+
+    def writers_for(self, subject):
+        if subject not in self.writers:
+            self.writers[subject] = CaseOutputWriters(self.output_dir, subject)
+        return self.writers[subject]
+
+    def setup(self):
+        scraper = self.scraper
+        if scraper.skip_seen:
+            scraper.open_seen_index(os.path.join(self.output_dir, config.SEEN_INDEX_FILE))
+        if scraper.engine == 'http':
+            scraper.setup_http_engine()
+        elif scraper.workers > 1:
+            scraper.setup_browser_pool()
+        else:
+            scraper.setup_driver()
+        if self.parquet:
+            from parquet_sink import ParquetCaseWriter
+            # One dataset for the job: a case is stored once, however many subjects it has
+            self.parquet_writer = ParquetCaseWriter(os.path.join(self.output_dir, config.PARQUET_DIR))
+
+    def route(self, case_data, listed_subject):
+        subjects = case_subjects(case_data, self.subjects) | {listed_subject}
+        for subject in subjects:
+            self.writers_for(subject).write(case_data)
+        if self.parquet_writer:
+            self.parquet_writer.write(case_data)
+        self.routed += len(subjects)
+        return subjects
+
+    def crawl_subject(self, subject):
+        scraper = self.scraper
+        feed = OpenDataFeed(subject, date_from=scraper.date_from, date_to=scraper.date_to,
+                            user_agent=scraper.ua.random, cache=scraper.page_cache, archive=scraper.archive)
+        try:
+            for page, entries in enumerate(feed.iter_pages(), 1):
+                urls = []
+                for entry in entries:
+                    if entry['ecli_code'] in self.fetched:
+                        continue
+                    scraper.last_modified[entry['url']] = entry['last_modified']
+                    urls.append(entry['url'])
+                print(f"[{subject}] Feed page {page}: {len(entries)} rulings, "
+                      f"{len(entries) - len(urls)} already fetched for another subject")
+                for case_url, case_data in scraper.extract_cases(urls):
+                    if not case_data:
+                        # Left out of fetched so a later subject's feed can retry it
+                        print(f"[{subject}] Failed to extract case data: {case_url}")
+                        continue
+                    self.fetched.add(ecli_from_url(case_url))
+                    # Recorded in the seen index once the output files are closed
+                    scraper.mark_seen(case_url, case_data)
+                    scraper.cases_found += 1
+                    subjects = self.route(case_data, subject)
+                    print(f"[{subject}] Case {scraper.cases_found} routed to: {', '.join(sorted(subjects))}")
+        finally:
+            feed.close()
+
+    def run(self):
+        print(f"[Scheduler] Crawling {len(self.subjects)} subjects with the '{self.scraper.engine}' engine")
+        try:
+            self.setup()
+            for subject in self.subjects:
+                self.crawl_subject(subject)
+            print(f"[Complete] {len(self.fetched)} rulings fetched once, {self.routed} subject rows written")
+        except KeyboardInterrupt:
+            print("\n[Interrupt] Scheduler interrupted by user")
+        finally:
+            scraper = self.scraper
+            try:
+                error = None
+                for writers in list(self.writers.values()) + [self.parquet_writer]:
+                    try:
+                        if writers:
+                            writers.close()
+                    except Exception as e:
+                        error = error or e
+                if error:
+                    # A case can be in any subject's files; none is marked seen
+                    raise error
+                scraper.commit_seen()
+            finally:
+                self.release(scraper)
+
+    def release(self, scraper):
+        """Quit the browsers and close the clients and indexes of the shared scraper"""
+        if scraper.driver:
+            scraper.driver.quit()
+        if scraper.browser_pool:
+            scraper.browser_pool.close()
+        if scraper.seen_index:
+            scraper.seen_index.close()
+        if scraper.archive:
+            scraper.archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl several law categories in one job')
+    parser.add_argument('--subjects', nargs='+', help='Subjects to crawl (default: all LAW_CATEGORIES)')
+    parser.add_argument('--date-from', help='Oldest uitspraakdatum, DD-MM-YYYY')
+    parser.add_argument('--date-to', help='Newest uitspraakdatum, DD-MM-YYYY')
+    parser.add_argument('--engine', choices=['selenium', 'http'], default='http',
+                        help='Case detail engine')
+    parser.add_argument('--workers', type=int, default=config.BROWSER_WORKERS,
+                        help='Number of headless Chrome worker processes (selenium engine)')
+    parser.add_argument('--rescrape', action='store_true',
+                        help='Fetch cases again even if their ECLI is in the seen index')
+    parser.add_argument('--parquet', action='store_true', default=config.PARQUET_OUTPUT,
+                        help='Also write cases to a partitioned Parquet dataset (needs pyarrow)')
+    parser.add_argument('--archive', action='store_true', default=config.WARC_ARCHIVE,
+                        help='Keep every fetched document in rolling WARC files for offline re-extraction')
+
+    args = parser.parse_args()
+
+    SubjectScheduler(args.subjects, date_from=args.date_from, date_to=args.date_to, engine=args.engine,
+                     workers=args.workers, skip_seen=not args.rescrape and config.SKIP_SEEN,
+                     parquet=args.parquet, archive=args.archive).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import pandas as pd
+from case_index import row_hash
+from case_store import SqliteCaseStore, match_query
+from output_writers import CASE_FIELDS
+
+
+def frame(*cases):
+    return pd.DataFrame([dict(dict.fromkeys(CASE_FIELDS, ''), **case) for case in cases], columns=CASE_FIELDS)
+
+
+def upsert(store, *cases, source='test'):
+    df = frame(*cases)
+    hashes = [row_hash(values) for values in df.itertuples(index=False, name=None)]
+    store.upsert(df, hashes, source)
+    return dict(zip(df['ecli_code'], hashes))
+
+
+ASYLUM = {'ecli_code': 'NL:RVS:2025:2758', 'title': 'Hoger beroep asiel', 'court': 'Raad van State',
+          'date': '19-06-2025', 'content': 'De vreemdeling heeft een asielaanvraag ingediend.',
+          'rechtsgebieden': 'Vreemdelingenrecht'}
+DETENTION = {'ecli_code': 'NL:RBAMS:2025:8003', 'title': 'Bewaring', 'court': 'Rechtbank Amsterdam',
+             'date': '18-07-2025', 'content': 'De maatregel van bewaring wordt opgeheven.',
+             'rechtsgebieden': 'Vreemdelingenrecht, Bestuursrecht'}
+
+
+def test_upsert_inserts_and_replaces_by_ecli(tmp_path):
+    store = SqliteCaseStore(str(tmp_path / 'cases.sqlite'))
+    hashes = upsert(store, ASYLUM, DETENTION)
+    assert len(store) == 2
+    assert store.lookup(['NL:RVS:2025:2758', 'NL:HR:2025:1']) == {'NL:RVS:2025:2758': hashes['NL:RVS:2025:2758']}
+
+    changed = dict(DETENTION, content='De maatregel van bewaring blijft in stand.', rechtsgebieden='Strafrecht')
+    new_hashes = upsert(store, changed)
+    assert len(store) == 2
+    assert store.get('NL:RBAMS:2025:8003')['content'] == changed['content']
+    assert store.lookup(['NL:RBAMS:2025:8003']) == new_hashes
+    # The rechtsgebieden of a replaced case are replaced too
+    assert store.search('bewaring', rechtsgebied='Bestuursrecht') == []
+    assert [hit['ecli_code'] for hit in store.search('bewaring', rechtsgebied='strafrecht')] == ['NL:RBAMS:2025:8003']
+    store.close()
+
+
+def test_fts_index_follows_updates(tmp_path):
+    store = SqliteCaseStore(str(tmp_path / 'cases.sqlite'))
+    upsert(store, ASYLUM, DETENTION)
+    assert [hit['ecli_code'] for hit in store.search('asielaanvraag')] == ['NL:RVS:2025:2758']
+
+    upsert(store, dict(ASYLUM, content='De vreemdeling is uitgezet.'))
+    # The old text is gone from the index, the new text is found
+    assert store.search('asielaanvraag') == []
+    assert [hit['ecli_code'] for hit in store.search('uitgezet')] == ['NL:RVS:2025:2758']
+    # Title and diacritics-insensitive matching
+    assert [hit['ecli_code'] for hit in store.search('hoger beroep')] == ['NL:RVS:2025:2758']
+    assert [hit['ecli_code'] for hit in store.search('opgeheven')] == ['NL:RBAMS:2025:8003']
+    store.close()
+
+
+def test_search_filters(tmp_path):
+    store = SqliteCaseStore(str(tmp_path / 'cases.sqlite'))
+    upsert(store, ASYLUM, DETENTION)
+    assert [hit['ecli_code'] for hit in store.search('de', court='Raad van State')] == ['NL:RVS:2025:2758']
+    assert [hit['ecli_code'] for hit in store.search('de', date_from='01-07-2025')] == ['NL:RBAMS:2025:8003']
+    assert [hit['ecli_code'] for hit in store.search('de', date_to='30-06-2025')] == ['NL:RVS:2025:2758']
+    assert store.date_range() == ('2025-06-19', '2025-07-18')
+    assert store.court_counts() == {'Raad van State': 1, 'Rechtbank Amsterdam': 1}
+    store.close()
+
+
+def test_match_query_ignores_punctuation():
+    assert match_query('art. 8 EVRM "gezinsleven"') == '"art" "8" "EVRM" "gezinsleven"'
+    assert match_query('?!') == ''
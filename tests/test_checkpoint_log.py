@@ -0,0 +1,96 @@
+import json
+from checkpoint_log import CheckpointLog
+
+
+def case(ecli):
+    return {'ecli_code': ecli, 'title': f"ECLI:{ecli}", 'content': 'Uitspraak ' * 50}
+
+
+def records(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_replay_restores_finished_cases_and_pending_urls(tmp_path):
+    path = tmp_path / 'checkpoint.log'
+    log = CheckpointLog(str(path))
+    for url in ['a', 'b', 'c', 'd']:
+        log.url_harvested(url, page=1)
+    log.case_done('a', case('NL:RBDHA:2025:1'))
+    log.case_skipped('b')
+    log.case_dead('c')
+    log.page_done(1)
+    log.close()
+
+    resumed = CheckpointLog(str(path))
+    # Only the URLs of finished cases are kept in memory ...
+    assert resumed.done == {'a'}
+    assert resumed.pending() == ['d']
+    assert all(resumed.is_done(url) for url in ['a', 'b', 'c'])
+    assert resumed.pages_done == {1}
+    # ... the cases themselves are read back from the log
+    assert list(resumed.restored_cases()) == [('a', case('NL:RBDHA:2025:1'))]
+    resumed.close()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'checkpoint.log'
+    log = CheckpointLog(str(path))
+    log.url_harvested('a', page=1)
+    log.case_done('a', case('NL:RBDHA:2025:1'))
+    log.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "case", "url": "b", "ca')
+
+    resumed = CheckpointLog(str(path))
+    assert resumed.done == {'a'}
+    assert [url for url, _ in resumed.restored_cases()] == ['a']
+    resumed.close()
+
+
+def test_records_are_synced_in_batches(tmp_path):
+    path = tmp_path / 'checkpoint.log'
+    synced = []
+    log = CheckpointLog(str(path), sync_every=3, sync_interval=3600, on_sync=lambda: synced.append(True))
+    log.url_harvested('a')
+    log.url_harvested('b')
+    assert path.read_text() == '' and not synced
+    log.url_harvested('c')
+    assert len(records(path)) == 3 and len(synced) == 1
+    log.close()
+
+
+def test_settle_keeps_only_unfinished_work(tmp_path):
+    path = tmp_path / 'checkpoint.log'
+    log = CheckpointLog(str(path))
+    for url in ['a', 'b', 'c', 'd']:
+        log.url_harvested(url, page=2)
+    log.case_done('a', case('NL:RBDHA:2025:1'))
+    log.case_skipped('b')
+    log.case_dead('c')
+    log.page_done(1)
+    log.settle()
+    log.close()
+
+    assert records(path) == [
+        {'type': 'url', 'url': 'd', 'page': 2},
+        {'type': 'skip', 'url': 'b'},
+        {'type': 'page', 'page': 1},
+    ]
+    resumed = CheckpointLog(str(path))
+    # Settled cases are in the output files already and are not written again
+    assert not resumed.done and list(resumed.restored_cases()) == []
+    assert resumed.pending() == ['d']
+    assert resumed.is_done('b')
+    resumed.close()
+
+
+def test_reset_starts_an_empty_log(tmp_path):
+    path = tmp_path / 'checkpoint.log'
+    log = CheckpointLog(str(path))
+    log.url_harvested('a', page=1)
+    log.case_done('a', case('NL:RBDHA:2025:1'))
+    log.reset()
+    log.close()
+    assert path.read_text() == ''
+    assert not CheckpointLog(str(path)).harvested
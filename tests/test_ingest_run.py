@@ -0,0 +1,82 @@
+import os
+import pandas as pd
+import pytest
+import ingest_run
+from ingest_run import ingest_run_dir, source_files
+from memory_bank import LawCaseMemoryBank
+from output_writers import CASE_FIELDS
+
+
+def write_csv(path, *cases):
+    pd.DataFrame([dict(dict.fromkeys(CASE_FIELDS, ''), **case) for case in cases], columns=CASE_FIELDS) \
+        .to_csv(path, index=False)
+
+
+def case(ecli, content='Uitspraak'):
+    return {'ecli_code': ecli, 'title': f"ECLI:{ecli}", 'court': 'Rechtbank Den Haag', 'date': '09-07-2025',
+            'content': content, 'rechtsgebieden': 'Vreemdelingenrecht'}
+
+
+@pytest.fixture(params=['csv', 'sqlite'])
+def bank(request, tmp_path):
+    memory_bank = LawCaseMemoryBank(str(tmp_path / 'memory_bank'), backend=request.param)
+    yield memory_bank
+    if memory_bank.store is not None:
+        memory_bank.store.close()
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    path = tmp_path / 'run'
+    path.mkdir()
+    return path
+
+
+def test_only_new_or_changed_rows_are_appended(bank, run_dir):
+    first = run_dir / 'cases_metadata_Vreemdelingenrecht_20250709_20250709.csv'
+    write_csv(first, case('NL:RBDHA:2025:1'), case('NL:RBDHA:2025:2'))
+    assert ingest_run_dir(bank, str(run_dir)) == 2
+    consumed = bank.metadata['consumed_files'][os.path.normpath(str(first))]
+    assert consumed['rows'] == 2 and consumed['new_rows'] == 2
+
+    # A second file repeats one case unchanged and changes another
+    second = run_dir / 'cases_metadata_Vreemdelingenrecht_20250709_20250709_2.csv'
+    write_csv(second, case('NL:RBDHA:2025:1'), case('NL:RBDHA:2025:2', content='Gewijzigd'), case('NL:RBDHA:2025:3'))
+    assert ingest_run_dir(bank, str(run_dir)) == 2
+    assert bank.case_count() == 3
+    assert bank.get_case_by_ecli('NL:RBDHA:2025:2')['content'] == 'Gewijzigd'
+
+
+def test_consumed_files_are_not_read_again(bank, run_dir, monkeypatch):
+    path = run_dir / 'cases_metadata_Vreemdelingenrecht_20250709_20250709.csv'
+    write_csv(path, case('NL:RBDHA:2025:1'))
+    ingest_run_dir(bank, str(run_dir))
+
+    read = []
+
+    def ingest_file(memory_bank, path, chunk_rows):
+        read.append(path)
+        return 0, []
+
+    monkeypatch.setattr(ingest_run, 'ingest_file', ingest_file)
+    assert ingest_run_dir(bank, str(run_dir)) == 0
+    # Touched but unchanged: hashed, not ingested, and its entry refreshed
+    os.utime(path, (1, 1))
+    assert ingest_run_dir(bank, str(run_dir)) == 0
+    assert read == []
+    assert bank.metadata['consumed_files'][os.path.normpath(str(path))]['mtime'] == 1
+
+    # Reopened banks remember what was consumed
+    reopened = LawCaseMemoryBank(bank.data_dir, backend=bank.backend)
+    assert ingest_run_dir(reopened, str(run_dir)) == 0
+    assert read == []
+    if reopened.store is not None:
+        reopened.store.close()
+
+
+def test_unfinished_files_are_skipped(run_dir):
+    write_csv(run_dir / 'cases_metadata_Vreemdelingenrecht_inprogress_20250709120000_42.csv', case('NL:RBDHA:2025:1'))
+    write_csv(run_dir / 'cases_metadata_Vreemdelingenrecht_20250709_20250709.csv', case('NL:RBDHA:2025:2'))
+    assert [os.path.basename(path) for path in source_files(str(run_dir))] == [
+        'cases_metadata_Vreemdelingenrecht_20250709_20250709.csv'
+    ]
@@ -0,0 +1,141 @@
+import os
+from datetime import datetime
+import httpx
+import pytest
+from lxml import etree
+import config
+from case_parsers import details_url
+from open_data_feed import OpenDataFeed, parse_feed, to_iso_date
+from standin_server import StandInServer, case_ecli
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def recorded_feed(pages, **kwargs):
+    """OpenDataFeed whose requests are answered with fixture files; returns (feed, requests)"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=fixture(pages[len(requests) - 1]))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return OpenDataFeed('Vreemdelingenrecht', client=client, **kwargs), requests
+
+
+@pytest.fixture
+def standin():
+    server = StandInServer(cases=25, latency=0, error_rate=0).start()
+    yield server
+    server.close()
+
+
+def test_parse_feed_reads_total_and_entries():
+    total, entries = parse_feed(fixture('feed_page.xml'))
+    assert total == 3
+    assert [entry['ecli_code'] for entry in entries] == [
+        'NL:RBDHA:2025:12001', 'NL:RVS:2025:3002', 'NL:RBAMS:2025:8003'
+    ]
+    first = entries[0]
+    assert first['url'] == details_url('NL:RBDHA:2025:12001')
+    assert first['last_modified'] == '2025-07-18T08:30:00+02:00'
+    assert first['title'].startswith('ECLI:NL:RBDHA:2025:12001, Rechtbank Den Haag')
+    # Whitespace in summaries is collapsed
+    assert entries[1]['summary'] == 'Hoger beroep vreemdelingenbewaring; opheffing maatregel.'
+
+
+def test_parse_feed_skips_malformed_entries():
+    total, entries = parse_feed(fixture('feed_malformed.xml'))
+    # No number in the subtitle: the total is unknown rather than wrong
+    assert total is None
+    # Entries without an ECLI id, and entries outside the Atom namespace, are dropped
+    assert [entry['ecli_code'] for entry in entries] == ['NL:RBROT:2025:4004', 'NL:CRVB:2025:6006']
+    bare = entries[0]
+    assert bare['last_modified'] == '' and bare['title'] == '' and bare['summary'] == ''
+    assert entries[1]['summary'] == ''
+
+
+def test_parse_feed_rejects_broken_xml():
+    with pytest.raises(etree.XMLSyntaxError):
+        parse_feed(fixture('feed_page.xml')[:-40])
+
+
+def test_date_range_is_sent_inclusive_as_iso_dates():
+    feed, requests = recorded_feed(['feed_page.xml'], date_from='01-07-2025', date_to='31-07-2025',
+                                   page_size=3)
+    feed.fetch_page(0)
+    params = requests[0].url.params
+    assert params.get_list('date') == ['2025-07-01', '2025-07-31']
+    assert params['subject'] == config.RECHTSGEBIED_URIS['Vreemdelingenrecht']
+    assert params['max'] == '3' and params['from'] == '0'
+
+
+def test_date_range_defaults_to_full_history_until_today():
+    feed, requests = recorded_feed(['feed_page.xml'])
+    feed.fetch_page(0)
+    assert requests[0].url.params.get_list('date') == [
+        to_iso_date(config.FEED_DATE_FROM), datetime.now().strftime('%Y-%m-%d')
+    ]
+
+
+def test_single_day_range_and_invalid_dates():
+    feed, requests = recorded_feed(['feed_page.xml'], date_from='29-02-2024', date_to='29-02-2024')
+    feed.fetch_page(0)
+    assert requests[0].url.params.get_list('date') == ['2024-02-29', '2024-02-29']
+    feed, requests = recorded_feed(['feed_page.xml'], date_from='29-02-2025')
+    with pytest.raises(ValueError):
+        feed.fetch_page(0)
+    assert not requests
+
+
+def test_unknown_subject_is_rejected_before_any_request():
+    feed, requests = recorded_feed(['feed_page.xml'])
+    feed.subject = 'Sterrenkunde'
+    with pytest.raises(ValueError):
+        feed.fetch_page(0)
+    assert not requests
+
+
+def test_paging_offsets_follow_the_page_size():
+    feed, requests = recorded_feed(['feed_page.xml', 'feed_page.xml', 'feed_empty.xml'], page_size=3)
+    pages = list(feed.iter_pages())
+    assert [len(page) for page in pages] == [3, 3]
+    # A full page may not be the last one; only the empty page ends the feed
+    assert [request.url.params['from'] for request in requests] == ['0', '3', '6']
+
+
+def test_paging_stops_on_a_short_page_against_standin(standin):
+    feed = OpenDataFeed('Vreemdelingenrecht', page_size=10, base_url=standin.url)
+    try:
+        pages = list(feed.iter_pages())
+    finally:
+        feed.close()
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [entry['ecli_code'] for page in pages for entry in page] == [case_ecli(i) for i in range(25)]
+    assert feed.total == 25
+    assert standin.responses == {200: 3}
+
+
+def test_paging_resumes_from_a_start_page_against_standin(standin):
+    feed = OpenDataFeed('Vreemdelingenrecht', page_size=10, base_url=standin.url)
+    try:
+        pages = list(feed.iter_pages(start_page=3))
+        assert feed.count() == 25
+    finally:
+        feed.close()
+    assert [entry['ecli_code'] for page in pages for entry in page] == [case_ecli(i) for i in range(20, 25)]
+
+
+def test_server_errors_are_raised(standin):
+    standin.error_rate = 1.0
+    feed = OpenDataFeed('Vreemdelingenrecht', page_size=10, base_url=standin.url)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            feed.page(1)
+    finally:
+        feed.close()
@@ -0,0 +1,86 @@
+import csv
+import os
+import pytest
+import output_writers
+from output_writers import (CaseOutputWriters, CsvCaseWriter, TxtCaseWriter, format_case_txt,
+                            remove_inprogress_files)
+
+
+def case(ecli, date):
+    return {'ecli_code': ecli, 'title': f"ECLI:{ecli}", 'court': 'Rechtbank Den Haag', 'date': date,
+            'content': 'Uitspraak', 'url': f"https://uitspraken.rechtspraak.nl/details?id=ECLI:{ecli}",
+            'rechtsgebieden': 'Vreemdelingenrecht'}
+
+
+class FailingCsvWriter(CsvCaseWriter):
+    def write_case(self, case):
+        if case['ecli_code'].endswith(':2'):
+            raise OSError("No space left on device")
+        super().write_case(case)
+
+
+def test_close_publishes_under_the_date_range(tmp_path):
+    writer = TxtCaseWriter(str(tmp_path), 'Vreemdelingenrecht')
+    cases = [case('NL:RBDHA:2025:1', '09-07-2025'), case('NL:RBDHA:2025:2', '01-07-2025')]
+    for c in cases:
+        writer.write(c)
+    path = writer.close()
+    assert os.path.basename(path) == 'all_cases_Vreemdelingenrecht_20250701_20250709.txt'
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == ''.join(format_case_txt(c) for c in cases)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    # Closing again does nothing
+    assert writer.close() is None
+
+
+def test_existing_output_is_never_overwritten(tmp_path):
+    paths = []
+    for _ in range(2):
+        writer = CsvCaseWriter(str(tmp_path), 'Vreemdelingenrecht')
+        writer.write(case('NL:RBDHA:2025:1', '09-07-2025'))
+        paths.append(os.path.basename(writer.close()))
+    assert paths == ['cases_metadata_Vreemdelingenrecht_20250709_20250709.csv',
+                     'cases_metadata_Vreemdelingenrecht_20250709_20250709_2.csv']
+    with open(tmp_path / paths[0], encoding='utf-8', newline='') as f:
+        assert [row['ecli_code'] for row in csv.DictReader(f)] == ['NL:RBDHA:2025:1']
+
+
+def test_empty_writer_leaves_no_file(tmp_path):
+    writer = TxtCaseWriter(str(tmp_path), 'Vreemdelingenrecht')
+    assert writer.close() is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_error_is_raised_and_nothing_is_published(tmp_path):
+    writer = FailingCsvWriter(str(tmp_path), 'Vreemdelingenrecht')
+    writer.write(case('NL:RBDHA:2025:1', '09-07-2025'))
+    writer.write(case('NL:RBDHA:2025:2', '09-07-2025'))
+    with pytest.raises(RuntimeError, match="No space left on device"):
+        writer.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_one_failing_writer_discards_the_whole_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_writers, 'CsvCaseWriter', FailingCsvWriter)
+    writers = CaseOutputWriters(str(tmp_path), 'Vreemdelingenrecht')
+    writers.write(case('NL:RBDHA:2025:1', '09-07-2025'))
+    writers.write(case('NL:RBDHA:2025:2', '09-07-2025'))
+    with pytest.raises(RuntimeError):
+        writers.close()
+    # The TXT file was fine, but its cases stay pending together with the CSV's
+    assert os.listdir(tmp_path) == []
+
+
+def test_remove_inprogress_files_keeps_published_output(tmp_path):
+    published = TxtCaseWriter(str(tmp_path), 'Vreemdelingenrecht')
+    published.write(case('NL:RBDHA:2025:1', '09-07-2025'))
+    published_path = published.close()
+    # A crashed run's writer is never closed
+    crashed = CsvCaseWriter(str(tmp_path), 'Vreemdelingenrecht')
+    crashed.write(case('NL:RBDHA:2025:2', '09-07-2025'))
+    crashed.cases.put(output_writers.CLOSE)
+    crashed.thread.join()
+    crashed.file.close()
+
+    assert remove_inprogress_files(str(tmp_path)) == 1
+    assert os.listdir(tmp_path) == [os.path.basename(published_path)]
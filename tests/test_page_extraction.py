@@ -0,0 +1,46 @@
+import json
+from page_extraction import InPageExtractor
+
+
+class StubDriver:
+    """Answers the extraction script with the given field -> selector matches"""
+
+    def __init__(self, matched):
+        self.matched = matched
+
+    def execute_script(self, script, spec):
+        return json.dumps({'fields': {field: 'tekst' for field in self.matched}, 'matched': self.matched})
+
+
+def test_fallback_is_promoted_after_consecutive_wins():
+    extractor = InPageExtractor('detail', promote_after=3)
+    driver = StubDriver({'title': '.title'})
+
+    for _ in range(2):
+        extractor.extract(driver)
+    assert extractor.fields['title'][0] == 'h2.rs-panel-title'
+
+    extractor.extract(driver)
+    assert extractor.fields['title'] == ['.title', 'h2.rs-panel-title', 'h1', '.case-title']
+
+
+def test_streak_resets_when_an_earlier_selector_wins():
+    extractor = InPageExtractor('detail', promote_after=2)
+
+    extractor.extract(StubDriver({'title': '.title'}))
+    extractor.extract(StubDriver({'title': 'h2.rs-panel-title'}))
+    extractor.extract(StubDriver({'title': '.title'}))
+    assert extractor.fields['title'][0] == 'h2.rs-panel-title'
+
+    extractor.extract(StubDriver({'content': 'body', 'title': '.title'}))
+    assert extractor.fields['title'][0] == '.title'
+    assert 'body' not in extractor.fields['content']
+
+
+def test_promotion_can_be_disabled():
+    extractor = InPageExtractor('detail', promote_after=0)
+    driver = StubDriver({'title': '.title'})
+
+    for _ in range(5):
+        extractor.extract(driver)
+    assert extractor.fields['title'][0] == 'h2.rs-panel-title'
@@ -0,0 +1,126 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+import config
+from proxy_pool import NoProxyAvailable, ProxyPool
+
+# Never resolved: a request only succeeds if it went through one of the stub proxies
+TEST_URL = "http://rechtspraak.invalid/"
+
+
+class _StubProxyHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        proxy = self.server.stub
+        with proxy.lock:
+            proxy.requests.append(self.path)
+        status, body = (200, b"<title>Rechtspraak</title>") if proxy.healthy else (502, b"Bad Gateway")
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubProxy:
+    """Local forward proxy that answers every request itself and records it"""
+
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubProxyHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stubs():
+    proxies = {'good': StubProxy(), 'bad': StubProxy(healthy=False)}
+    yield proxies
+    for proxy in proxies.values():
+        proxy.close()
+
+
+def pool_of(*proxies, **kwargs):
+    kwargs.setdefault('wait_timeout', 0)
+    return ProxyPool([proxy.url for proxy in proxies], test_url=TEST_URL, timeout=2, **kwargs)
+
+
+def quarantine(pool, proxy):
+    for _ in range(config.PROXY_FAILURE_THRESHOLD):
+        pool.report(proxy, ok=False)
+
+
+def test_validate_keeps_only_proxies_that_answer(stubs):
+    pool = pool_of(stubs['good'], stubs['bad'])
+    assert pool.validate() == [stubs['good'].url]
+    assert stubs['good'].requests == [TEST_URL]
+    assert stubs['bad'].requests == [TEST_URL]
+    assert pool.is_quarantined(stubs['bad'].url)
+    assert pool.acquire() == stubs['good'].url
+
+
+def test_requests_go_through_the_acquired_proxy(stubs):
+    pool = pool_of(stubs['good'])
+    proxy = pool.acquire()
+    with httpx.Client(proxy=proxy) as client:
+        assert client.get(TEST_URL).status_code == 200
+    assert stubs['good'].requests == [TEST_URL]
+
+
+def test_all_quarantined_raises_instead_of_going_direct(stubs):
+    pool = pool_of(stubs['bad'])
+    pool.validate()
+    with pytest.raises(NoProxyAvailable):
+        pool.acquire()
+
+
+def test_quarantined_by_reports_raises(stubs):
+    pool = pool_of(stubs['good'], stubs['bad'])
+    quarantine(pool, stubs['good'].url)
+    quarantine(pool, stubs['bad'].url)
+    with pytest.raises(NoProxyAvailable):
+        pool.acquire()
+    # Nothing was requested directly or otherwise
+    assert not stubs['good'].requests and not stubs['bad'].requests
+
+
+def test_direct_connection_only_when_allowed(stubs):
+    pool = pool_of(stubs['bad'], allow_direct=True)
+    pool.validate()
+    assert pool.acquire() is None
+
+
+def test_acquire_waits_for_a_trial_request(stubs, monkeypatch):
+    monkeypatch.setattr(config, 'PROXY_QUARANTINE', 0.3)
+    pool = pool_of(stubs['bad'], wait_timeout=5)
+    pool.validate()
+    start = time.monotonic()
+    # The quarantine ends while acquire() waits; the proxy comes back for one trial request
+    assert pool.acquire() == stubs['bad'].url
+    assert time.monotonic() - start >= 0.2
+    # While that trial runs nobody else gets the proxy
+    pool.wait_timeout = 0
+    with pytest.raises(NoProxyAvailable):
+        pool.acquire()
+
+
+def test_quarantined_proxy_is_skipped_for_a_healthy_one(stubs):
+    pool = pool_of(stubs['good'], stubs['bad'])
+    quarantine(pool, stubs['bad'].url)
+    assert [pool.acquire() for _ in range(3)] == [stubs['good'].url] * 3
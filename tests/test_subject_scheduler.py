@@ -0,0 +1,64 @@
+import subject_scheduler
+from subject_scheduler import SubjectScheduler, case_subjects
+
+
+def test_case_subjects_uses_the_substring_rule():
+    case_data = {'rechtsgebieden': 'Internationaal strafrecht, Bestuursrecht; Vreemdelingenrecht'}
+
+    assert case_subjects(case_data, ['Strafrecht', 'Vreemdelingenrecht', 'Civiel recht']) == \
+        {'Strafrecht', 'Vreemdelingenrecht'}
+    assert case_subjects({'rechtsgebieden': ''}, ['Strafrecht']) == set()
+
+
+class StubFeed:
+    def __init__(self, subject, **kwargs):
+        self.subject = subject
+
+    def iter_pages(self):
+        yield [{'ecli_code': 'NL:RBDHA:2025:1', 'url': 'https://uitspraken.rechtspraak.nl/details?id=ECLI:NL:RBDHA:2025:1',
+                'last_modified': None}]
+
+    def close(self):
+        pass
+
+
+class StubScraper:
+    date_from = date_to = None
+    ua = type('UA', (), {'random': 'test'})()
+    page_cache = archive = None
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.last_modified = {}
+        self.cases_found = 0
+        self.requested = []
+
+    def extract_cases(self, urls):
+        self.requested.extend(urls)
+        for url in urls:
+            yield url, self.results.pop(0)
+
+    def mark_seen(self, case_url, case_data):
+        pass
+
+
+def test_failed_case_is_retried_by_a_later_subject(monkeypatch):
+    monkeypatch.setattr(subject_scheduler, 'OpenDataFeed', StubFeed)
+    scheduler = SubjectScheduler.__new__(SubjectScheduler)
+    scheduler.subjects = ['Strafrecht', 'Bestuursrecht']
+    scheduler.scraper = StubScraper([None, {'ecli_code': 'NL:RBDHA:2025:1', 'rechtsgebieden': 'Bestuursrecht'}])
+    scheduler.fetched = set()
+    routed = []
+
+    def route(case_data, subject):
+        routed.append(subject)
+        return {subject}
+    scheduler.route = route
+
+    scheduler.crawl_subject('Strafrecht')
+    assert scheduler.fetched == set()
+
+    scheduler.crawl_subject('Bestuursrecht')
+    assert scheduler.fetched == {'NL:RBDHA:2025:1'}
+    assert len(scheduler.scraper.requested) == 2
+    assert routed == ['Bestuursrecht']
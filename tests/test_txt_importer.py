@@ -0,0 +1,61 @@
+import os
+import shutil
+from txt_importer import batched, iter_cases, iter_txt_cases, txt_files
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES, name)
+
+
+def test_current_layout():
+    cases = list(iter_txt_cases(fixture_path('all_cases_current.txt')))
+    assert [case['ecli_code'] for case in cases] == ['NL:RVS:2025:2758', 'NL:RBDHA:2025:12001']
+    first = cases[0]
+    assert first['court'] == 'Raad van State'
+    assert first['date_uitspraak'] == '19-06-2025' and first['date_publicatie'] == '25-06-2025'
+    assert first['url'] == 'https://uitspraken.rechtspraak.nl/details?id=ECLI:NL:RVS:2025:2758'
+    # A ruling quoting "ECLI Code:" in its text is not split into two records
+    assert first['content'] == ('Uitspraak\nDatum uitspraak: 19 juni 2025\nZie ook\n'
+                                'ECLI Code: NL:RVS:2024:1\nwaarin dezelfde vraag speelde.')
+    second = cases[1]
+    assert second['rechtsgebieden'] == 'Vreemdelingenrecht, Bestuursrecht'
+    # Multi-line values stay with their label; the separator is not part of the content
+    assert second['inhoudsindicatie'].startswith('Asiel; eerste alinea.')
+    assert second['inhoudsindicatie'].endswith('Tweede alinea.')
+    assert second['content'] == 'Uitspraak\nBeroep ongegrond.'
+
+
+def test_legacy_layout():
+    cases = list(iter_txt_cases(fixture_path('all_cases_legacy.txt')))
+    assert [case['ecli_code'] for case in cases] == ['NL:RBDHA:2025:12331', 'NL:RBAMS:2025:8003']
+    # "Date uitspraak:" of the older layout maps to the same fields
+    assert cases[0]['date_uitspraak'] == '09-07-2025' and cases[0]['date_publicatie'] == '11-07-2025'
+    # Neither the '=' separator nor the next "CASE N" banner ends up in the content
+    assert cases[0]['content'] == 'Uitspraak\nBeroep gegrond.'
+    assert cases[1]['content'] == 'Uitspraak\nMaatregel opgeheven.'
+
+
+def test_files_without_cases(tmp_path):
+    empty = tmp_path / 'all_cases_Goederenrecht_20250714_20250714.txt'
+    empty.write_text('')
+    header_only = tmp_path / 'all_cases_Goederenrecht_20250715_20250715.txt'
+    header_only.write_text('DUTCH LAW CASES - Goederenrecht\nTotal cases: 0\n' + '=' * 80 + '\n\n')
+    assert list(iter_txt_cases(str(empty))) == []
+    assert list(iter_txt_cases(str(header_only))) == []
+
+
+def test_directories_are_searched_recursively(tmp_path):
+    nested = tmp_path / 'shards' / '20250101_20250131'
+    nested.mkdir(parents=True)
+    shutil.copy(fixture_path('all_cases_current.txt'), tmp_path / 'all_cases_current.txt')
+    shutil.copy(fixture_path('all_cases_legacy.txt'), nested / 'all_cases_legacy.txt')
+    (tmp_path / 'cases_metadata_Vreemdelingenrecht.csv').write_text('ecli_code\n')
+    assert len(txt_files(str(tmp_path))) == 2
+    assert len(list(iter_cases(str(tmp_path)))) == 4
+
+
+def test_batched():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched(iter([]), 2)) == []
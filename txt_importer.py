@@ -0,0 +1,128 @@
+import argparse
+import glob
+import mmap
+import os
+import re
+import time
+import config
+from output_writers import CASE_FIELDS
+
+# A record starts at an "ECLI Code:" line directly followed by "Title:", so a
+# ruling that quotes "ECLI Code:" in its text does not split the record
+_RECORD_START = re.compile(rb'^ECLI Code: [^\n]*\r?\nTitle: ', re.MULTILINE)
+
+# What follows the content of a record: the 80-dash separator (save_to_txt),
+# or the 80-'=' separator plus the "CASE N" banner of the older layout
+_RECORD_TAIL = re.compile(r'\s*(?:^[-=]{80}\s*)?(?:^CASE \d+\s*^-{40}\s*)?\Z', re.MULTILINE)
+
+# Header labels of both layouts ("Date Uitspraak:" and the older "Date uitspraak:")
+_LABELS = {
+    'ecli code': 'ecli_code',
+    'title': 'title',
+    'court': 'court',
+    'date': 'date',
+    'date uitspraak': 'date_uitspraak',
+    'date publicatie': 'date_publicatie',
+    'inhoudsindicatie': 'inhoudsindicatie',
+    'rechtsgebieden': 'rechtsgebieden',
+    'url': 'url'
+}
+
+
+def txt_files(path):
+    """all_cases_*.txt files under a directory (or the file itself)"""
+    if os.path.isfile(path):
+        return [path]
+    return sorted(glob.glob(os.path.join(path, '**', 'all_cases_*.txt'), recursive=True))
+
+
+def parse_record(text):
+    """Parse one record (from "ECLI Code:" to the next record) into a case_data dict"""
+    text = text.replace('\r\n', '\n')
+    head, found, content = text.partition('\nContent:\n')
+    if not found:
+        head, content = text, ''
+    case = dict.fromkeys(CASE_FIELDS, '')
+    field = None
+    for line in head.split('\n'):
+        label, colon, value = line.partition(':')
+        key = _LABELS.get(label.strip().lower()) if colon else None
+        if key:
+            field = key
+            case[field] = value.strip()
+        elif field:
+            # A multi-line value, e.g. an inhoudsindicatie with paragraphs
+            case[field] = f"{case[field]}\n{line}".strip()
+    case['content'] = _RECORD_TAIL.sub('', content)
+    return case
+
+
+def iter_txt_cases(path):
+    """Yield the cases of one all_cases_*.txt file, one at a time
+
+    The file is memory-mapped and scanned for record starts, so only the
+    record being parsed is ever decoded; both the current layout and the
+    older "DUTCH LAW CASES" / "CASE N" layout are understood.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = None
+        for match in _RECORD_START.finditer(data):
+            if start is not None:
+                yield parse_record(data[start:match.start()].decode('utf-8', errors='replace'))
+            start = match.start()
+        if start is not None:
+            yield parse_record(data[start:].decode('utf-8', errors='replace'))
+
+
+def iter_cases(path):
+    """Yield the cases of every all_cases_*.txt file under `path`"""
+    for txt_file in txt_files(path):
+        count = 0
+        for case in iter_txt_cases(txt_file):
+            count += 1
+            yield case
+        print(f"[Import] {count} cases in {os.path.basename(txt_file)}")
+
+
+def batched(cases, batch_size):
+    """Group an iterator of cases into lists of at most `batch_size`"""
+    batch = []
+    for case in cases:
+        batch.append(case)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_txt_archives(memory_bank, path=None, batch_size=None, source="txt_archive"):
+    """Stream all_cases_*.txt files into a LawCaseMemoryBank in bounded batches"""
+    path = path or config.OUTPUT_DIR
+    batch_size = batch_size or config.TXT_IMPORT_BATCH
+    start = time.perf_counter()
+    added = memory_bank.add_case_batches(batched(iter_cases(path), batch_size), source=source)
+    print(f"[Import] {added} cases read from {path} in {time.perf_counter() - start:.1f}s")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import all_cases_*.txt archives into the memory bank')
+    parser.add_argument('path', nargs='?', default=config.OUTPUT_DIR,
+                        help='TXT file or directory searched recursively (default: run)')
+    parser.add_argument('--batch-size', type=int, default=config.TXT_IMPORT_BATCH,
+                        help='Cases handed to the memory bank at once')
+    parser.add_argument('--memory-bank', default='memory_bank', help='Memory bank directory')
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default=config.MEMORY_BANK_BACKEND,
+                        help='Memory bank storage backend')
+
+    args = parser.parse_args()
+
+    from memory_bank import LawCaseMemoryBank
+    import_txt_archives(LawCaseMemoryBank(args.memory_bank, backend=args.backend), args.path, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import base64
+import glob
+import gzip
+import hashlib
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timezone
+import config
+
+# Response headers that no longer describe the stored body (httpx has already decoded it)
+_DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+def _warc_date():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _payload_digest(payload):
+    return "sha1:" + base64.b32encode(hashlib.sha1(payload).digest()).decode('ascii')
+
+
+def _record(warc_type, headers, block):
+    lines = [
+        "WARC/1.1",
+        f"WARC-Type: {warc_type}",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {_warc_date()}"
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append(f"Content-Length: {len(block)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('utf-8') + block + b"\r\n\r\n"
+
+
+class WarcWriter:
+    """Rolling, gzip-per-record WARC archive of raw responses
+
+    Records are appended to `<prefix>-<timestamp>-<pid>-<serial>.warc.gz.open`
+    and the file loses its `.open` suffix once it grows past `max_mb` or the
+    writer is closed. Each record is its own gzip member, so a file cut short
+    by a crash is readable up to its last complete record.
+    """
+
+    def __init__(self, directory=None, max_mb=None, prefix='rechtspraak'):
+        self.directory = directory or os.path.join(config.OUTPUT_DIR, config.WARC_DIR)
+        self.max_bytes = (max_mb or config.WARC_MAX_MB) * 1024 * 1024
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+        self.serial = 0
+        self.records = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _open(self):
+        self.serial += 1
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        self.path = os.path.join(self.directory,
+                                 f"{self.prefix}-{stamp}-{os.getpid()}-{self.serial:05d}.warc.gz.open")
+        self.file = open(self.path, 'ab')
+        info = (f"software: RechtspraakScraper\r\nformat: WARC File Format 1.1\r\n"
+                f"hostname: {socket.gethostname()}\r\n").encode('utf-8')
+        self.file.write(gzip.compress(_record('warcinfo', {
+            'WARC-Filename': os.path.basename(self.path)[:-len('.open')],
+            'Content-Type': 'application/warc-fields'
+        }, info)))
+
+    def _close_file(self):
+        if self.file:
+            self.file.close()
+            os.replace(self.path, self.path[:-len('.open')])
+            self.file = None
+
+    def write(self, warc_type, headers, block):
+        data = gzip.compress(_record(warc_type, headers, block))
+        with self.lock:
+            if self.file is None:
+                self._open()
+            self.file.write(data)
+            self.file.flush()
+            self.records += 1
+            if self.file.tell() >= self.max_bytes:
+                self._close_file()
+
+    def write_response(self, url, resp):
+        """Archive an httpx response: status line, headers and (decoded) body"""
+        head = [f"HTTP/1.1 {resp.status_code} {resp.reason_phrase}"]
+        head.extend(f"{name}: {value}" for name, value in resp.headers.items()
+                    if name.lower() not in _DROPPED_HEADERS)
+        head.append(f"Content-Length: {len(resp.content)}")
+        block = ("\r\n".join(head) + "\r\n\r\n").encode('utf-8') + resp.content
+        self.write('response', {
+            'WARC-Target-URI': url,
+            'WARC-Payload-Digest': _payload_digest(resp.content),
+            'Content-Type': 'application/http;msgtype=response'
+        }, block)
+
+    def write_resource(self, url, body, content_type='text/html; charset=utf-8'):
+        """Archive a document without an HTTP exchange, e.g. a page source rendered by Chrome"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.write('resource', {
+            'WARC-Target-URI': url,
+            'WARC-Payload-Digest': _payload_digest(body),
+            'Content-Type': content_type
+        }, body)
+
+    def close(self):
+        with self.lock:
+            self._close_file()
+
+
+def archive_files(path):
+    """WARC files under a directory (or the file itself), oldest first"""
+    if os.path.isfile(path):
+        return [path]
+    files = glob.glob(os.path.join(path, '**', '*.warc.gz'), recursive=True)
+    # Left behind by an interrupted run; readable up to the last complete record
+    files += glob.glob(os.path.join(path, '**', '*.warc.gz.open'), recursive=True)
+    return sorted(files, key=os.path.basename)
+
+
+def _parse_http(block):
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode('iso-8859-1').split("\r\n")
+    parts = lines[0].split(' ', 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, headers.get('content-type', ''), body
+
+
+def iter_records(path):
+    """Yield the response and resource records of a WARC file as dicts
+
+    Each dict has type, url, date, status (None for resources),
+    content_type and payload (bytes).
+    """
+    with gzip.open(path, 'rb') as f:
+        while True:
+            try:
+                line = f.readline()
+                if not line:
+                    return
+                if not line.strip():
+                    continue
+                if not line.startswith(b"WARC/"):
+                    raise ValueError(f"not a WARC record header: {line[:40]!r}")
+                headers = {}
+                while True:
+                    line = f.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('utf-8').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                block = f.read(length)
+                if len(block) < length:
+                    raise EOFError("record cut short")
+            except (EOFError, ValueError, gzip.BadGzipFile, OSError) as e:
+                print(f"[WARC] {os.path.basename(path)} ends early ({e}); keeping the records before it")
+                return
+            warc_type = headers.get('warc-type')
+            if warc_type == 'response':
+                status, content_type, payload = _parse_http(block)
+            elif warc_type == 'resource':
+                status, content_type, payload = None, headers.get('content-type', ''), block
+            else:
+                continue
+            yield {
+                'type': warc_type,
+                'url': headers.get('warc-target-uri', ''),
+                'date': headers.get('warc-date', ''),
+                'status': status,
+                'content_type': content_type,
+                'payload': payload
+            }